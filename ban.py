@@ -1,10 +1,173 @@
+import time
+import threading
 from PySide6 import QtWidgets, QtCore, QtGui
+import config
+from ban_store import BanStore, read_bans, parse_ban_list, IP
+from log_events import BANNED, PARDONED
+
+
+class BanListModel(QtCore.QAbstractListModel):
+    # Shows the entries of the store that match the current filter
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.query = ""
+        self.rows = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.rows[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            who = f"IP {entry.ip}" if entry.kind == IP else entry.name or entry.uuid
+            return f"{who}  —  {entry.reason}" if entry.reason else who
+        if role == QtCore.Qt.ToolTipRole:
+            lines = [entry.name, entry.uuid, entry.ip, f"Reason: {entry.reason}", f"By: {entry.source}",
+                     f"Since: {entry.created}", f"Expires: {entry.expires}"]
+            return "\n".join(line for line in lines if line.strip())
+        return None
+
+    def entry(self, row):
+        return self.rows[row]
+
+    def set_query(self, query):
+        self.beginResetModel()
+        self.query = query
+        self.rows = self.store.search(query)
+        self.endResetModel()
+
+    def apply(self, removed, added):
+        # Drops and appends just the changed rows so the selection and scroll position survive
+        if removed:
+            gone = {id(entry) for entry in removed}
+            rows = [row for row, entry in enumerate(self.rows) if id(entry) in gone]
+            # Contiguous runs, last first, so earlier row numbers stay valid
+            while rows:
+                last = rows.pop()
+                first = last
+                while rows and rows[-1] == first - 1:
+                    first = rows.pop()
+                self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+                del self.rows[first:last + 1]
+                self.endRemoveRows()
+        query = self.query.strip().lower()
+        matching = [entry for entry in added if query in entry.search]
+        if matching:
+            first = len(self.rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(matching) - 1)
+            self.rows.extend(matching)
+            self.endInsertRows()
+
+
+class BulkBanJob(QtCore.QObject):
+    # Sends ban/pardon commands in small batches on a worker thread and counts the
+    # console confirmations ("Banned X: reason" / "Unbanned X") as they come back
+    progress = QtCore.Signal(int, int, int)
+    finished = QtCore.Signal(int, object, object)
+
+    def __init__(self, server_manager, commands, kind):
+        super().__init__()
+        self.server_manager = server_manager
+        self.commands = commands
+        self.kind = kind
+        # Names sent and still waiting for their confirmation
+        self.pending = {}
+        self.unsent = []
+        self.sent = 0
+        self.confirmed = 0
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._last_confirmed = time.monotonic()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        batch = max(1, config.get("bulk_ban_batch_size"))
+        interval = config.get("bulk_ban_batch_interval_ms") / 1000.0
+        confirm_timeout = config.get("bulk_ban_confirm_timeout")
+        events = self.server_manager.events
+        events.subscribe(self.kind, self._on_event)
+        done = 0
+        try:
+            while done < len(self.commands) and not self.cancelled:
+                entries = self.commands[done:done + batch]
+                with self._lock:
+                    # Registered before sending; the confirmation can beat send_commands back
+                    self.pending.update((name.lower(), name) for name, _ in entries)
+                # Waits for room in the writer queue instead of dropping commands. The writer
+                # keeps order and only refuses once closed, so the accepted ones come first.
+                accepted = self.server_manager.send_commands([command for _, command in entries], timeout=None)
+                done += len(entries)
+                with self._lock:
+                    self.sent += accepted
+                    for name, _ in entries[accepted:]:
+                        self.pending.pop(name.lower(), None)
+                        self.unsent.append(name)
+                self.progress.emit(self.sent, self.confirmed, len(self.commands))
+                if accepted < len(entries):
+                    break
+                time.sleep(interval)
+            self.unsent.extend(name for name, _ in self.commands[done:])
+
+            # Confirmations trail the commands; give up once they stop arriving
+            with self._lock:
+                self._last_confirmed = time.monotonic()
+            while not self.cancelled:
+                with self._lock:
+                    if not self.pending or time.monotonic() - self._last_confirmed > confirm_timeout:
+                        break
+                time.sleep(0.1)
+        finally:
+            events.unsubscribe(self.kind, self._on_event)
+        with self._lock:
+            unconfirmed = sorted(self.pending.values(), key=str.lower)
+        self.finished.emit(self.confirmed, unconfirmed, sorted(self.unsent, key=str.lower))
+
+    def _on_event(self, event):
+        # Reader thread
+        with self._lock:
+            if self.pending.pop(event.player.lower(), None) is None:
+                return
+            self.confirmed += 1
+            self._last_confirmed = time.monotonic()
+        self.progress.emit(self.sent, self.confirmed, len(self.commands))
+
 
 class BanTab(QtWidgets.QWidget):
+    bans_read = QtCore.Signal(str, object, object)
+
     def __init__(self, server_manager):
         super().__init__()
         self.server_manager = server_manager
+        self.store = BanStore()
+        self.model = BanListModel(self.store, self)
+        self.reading = set()
+        self.bans_read.connect(self.on_bans_read)
+
+        # The server rewrites the ban files on every ban/pardon; bursts are read once
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(config.get("ban_watch_debounce_ms"))
+        self.refresh_timer.timeout.connect(self.refresh_bans)
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(80)
+        self.filter_timer.timeout.connect(self.apply_filter)
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.addPath(".")
+        self.watcher.directoryChanged.connect(self.refresh_timer.start)
+        self.watcher.fileChanged.connect(self.refresh_timer.start)
+
         self.init_ui()
+        QtCore.QTimer.singleShot(0, self.refresh_bans)
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -16,41 +179,263 @@ class BanTab(QtWidgets.QWidget):
         layout.addWidget(title)
 
         form_layout = QtWidgets.QFormLayout()
-        
+
         self.username_input = QtWidgets.QLineEdit()
         self.username_input.setPlaceholderText("Minecraft Username")
-        
+
         self.reason_input = QtWidgets.QLineEdit()
         self.reason_input.setPlaceholderText("Ban Reason")
-        
+
         form_layout.addRow("Username:", self.username_input)
         form_layout.addRow("Reason:", self.reason_input)
-        
+
         layout.addLayout(form_layout)
 
         self.ban_btn = QtWidgets.QPushButton("BAN USER")
         self.ban_btn.setObjectName("Primary")
         self.ban_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.ban_btn.clicked.connect(self.execute_ban)
-        
+
         layout.addWidget(self.ban_btn)
-        layout.addStretch(1)
+
+        self.status = QtWidgets.QLabel()
+        self.status.setObjectName("Muted")
+        self.status.setWordWrap(True)
+        layout.addWidget(self.status)
+
+        bulk_title = QtWidgets.QLabel("Bulk Ban / Pardon")
+        bulk_title.setObjectName("H2")
+        layout.addWidget(bulk_title)
+
+        self.bulk_input = QtWidgets.QPlainTextEdit()
+        self.bulk_input.setPlaceholderText("One player per line: name or name,reason")
+        self.bulk_input.setMaximumHeight(110)
+        layout.addWidget(self.bulk_input)
+
+        bulk_row = QtWidgets.QHBoxLayout()
+        self.bulk_mode = QtWidgets.QComboBox()
+        self.bulk_mode.addItems(["Ban", "Pardon"])
+        self.btn_import_bulk = QtWidgets.QPushButton("Import CSV...")
+        self.btn_import_bulk.setObjectName("Secondary")
+        self.btn_import_bulk.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btn_import_bulk.clicked.connect(self.import_bulk_file)
+        self.btn_bulk = QtWidgets.QPushButton("Run")
+        self.btn_bulk.setObjectName("Primary")
+        self.btn_bulk.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btn_bulk.clicked.connect(self.toggle_bulk)
+        bulk_row.addWidget(self.bulk_mode)
+        bulk_row.addWidget(self.btn_import_bulk)
+        bulk_row.addStretch(1)
+        bulk_row.addWidget(self.btn_bulk)
+        layout.addLayout(bulk_row)
+
+        self.bulk_progress = QtWidgets.QProgressBar()
+        self.bulk_progress.setTextVisible(True)
+        self.bulk_progress.hide()
+        layout.addWidget(self.bulk_progress)
+        self.bulk_job = None
+
+        list_title = QtWidgets.QLabel("Banned Players")
+        list_title.setObjectName("H2")
+        layout.addWidget(list_title)
+
+        filter_row = QtWidgets.QHBoxLayout()
+        self.filter_input = QtWidgets.QLineEdit()
+        self.filter_input.setPlaceholderText("Search by name, UUID, IP or reason")
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        self.count_label = QtWidgets.QLabel()
+        self.count_label.setObjectName("Muted")
+        filter_row.addWidget(self.filter_input, 1)
+        filter_row.addWidget(self.count_label)
+        layout.addLayout(filter_row)
+
+        self.ban_list = QtWidgets.QListView()
+        self.ban_list.setObjectName("BanList")
+        self.ban_list.setModel(self.model)
+        self.ban_list.setUniformItemSizes(True)
+        self.ban_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.ban_list.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.ban_list.customContextMenuRequested.connect(self.show_ban_context_menu)
+        layout.addWidget(self.ban_list, 1)
+
+        self.pardon_btn = QtWidgets.QPushButton("Pardon Selected")
+        self.pardon_btn.setObjectName("Secondary")
+        self.pardon_btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.pardon_btn.clicked.connect(self.pardon_selected)
+        layout.addWidget(self.pardon_btn)
+
+        self.model.modelReset.connect(self.update_count)
+        self.model.rowsInserted.connect(self.update_count)
+        self.model.rowsRemoved.connect(self.update_count)
+        self.update_count()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Covers changes the watcher can miss, e.g. while the files didn't exist yet
+        if self.store.stale_kinds():
+            self.refresh_timer.start()
+
+    def refresh_bans(self):
+        for kind in self.store.stale_kinds():
+            if kind not in self.reading:
+                self.reading.add(kind)
+                threading.Thread(target=self._read_bans, args=(kind,), daemon=True).start()
+
+    def _read_bans(self, kind):
+        entries, stat = read_bans(self.store.paths[kind])
+        self.bans_read.emit(kind, entries, stat)
+
+    def on_bans_read(self, kind, entries, stat):
+        self.reading.discard(kind)
+        removed, added = self.store.apply(kind, entries, stat)
+        self.model.apply(removed, added)
+        # A file replaced on save drops out of the watch list
+        path = self.store.paths[kind]
+        if stat is not None and path not in self.watcher.files():
+            self.watcher.addPath(path)
+        if self.store.stale_kinds():
+            self.refresh_timer.start()
+
+    def apply_filter(self):
+        self.model.set_query(self.filter_input.text())
+
+    def update_count(self):
+        shown, total = self.model.rowCount(), len(self.store)
+        self.count_label.setText(f"{total} bans" if shown == total else f"{shown} of {total}")
 
     def execute_ban(self):
         username = self.username_input.text().strip()
         reason = self.reason_input.text().strip()
 
         if not username:
-            QtWidgets.QMessageBox.warning(self, "Error", "Please enter a username.")
+            self.status.setText("Please enter a username.")
+            return
+
+        if self.store.is_banned(username):
+            self.status.setText(f"{username} is already banned.")
             return
 
         if not reason:
             reason = "Banned by operator."
 
         cmd = f"ban {username} {reason}"
-        self.server_manager.send_command(cmd, hide_log=True)
-        
-        QtWidgets.QMessageBox.information(self, "Success", f"Ban command sent for {username}.")
+        if not self.server_manager.send_command(cmd, hide_log=True):
+            self.status.setText(f"Could not ban {username}: the server is not running.")
+            return
+
+        self.status.setText(f"Ban command sent for {username}.")
         self.username_input.clear()
         self.reason_input.clear()
 
+    def import_bulk_file(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import Players", "", "CSV or text files (*.csv *.txt);;All files (*)")
+        if not path:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                self.bulk_input.setPlainText(f.read())
+        except Exception as e:
+            self.status.setText(f"Failed to read {path}: {e}")
+
+    def toggle_bulk(self):
+        if self.bulk_job is not None:
+            self.bulk_job.cancel()
+            self.btn_bulk.setEnabled(False)
+            return
+        self.start_bulk()
+
+    def start_bulk(self):
+        banning = self.bulk_mode.currentText() == "Ban"
+        entries, rejected = parse_ban_list(self.bulk_input.toPlainText(), self.reason_input.text().strip())
+        # The index says which names would be a no-op on the server
+        if banning:
+            todo = [(name, reason) for name, reason in entries if not self.store.is_banned(name)]
+            commands = [(name, f"ban {name} {reason}".rstrip()) for name, reason in todo]
+        else:
+            todo = [(name, reason) for name, reason in entries if self.store.is_banned(name)]
+            commands = [(name, f"pardon {name}") for name, _ in todo]
+        skipped = len(entries) - len(todo)
+
+        notes = []
+        if rejected:
+            shown = ", ".join(rejected[:5]) + (f" (+{len(rejected) - 5} more)" if len(rejected) > 5 else "")
+            notes.append(f"{len(rejected)} invalid: {shown}")
+        if skipped:
+            notes.append(f"{skipped} already {'banned' if banning else 'not banned'}")
+        if not commands:
+            self.status.setText("Nothing to do." + (" " + "; ".join(notes) + "." if notes else ""))
+            return
+        if not self.server_manager.running:
+            self.status.setText("Start the server to run a bulk ban.")
+            return
+
+        self.bulk_notes = notes
+        self.bulk_verb = "Banned" if banning else "Pardoned"
+        self.bulk_job = BulkBanJob(self.server_manager, commands, BANNED if banning else PARDONED)
+        self.bulk_job.progress.connect(self.on_bulk_progress)
+        self.bulk_job.finished.connect(self.on_bulk_finished)
+        self.bulk_progress.setRange(0, len(commands))
+        self.bulk_progress.setValue(0)
+        self.bulk_progress.setFormat(f"0 sent, 0 of {len(commands)} confirmed")
+        self.bulk_progress.show()
+        self.btn_bulk.setText("Cancel")
+        self.bulk_input.setReadOnly(True)
+        self.bulk_job.start()
+
+    def on_bulk_progress(self, sent, confirmed, total):
+        self.bulk_progress.setValue(confirmed)
+        self.bulk_progress.setFormat(f"{sent} sent, {confirmed} of {total} confirmed")
+
+    def on_bulk_finished(self, confirmed, unconfirmed, unsent):
+        total = len(self.bulk_job.commands)
+        self.bulk_job = None
+        self.btn_bulk.setText("Run")
+        self.btn_bulk.setEnabled(True)
+        self.bulk_input.setReadOnly(False)
+        self.bulk_progress.hide()
+
+        message = f"{self.bulk_verb} {confirmed} of {total}."
+        if unconfirmed:
+            shown = ", ".join(unconfirmed[:10]) + (f" (+{len(unconfirmed) - 10} more)" if len(unconfirmed) > 10 else "")
+            message += f" Not confirmed by the server: {shown}."
+        if unsent:
+            shown = ", ".join(unsent[:10]) + (f" (+{len(unsent) - 10} more)" if len(unsent) > 10 else "")
+            message += f" Not sent: {shown}."
+        if self.bulk_notes:
+            message += " " + "; ".join(self.bulk_notes) + "."
+        self.status.setText(message)
+        if not unconfirmed and not unsent:
+            self.bulk_input.clear()
+
+    def pardon_commands(self, entries):
+        return [f"pardon-ip {entry.ip}" if entry.kind == IP else f"pardon {entry.name}" for entry in entries]
+
+    def pardon(self, entries):
+        if not entries:
+            return
+        if not self.server_manager.running:
+            self.status.setText("Start the server to pardon players.")
+            return
+        sent = self.server_manager.send_commands(self.pardon_commands(entries))
+        # The list updates itself once the server rewrites the ban files
+        self.status.setText(f"Pardon sent for {sent} of {len(entries)} selected.")
+
+    def pardon_selected(self):
+        rows = sorted(index.row() for index in self.ban_list.selectionModel().selectedRows())
+        self.pardon([self.model.entry(row) for row in rows])
+
+    def show_ban_context_menu(self, pos):
+        index = self.ban_list.indexAt(pos)
+        if not index.isValid():
+            return
+
+        menu = QtWidgets.QMenu()
+        pardon_action = menu.addAction("Pardon")
+        action = menu.exec(self.ban_list.mapToGlobal(pos))
+
+        if action == pardon_action:
+            if self.ban_list.selectionModel().isSelected(index):
+                self.pardon_selected()
+            else:
+                self.pardon([self.model.entry(index.row())])
@@ -0,0 +1,168 @@
+import os
+import csv
+import json
+from uuid_resolver import USERNAME_PATTERN
+
+PLAYER = "player"
+IP = "ip"
+# First cells that mark a header row rather than a player
+HEADER_CELLS = {"name", "names", "username", "usernames", "player", "players"}
+
+
+class BanEntry:
+    # One row of banned-players.json (kind PLAYER) or banned-ips.json (kind IP)
+    __slots__ = ("kind", "name", "uuid", "ip", "reason", "source", "created", "expires", "raw", "search")
+
+    def __init__(self, kind, raw):
+        self.kind = kind
+        self.raw = raw
+        self.name = raw.get("name") or ""
+        self.uuid = raw.get("uuid") or ""
+        self.ip = raw.get("ip") or ""
+        self.reason = raw.get("reason") or ""
+        self.source = raw.get("source") or ""
+        self.created = raw.get("created") or ""
+        self.expires = raw.get("expires") or "forever"
+        # Filtering is a substring test against this one lowercase string
+        self.search = f"{self.name}\n{self.uuid}\n{self.ip}\n{self.reason}\n{self.source}".lower()
+
+    @property
+    def key(self):
+        if self.kind == IP:
+            return (IP, self.ip)
+        return (PLAYER, self.uuid or self.name.lower())
+
+    def __repr__(self):
+        return f"BanEntry({self.kind!r}, name={self.name!r}, ip={self.ip!r})"
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def read_bans(path):
+    # (raw entries, stat). Safe on a worker thread. A missing file reads as empty,
+    # a half-written one as None so the entries already known are kept.
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            st = os.fstat(f.fileno())
+        stat = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return [], None
+    except Exception:
+        return None, _stat(path)
+    if not isinstance(data, list):
+        return None, stat
+    return [e for e in data if isinstance(e, dict)], stat
+
+
+def parse_ban_list(text, default_reason=""):
+    # One player per line as "name" or "name,reason" (CSV quoting allowed, tabs when pasted
+    # from a spreadsheet). Returns ([(name, reason)], [rejected lines]); the first line for a name wins.
+    delimiter = "\t" if "\t" in text and "," not in text else ","
+    entries, rejected, seen = [], [], set()
+    for row in csv.reader(text.splitlines(), delimiter=delimiter):
+        cells = [cell.strip() for cell in row]
+        if not cells or not cells[0]:
+            continue
+        name = cells[0]
+        if not entries and not rejected and name.lower() in HEADER_CELLS:
+            continue
+        if not USERNAME_PATTERN.match(name):
+            rejected.append(delimiter.join(row))
+            continue
+        if name.lower() in seen:
+            continue
+        seen.add(name.lower())
+        # An unquoted reason with commas in it comes back in several cells
+        reason = ", ".join(cell for cell in cells[1:] if cell) or default_reason
+        entries.append((name, reason))
+    return entries, rejected
+
+
+class BanStore:
+    # Both ban lists in memory, looked up by lowercase name, uuid or ip
+    def __init__(self, players_path="banned-players.json", ips_path="banned-ips.json"):
+        self.paths = {PLAYER: players_path, IP: ips_path}
+        self.entries = []
+        self.by_key = {}
+        self.by_name = {}
+        self.by_uuid = {}
+        self.by_ip = {}
+        self._stats = {PLAYER: None, IP: None}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stale_kinds(self):
+        return [kind for kind, path in self.paths.items() if _stat(path) != self._stats[kind]]
+
+    def load(self):
+        for kind, path in self.paths.items():
+            self.apply(kind, *read_bans(path))
+        return self
+
+    def apply(self, kind, raw_entries, stat):
+        # Replaces one file's entries and returns (removed, added); unchanged entries are kept as they are
+        self._stats[kind] = stat
+        if raw_entries is None:
+            return [], []
+        fresh = {}
+        for raw in raw_entries:
+            entry = BanEntry(kind, raw)
+            if entry.ip if kind == IP else (entry.uuid or entry.name):
+                fresh[entry.key] = entry
+
+        removed = []
+        for key, entry in self.by_key.items():
+            if key[0] == kind:
+                new = fresh.get(key)
+                if new is None or new.raw != entry.raw:
+                    removed.append(entry)
+        gone = {id(entry) for entry in removed}
+        added = [entry for key, entry in fresh.items() if key not in self.by_key or id(self.by_key[key]) in gone]
+        if not removed and not added:
+            return [], []
+
+        if gone:
+            self.entries = [entry for entry in self.entries if id(entry) not in gone]
+        for entry in removed:
+            self._unindex(entry)
+        for entry in added:
+            self.entries.append(entry)
+            self._index(entry)
+        return removed, added
+
+    def _index(self, entry):
+        self.by_key[entry.key] = entry
+        if entry.name:
+            self.by_name[entry.name.lower()] = entry
+        if entry.uuid:
+            self.by_uuid[entry.uuid.lower()] = entry
+        if entry.ip:
+            self.by_ip[entry.ip] = entry
+
+    def _unindex(self, entry):
+        for index, value in ((self.by_key, entry.key), (self.by_name, entry.name.lower()),
+                             (self.by_uuid, entry.uuid.lower()), (self.by_ip, entry.ip)):
+            if index.get(value) is entry:
+                del index[value]
+
+    def lookup(self, text):
+        # Exact match on name (any case), uuid or ip
+        text = text.strip()
+        return self.by_name.get(text.lower()) or self.by_uuid.get(text.lower()) or self.by_ip.get(text)
+
+    def is_banned(self, name):
+        return name.lower() in self.by_name
+
+    def search(self, query):
+        query = query.strip().lower()
+        if not query:
+            return list(self.entries)
+        return [entry for entry in self.entries if query in entry.search]
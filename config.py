@@ -0,0 +1,62 @@
+import json
+import os
+
+CONFIG_PATH = "panel_config.json"
+
+DEFAULTS = {
+    "console_max_lines": 5000,
+    "console_flush_ms": 33,
+    "history_dir": "console_history",
+    "history_max_bytes": 0,
+    "history_result_limit": 2000,
+    "reader_mode": "chunked",
+    "command_queue_size": 1000,
+    "uuid_cache_path": "uuid_cache.json",
+    "uuid_cache_ttl": 7 * 24 * 60 * 60,
+    "uuid_cache_negative_ttl": 60 * 60,
+    "uuid_cache_max_entries": 10000,
+    "uuid_api_url": "https://playerdb.co/api/player/minecraft/",
+    "uuid_bulk_workers": 8,
+    "plugin_index_path": "plugin_index.json",
+    "plugin_watch_debounce_ms": 400,
+    "plugin_watch_max_delay_ms": 3000,
+    "plugin_store_dir": "plugin_store",
+    "modrinth_api_url": "https://api.modrinth.com/v2/",
+    "version_manifest_url": "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json",
+    "version_manifest_ttl": 60 * 60,
+    "server_jar_cache_dir": os.path.join(os.path.expanduser("~"), ".minecraft_server_panel"),
+    "download_segments": 4,
+    "startup_budget_ms": 1500,
+    "performance_mode": False,
+    "paint_stats_interval_ms": 0,
+    "whitelist_save_delay_ms": 500,
+    "ban_watch_debounce_ms": 300,
+    "bulk_ban_batch_size": 50,
+    "bulk_ban_batch_interval_ms": 200,
+    "bulk_ban_confirm_timeout": 10,
+    "status_poll_interval": 5,
+    "status_poll_timeout": 3,
+    "status_history": 720,
+    "resource_sample_interval": 1.0,
+}
+
+_config = None
+
+
+def load_config(path=CONFIG_PATH):
+    global _config
+    config = dict(DEFAULTS)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                config.update(json.load(f))
+        except Exception:
+            pass
+    _config = config
+    return config
+
+
+def get(key, default=None):
+    if _config is None:
+        load_config()
+    return _config.get(key, DEFAULTS.get(key, default))
@@ -0,0 +1,229 @@
+import io
+import os
+import re
+import codecs
+import time
+import queue
+import threading
+
+CHUNK_SIZE = 64 * 1024
+# A "line" with no newline in sight is flushed once it gets this long
+MAX_PARTIAL = 64 * 1024
+
+ANSI_ESCAPE = re.compile(r"\x1b(?:\[[0-9;?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+
+
+class LineSplitter:
+    def __init__(self, encoding='utf-8'):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._partial = ""
+
+    def feed(self, data):
+        text = self._partial + self._decoder.decode(data)
+        end = text.rfind("\n")
+        if end < 0:
+            if len(text) > MAX_PARTIAL:
+                self._partial = ""
+                return self._clean([text])
+            self._partial = text
+            return []
+
+        self._partial = text[end + 1:]
+        complete = text[:end]
+        if "\x1b" in complete:
+            complete = ANSI_ESCAPE.sub("", complete)
+        if "\r" in complete:
+            complete = complete.replace("\r\n", "\n")
+            if complete.endswith("\r"):
+                complete = complete[:-1]
+            if "\r" in complete:
+                return [_apply_cr(line) for line in complete.split("\n")]
+        return complete.split("\n")
+
+    def flush(self):
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        if not text:
+            return []
+        return self._clean([text])
+
+    def _clean(self, lines):
+        lines = [ANSI_ESCAPE.sub("", line) for line in lines]
+        return [_apply_cr(line) for line in lines]
+
+
+def _apply_cr(line):
+    line = line.rstrip("\r")
+    # A bare CR returns the cursor, so only the text after the last one is visible
+    if "\r" in line:
+        line = line.rsplit("\r", 1)[1]
+    return line
+
+
+def read_chunked(stream, on_lines, chunk_size=CHUNK_SIZE):
+    # Hands every line available in one read() to on_lines as a single batch
+    fd = stream.fileno()
+    splitter = LineSplitter()
+    while True:
+        data = os.read(fd, chunk_size)
+        if not data:
+            break
+        lines = splitter.feed(data)
+        if lines:
+            on_lines(lines)
+
+    lines = splitter.flush()
+    if lines:
+        on_lines(lines)
+
+
+def read_line_by_line(stream, on_lines):
+    # The original text-mode reader, kept as a fallback and for comparison
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+    while True:
+        line = text.readline()
+        if not line:
+            break
+        on_lines([line.rstrip()])
+
+
+class CommandWriter:
+    MAX_BATCH = 512
+    # A blocking submit re-checks for close() this often while it waits for room
+    WAIT_SLICE = 0.05
+    _STOP = object()
+
+    def __init__(self, stream, on_error, max_pending=1000):
+        # on_error(command, reason) is called from the submitting or writer thread
+        self.stream = stream
+        self.on_error = on_error
+        self._queue = queue.Queue(maxsize=max_pending)
+        # Held while checking _closed and queueing, so nothing lands behind the stop sentinel
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, command, timeout=0):
+        # timeout=0 never blocks the caller; None waits for room in the queue
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._closed:
+                    reason = "server not running"
+                    break
+                remaining = self.WAIT_SLICE if deadline is None else deadline - time.monotonic()
+                try:
+                    # Waits a slice at a time so close() is never held up for long
+                    self._queue.put(command, block=remaining > 0, timeout=min(remaining, self.WAIT_SLICE))
+                    return True
+                except queue.Full:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        reason = "command queue full"
+                        break
+        self.on_error(command, reason)
+        return False
+
+    def submit_many(self, commands, timeout=0):
+        accepted = 0
+        for command in commands:
+            if self.submit(command, timeout):
+                accepted += 1
+        return accepted
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self, timeout=1.0):
+        with self._lock:
+            if self._closed and not self._thread.is_alive():
+                return
+            self._closed = True
+        # Waits for the writer to make room; a stuck stream leaves the daemon thread behind
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        failed = None
+        while True:
+            batch = [self._queue.get()]
+            # Commands that arrived together go out in one write
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._STOP in batch
+            commands = [c for c in batch if c is not self._STOP]
+            if commands and failed is None:
+                try:
+                    self.stream.write("".join(c + "\n" for c in commands).encode('utf-8'))
+                    self.stream.flush()
+                except (OSError, ValueError) as e:
+                    failed = str(e) or e.__class__.__name__
+                    with self._lock:
+                        self._closed = True
+            if failed is not None:
+                for command in commands:
+                    self.on_error(command, failed)
+            if stop:
+                break
+
+
+def _benchmark(total=500_000):
+    from collections import deque
+    from log_events import EventClassifier, COMMAND
+
+    samples = [
+        ("plain", "[12:00:01] [Server thread/INFO]: Preparing spawn area: 42%\r\n"),
+        ("ansi", "[12:00:01] [Server thread/INFO]: Preparing spawn area: \x1b[0;32m42%\x1b[m\r\n"),
+    ]
+
+    def run(label, reader, payload):
+        read_fd, write_fd = os.pipe()
+
+        def writer():
+            with open(write_fd, 'wb', buffering=0) as f:
+                view = memoryview(payload)
+                for i in range(0, len(view), CHUNK_SIZE):
+                    f.write(view[i:i + CHUNK_SIZE])
+
+        counted = [0, 0]
+        # Roughly what ServerManager does per batch: classify, then hand to a locked sink
+        classifier = EventClassifier()
+        classifier.subscribe(COMMAND, lambda event: None)
+        lock = threading.Lock()
+        pending = deque(maxlen=5000)
+
+        def on_lines(lines):
+            counted[0] += len(lines)
+            counted[1] += 1
+            classifier.feed(lines)
+            with lock:
+                pending.extend(lines)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        with open(read_fd, 'rb', buffering=-1) as stream:
+            started = time.perf_counter()
+            cpu_started = time.thread_time()
+            reader(stream, on_lines)
+            cpu = time.thread_time() - cpu_started
+            wall = time.perf_counter() - started
+        thread.join()
+        print(f"{label:<16} {counted[0]:>8} lines in {counted[1]:>7} batches  "
+              f"{cpu / counted[0] * 1e6:6.2f} us CPU/line  {counted[0] / wall:>12,.0f} lines/s")
+
+    for name, line in samples:
+        payload = (line * total).encode('utf-8')
+        run(f"line/{name}", read_line_by_line, payload)
+        run(f"chunked/{name}", read_chunked, payload)
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -1,18 +1,73 @@
 import sys
+import os
+import re
+import time
 import subprocess
 import threading
+from collections import deque
 from PySide6 import QtCore, QtWidgets, QtGui
+import config
+from log_store import LogStore
+from log_events import EventClassifier, COMMAND
+from console_io import read_chunked, read_line_by_line, CommandWriter
+from rcon import RconClient, RconError
+from properties import PropertiesFile
+from server_ping import StatusPoller
+import process_stats
+from process_stats import ProcessSampler
+from concurrent.futures import Future
+
+HISTORY_RANGES = [
+    ("All time", None),
+    ("Last 15 minutes", 15 * 60),
+    ("Last hour", 60 * 60),
+    ("Last 24 hours", 24 * 60 * 60),
+    ("Last 7 days", 7 * 24 * 60 * 60),
+]
 
 class ServerManager(QtCore.QObject):
     console_output = QtCore.Signal(str)
     server_started = QtCore.Signal()
     server_stopped = QtCore.Signal()
+    command_failed = QtCore.Signal(str, str)
 
     def __init__(self):
         super().__init__()
         self.process = None
+        self.writer = None
+        self.rcon = None
         self.running = False
         self.stop_event = threading.Event()
+        self.output_sinks = []
+
+        self.history = LogStore(config.get("history_dir"), max_total_bytes=config.get("history_max_bytes"))
+        self.add_output_sink(self.history.append)
+
+        self.events = EventClassifier()
+        self.events.subscribe(COMMAND, self._on_command_event)
+        self._hidden_lines = None
+
+    def add_output_sink(self, sink):
+        # Sinks are called on the reader thread with a list of lines
+        self.output_sinks.append(sink)
+
+    def _on_command_event(self, event):
+        if event.text.startswith("/ban"):
+            if self._hidden_lines is None:
+                self._hidden_lines = set()
+            self._hidden_lines.add(event.raw)
+
+    def _handle_lines(self, lines):
+        self._hidden_lines = None
+        self.events.feed(lines)
+        if self._hidden_lines:
+            lines = [line for line in lines if line not in self._hidden_lines]
+        if lines:
+            self._dispatch_lines(lines)
+
+    def _dispatch_lines(self, lines):
+        for sink in self.output_sinks:
+            sink(lines)
 
     def start_server(self, jar_path="server.jar", ram="2G"):
         if self.running:
@@ -20,20 +75,26 @@ class ServerManager(QtCore.QObject):
 
         cmd = ["java", f"-Xmx{ram}", f"-Xms{ram}", "-jar", jar_path, "nogui"]
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            # STARTUPINFO only exists on Windows; elsewhere Popen must not be given one
+            startupinfo = None
+            if sys.platform == "win32":
+                startupinfo = subprocess.STARTUPINFO()
+                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             
             self.process = subprocess.Popen(
                 cmd,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                startupinfo=startupinfo,
-                text=True,
-                bufsize=1,
-                encoding='utf-8',
-                errors='replace'
+                startupinfo=startupinfo
+            )
+            self.writer = CommandWriter(
+                self.process.stdin,
+                self.command_failed.emit,
+                max_pending=config.get("command_queue_size")
             )
+            self.writer.start()
+            self.rcon = self._create_rcon_client()
             self.running = True
             self.server_started.emit()
             
@@ -51,6 +112,29 @@ class ServerManager(QtCore.QObject):
         self.send_command("stop")
         threading.Timer(10.0, self._force_kill).start()
 
+    def _create_rcon_client(self, props_path="server.properties"):
+        props = PropertiesFile(props_path).load()
+
+        if props.get("enable-rcon", "false").lower() != "true" or not props.get("rcon.password"):
+            return None
+        try:
+            port = int(props.get("rcon.port", "25575"))
+        except ValueError:
+            return None
+        # The client connects lazily, so it is fine to create it before the server is up
+        return RconClient("127.0.0.1", port, props.get("rcon.password"))
+
+    def rcon_command(self, command, timeout=None):
+        # Returns a Future with the server's response to this exact command
+        if self.rcon is None:
+            future = Future()
+            future.set_exception(RconError("RCON is not enabled"))
+            return future
+        return self.rcon.command(command, timeout)
+
+    def rcon_execute(self, command, timeout=5.0):
+        return self.rcon_command(command, timeout).result()
+
     def _force_kill(self):
         if self.running and self.process:
             try:
@@ -58,38 +142,185 @@ class ServerManager(QtCore.QObject):
             except:
                 pass
 
-    def send_command(self, command, hide_log=False):
-        if self.running and self.process:
-            try:
-                self.process.stdin.write(command + "\n")
-                self.process.stdin.flush()
-                if not hide_log:
-                     pass 
-            except Exception as e:
-                self.console_output.emit(f"Error sending command: {e}")
+    def send_command(self, command, hide_log=False, timeout=0):
+        writer = self.writer
+        if not (self.running and writer):
+            self.command_failed.emit(command, "server not running")
+            return False
+        return writer.submit(command, timeout)
 
-    def _read_output(self):
-        while self.running and self.process:
-            line = self.process.stdout.readline()
-            if not line:
-                break
-            
-            if "/ban" in line and "issued server command" in line:
-                continue
+    def send_commands(self, commands, timeout=0):
+        # Bulk callers on worker threads can pass timeout=None to wait for queue space
+        writer = self.writer
+        if not (self.running and writer):
+            for command in commands:
+                self.command_failed.emit(command, "server not running")
+            return 0
+        return writer.submit_many(commands, timeout)
 
-            self.console_output.emit(line.strip())
+    def _read_output(self):
+        try:
+            if config.get("reader_mode") == "line":
+                read_line_by_line(self.process.stdout, self._handle_lines)
+            else:
+                read_chunked(self.process.stdout, self._handle_lines)
+        except (OSError, ValueError):
+            pass
 
         self.running = False
         self.process = None
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        if self.rcon:
+            self.rcon.close()
+            self.rcon = None
+        self.history.flush()
         self.server_stopped.emit()
 
+class ConsoleSink:
+    def __init__(self, max_lines):
+        self._lock = threading.Lock()
+        # Lines older than max_lines would be trimmed by the view anyway
+        self._pending = deque(maxlen=max_lines)
+
+    def push_lines(self, lines):
+        with self._lock:
+            self._pending.extend(lines)
+
+    def push(self, line):
+        self.push_lines((line,))
+
+    def drain(self):
+        with self._lock:
+            if not self._pending:
+                return []
+            lines = list(self._pending)
+            self._pending.clear()
+        return lines
+
+
+class ConsoleView(QtWidgets.QPlainTextEdit):
+    def __init__(self, max_lines):
+        super().__init__()
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+
+    def append_lines(self, lines):
+        sb = self.verticalScrollBar()
+        at_bottom = sb.value() >= sb.maximum() - 2
+        previous = sb.value()
+
+        # Blocks past maximumBlockCount are trimmed from the top; the scrollbar counts visual
+        # lines, so a reader scrolled back stays put only if their lines are taken off too
+        document = self.document()
+        trimmed = 0
+        if not at_bottom and document.characterCount() > 1:
+            block = document.firstBlock()
+            for _ in range(document.blockCount() + len(lines) - self.maximumBlockCount()):
+                trimmed += max(1, block.lineCount())
+                block = block.next()
+
+        self.appendPlainText("\n".join(lines))
+
+        if at_bottom:
+            sb.setValue(sb.maximum())
+        else:
+            sb.setValue(max(0, previous - trimmed))
+
+
+# (label, process_stats resolution)
+RESOURCE_RANGES = [
+    ("Last 10 minutes", "1s"),
+    ("Last 24 hours", "1m"),
+    ("Last 30 days", "1h"),
+]
+
+
+def _format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+class ResourceChart(QtWidgets.QWidget):
+    # A bare polyline per series; repainting it every second costs next to nothing
+    COLORS = ("#B88AFF", "#5FD3C4")
+
+    def __init__(self, title, describe):
+        super().__init__()
+        self.title = title
+        self.describe = describe
+        self.series = []
+        self.setMinimumHeight(72)
+
+    def set_series(self, series):
+        self.series = series
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 30)))
+        painter.setBrush(QtGui.QColor(0, 0, 0, 35))
+        painter.drawRoundedRect(QtCore.QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+
+        latest = [values[-1] for values in self.series if values]
+        painter.setPen(QtGui.QColor("#E9E7FF"))
+        text = f"{self.title}  {self.describe(*latest)}" if len(latest) == len(self.series) and latest else self.title
+        painter.drawText(self.rect().adjusted(8, 4, -8, -4), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, text)
+
+        area = QtCore.QRectF(self.rect()).adjusted(6, 22, -6, -6)
+        top = max((max(values) for values in self.series if values), default=0) or 1
+        for color, values in zip(self.COLORS, self.series):
+            if len(values) < 2:
+                continue
+            step = area.width() / (len(values) - 1)
+            points = QtGui.QPolygonF([
+                QtCore.QPointF(area.left() + i * step, area.bottom() - value / top * area.height())
+                for i, value in enumerate(values)
+            ])
+            painter.setPen(QtGui.QPen(QtGui.QColor(color), 1.5))
+            painter.drawPolyline(points)
+
+
+def status_address(props_path="server.properties"):
+    # Where to ping the local server: its bind address unless that is blank or a wildcard
+    props = PropertiesFile(props_path).load()
+    host = props.get("server-ip").strip()
+    if host in ("", "0.0.0.0", "::"):
+        host = "127.0.0.1"
+    try:
+        port = int(props.get("server-port", "25565"))
+    except ValueError:
+        port = 25565
+    return host, port
+
+
 class LaunchTab(QtWidgets.QWidget):
-    def __init__(self, server_manager):
+    history_results = QtCore.Signal(int, object, float)
+    status_result = QtCore.Signal(object)
+    resource_sample = QtCore.Signal(object)
+
+    def __init__(self, server_manager, max_lines=None):
         super().__init__()
         self.server_manager = server_manager
+        self.max_lines = max_lines or config.get("console_max_lines")
+        self.sink = ConsoleSink(self.max_lines)
+        self.history_query = 0
+        self.poller = None
+        self.seen_online = False
+        self.sampler = None
         self.init_ui()
         self.connect_signals()
 
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setInterval(config.get("console_flush_ms"))
+        self.flush_timer.timeout.connect(self.flush_console)
+        self.flush_timer.start()
+
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -112,36 +343,70 @@ class LaunchTab(QtWidgets.QWidget):
         hero_text_layout.addWidget(sub)
         
         hero_layout.addLayout(hero_text_layout)
+
+        status_layout = QtWidgets.QVBoxLayout()
+        self.server_status = QtWidgets.QLabel("Offline")
+        self.server_status.setObjectName("H2")
+        self.server_status.setAlignment(QtCore.Qt.AlignRight)
+        self.server_status_detail = QtWidgets.QLabel("")
+        self.server_status_detail.setObjectName("Muted")
+        self.server_status_detail.setAlignment(QtCore.Qt.AlignRight)
+        status_layout.addWidget(self.server_status)
+        status_layout.addWidget(self.server_status_detail)
+        hero_layout.addLayout(status_layout)
         
         layout.addWidget(self.hero)
-        self.console = QtWidgets.QTextEdit()
-        self.console.setReadOnly(True)
-        self.console.setStyleSheet("""
-            QTextEdit {
-                background-color: #0E0C1A;
-                color: #E9E7FF;
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                font-family: Consolas, Monospace;
-                font-size: 12px;
-            }
-        """)
-        layout.addWidget(self.console)
+
+        # Hidden where there is no /proc to sample (Windows, macOS)
+        self.resources = QtWidgets.QWidget()
+        resources_row = QtWidgets.QHBoxLayout(self.resources)
+        resources_row.setContentsMargins(0, 0, 0, 0)
+        self.cpu_chart = ResourceChart("CPU", lambda cpu: f"{cpu:.0f}%")
+        self.memory_chart = ResourceChart("Memory", lambda rss: f"{rss:.0f} MB")
+        self.threads_chart = ResourceChart("Threads / FDs", lambda threads, fds: f"{threads:.0f} / {fds:.0f}")
+        self.io_chart = ResourceChart(
+            "Disk I/O", lambda read, write: f"{_format_bytes(read)}/s in, {_format_bytes(write)}/s out")
+        self.resource_charts = (self.cpu_chart, self.memory_chart, self.threads_chart, self.io_chart)
+        for chart in self.resource_charts:
+            resources_row.addWidget(chart, 1)
+        self.resource_range = QtWidgets.QComboBox()
+        for label, _ in RESOURCE_RANGES:
+            self.resource_range.addItem(label)
+        resources_row.addWidget(self.resource_range, 0, QtCore.Qt.AlignTop)
+        self.resources.setVisible(process_stats.available())
+        layout.addWidget(self.resources)
+
+        search_row = QtWidgets.QHBoxLayout()
+        self.history_input = QtWidgets.QLineEdit()
+        self.history_input.setPlaceholderText("Search console history (regex)...")
+        self.history_input.setClearButtonEnabled(True)
+
+        self.history_range = QtWidgets.QComboBox()
+        for label, _ in HISTORY_RANGES:
+            self.history_range.addItem(label)
+
+        self.history_status = QtWidgets.QLabel("")
+        self.history_status.setObjectName("Muted")
+
+        search_row.addWidget(self.history_input, 1)
+        search_row.addWidget(self.history_range)
+        search_row.addWidget(self.history_status)
+        layout.addLayout(search_row)
+
+        self.console = ConsoleView(self.max_lines)
+        self.console.setObjectName("Console")
+
+        self.history_view = ConsoleView(config.get("history_result_limit") + 1)
+        self.history_view.setObjectName("Console")
+
+        self.console_stack = QtWidgets.QStackedWidget()
+        self.console_stack.addWidget(self.console)
+        self.console_stack.addWidget(self.history_view)
+        layout.addWidget(self.console_stack)
 
         self.console_input = QtWidgets.QLineEdit()
         self.console_input.setPlaceholderText("Type a command...")
-        self.console_input.setStyleSheet("""
-            QLineEdit {
-                background: rgba(0,0,0,35);
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                padding: 10px 12px;
-                color: #E9E7FF;
-            }
-            QLineEdit:focus {
-                border-color: rgba(186, 138, 255, 170);
-            }
-        """)
+        self.console_input.setObjectName("CommandInput")
         layout.addWidget(self.console_input)
 
         controls = QtWidgets.QHBoxLayout()
@@ -162,12 +427,22 @@ class LaunchTab(QtWidgets.QWidget):
     def connect_signals(self):
         self.start_btn.clicked.connect(lambda: self.server_manager.start_server())
         self.stop_btn.clicked.connect(lambda: self.server_manager.stop_server())
+        self.server_manager.add_output_sink(self.sink.push_lines)
         self.server_manager.console_output.connect(self.append_log)
+        self.server_manager.command_failed.connect(self.on_command_failed)
         self.server_manager.server_started.connect(self.on_start)
         self.server_manager.server_stopped.connect(self.on_stop)
         
         self.console_input.returnPressed.connect(self.send_console_command)
 
+        self.history_input.returnPressed.connect(self.run_history_search)
+        self.history_input.textChanged.connect(self.on_history_text_changed)
+        self.history_range.currentIndexChanged.connect(self.run_history_search)
+        self.history_results.connect(self.show_history_results)
+        self.status_result.connect(self.on_status_result)
+        self.resource_sample.connect(self.on_resource_sample)
+        self.resource_range.currentIndexChanged.connect(self.refresh_resource_charts)
+
     def send_console_command(self):
         text = self.console_input.text().strip()
         if text:
@@ -175,16 +450,158 @@ class LaunchTab(QtWidgets.QWidget):
             self.console_input.clear()
 
     def append_log(self, text):
-        self.console.append(text)
-        sb = self.console.verticalScrollBar()
-        sb.setValue(sb.maximum())
+        self.sink.push(text)
+
+    def on_command_failed(self, command, reason):
+        self.append_log(f"Command not sent ({reason}): {command}")
+
+    def flush_console(self):
+        lines = self.sink.drain()
+        if lines:
+            self.console.append_lines(lines)
+
+    def on_history_text_changed(self, text):
+        if not text:
+            self.run_history_search()
+
+    def run_history_search(self):
+        pattern = self.history_input.text()
+        span = HISTORY_RANGES[self.history_range.currentIndex()][1]
+        self.history_query += 1
+
+        if not pattern and span is None:
+            self.history_status.setText("")
+            self.console_stack.setCurrentWidget(self.console)
+            return
+
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            self.history_status.setText(f"Invalid pattern: {e}")
+            return
+
+        start = time.time() - span if span is not None else None
+        self.history_status.setText("Searching...")
+        threading.Thread(
+            target=self._search_history,
+            args=(self.history_query, pattern, start),
+            daemon=True
+        ).start()
+
+    def _search_history(self, query_id, pattern, start):
+        began = time.perf_counter()
+        try:
+            results = self.server_manager.history.search(
+                pattern or None, start=start, limit=config.get("history_result_limit"))
+        except Exception as e:
+            results = e
+        self.history_results.emit(query_id, results, time.perf_counter() - began)
+
+    def show_history_results(self, query_id, results, elapsed):
+        if query_id != self.history_query:
+            return
+
+        self.history_view.clear()
+        if isinstance(results, Exception):
+            self.history_status.setText(f"Search failed: {results}")
+        else:
+            lines = [
+                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} | {line}"
+                for ts, line in results
+            ]
+            if lines:
+                self.history_view.append_lines(lines)
+            self.history_status.setText(f"{len(lines)} matches in {elapsed * 1000:.0f} ms")
+        self.console_stack.setCurrentWidget(self.history_view)
 
     def on_start(self):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
-        self.console.append("--- Server Started ---")
+        self.append_log("--- Server Started ---")
+        self.start_status_poller()
+        self.start_resource_sampler()
 
     def on_stop(self):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.console.append("--- Server Stopped ---")
+        self.append_log("--- Server Stopped ---")
+        self.stop_status_poller()
+        # The charts keep the finished run on screen until the next start
+        if self.sampler:
+            self.sampler.stop()
+
+    def start_resource_sampler(self):
+        if self.sampler:
+            self.sampler.stop()
+            self.sampler = None
+        process = self.server_manager.process
+        if process is None or not process_stats.available(process.pid):
+            return
+        self.sampler = ProcessSampler(
+            process.pid,
+            interval=config.get("resource_sample_interval"),
+            on_sample=self.resource_sample.emit,
+        )
+        self.sampler.start()
+        self.refresh_resource_charts()
+
+    def on_resource_sample(self, sample):
+        # Hidden tabs don't repaint; showEvent catches them up
+        if self.isVisible():
+            self.refresh_resource_charts()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_resource_charts()
+
+    def refresh_resource_charts(self):
+        if self.sampler is None:
+            return
+        points = self.sampler.history.points(RESOURCE_RANGES[self.resource_range.currentIndex()][1])
+        self.cpu_chart.set_series([[p.cpu for p in points]])
+        self.memory_chart.set_series([[p.rss_mb for p in points]])
+        self.threads_chart.set_series([[p.threads for p in points], [p.fds for p in points]])
+        self.io_chart.set_series([[p.read_bps for p in points], [p.write_bps for p in points]])
+
+    def start_status_poller(self):
+        self.stop_status_poller()
+        host, port = status_address()
+        # A fresh poller per run; the old thread may still be finishing a ping
+        self.poller = StatusPoller(
+            host, port,
+            interval=config.get("status_poll_interval"),
+            timeout=config.get("status_poll_timeout"),
+            history=config.get("status_history"),
+            on_result=self.status_result.emit,
+        )
+        self.seen_online = False
+        self.server_status.setText("Starting...")
+        self.server_status_detail.setText(f"{host}:{port}")
+        self.poller.start()
+
+    def stop_status_poller(self):
+        if self.poller:
+            self.poller.stop()
+            self.poller = None
+        self.server_status.setText("Offline")
+        self.server_status_detail.setText("")
+        self.server_status_detail.setToolTip("")
+
+    def on_status_result(self, result):
+        poller = self.poller
+        if poller is None:
+            return
+        if not result.online:
+            # Refused connections are expected while the world is still loading
+            self.server_status.setText("Not responding" if self.seen_online else "Starting...")
+            self.server_status_detail.setToolTip(result.error or "")
+            return
+
+        self.seen_online = True
+        self.server_status.setText("Online")
+        self.server_status_detail.setText(
+            f"{result.players_online}/{result.players_max} players · {result.latency_ms:.0f} ms")
+        average, worst, answered = poller.latency_stats(5 * 60)
+        tooltip = [result.version, result.motd,
+                   f"Last 5 min: avg {average:.0f} ms, worst {worst:.0f} ms, {answered * 100:.0f}% answered"]
+        self.server_status_detail.setToolTip("\n".join(line for line in tooltip if line))
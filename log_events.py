@@ -0,0 +1,202 @@
+import re
+import time
+
+LINE = "line"
+JOIN = "join"
+LEAVE = "leave"
+CHAT = "chat"
+COMMAND = "command"
+OVERLOADED = "overloaded"
+DONE = "done"
+EXCEPTION = "exception"
+BANNED = "banned"
+PARDONED = "pardoned"
+
+# Vanilla/Fabric: "[12:00:00] [Server thread/INFO]: msg" (optionally "(Minecraft) msg")
+# Paper/Spigot:   "[12:00:00 INFO]: msg"
+HEADER = re.compile(
+    r"\[(\d\d:\d\d:\d\d)(?: ([A-Z]+))?\]"
+    r"(?: \[([^\]]*?)/([A-Z]+)\](?: \([^)]*\))?:? |:? )"
+)
+
+# One alternative per event kind; the outer groups are found through lastindex
+MESSAGE = re.compile(
+    r"(?:\[Not Secure\] )?<(\w{1,16})> (.*)"
+    r"|(\w{1,16}) joined the game$"
+    r"|(\w{1,16}) left the game$"
+    r"|(\w{1,16}) issued server command: (/.*)"
+    r"|Can't keep up! Is the server overloaded\? Running (\d+)ms or \d+ ticks behind"
+    r"|Done \((\d+(?:\.\d+)?)s\)!"
+    r"|(?:Caused by: )?((?:[a-zA-Z_$][\w$]*\.)+[\w$]*(?:Exception|Error|Throwable))(?::\s*(.*))?$"
+    r"|Banned (\w{1,16}): (.*)"
+    r"|Unbanned (\w{1,16})$"
+)
+
+# lastindex -> (kind, player group, text group, value group)
+_GROUPS = {
+    2: (CHAT, 1, 2, None),
+    3: (JOIN, 3, None, None),
+    4: (LEAVE, 4, None, None),
+    6: (COMMAND, 5, 6, None),
+    7: (OVERLOADED, None, None, 7),
+    8: (DONE, None, None, 8),
+    9: (EXCEPTION, None, 9, None),
+    10: (EXCEPTION, None, 9, None),
+    12: (BANNED, 11, 12, None),
+    13: (PARDONED, 13, None, None),
+}
+
+
+class LogEvent:
+    # player: join/leave/chat/command/banned/pardoned
+    # text: chat message, command line, exception class, or ban reason
+    # value: milliseconds behind (overloaded) or startup seconds (done)
+    __slots__ = ("kind", "raw", "time", "thread", "level", "message", "player", "text", "value", "received")
+
+    def __init__(self, kind, raw, time_str, thread, level, message, player=None, text=None, value=None):
+        self.kind = kind
+        self.raw = raw
+        self.time = time_str
+        self.thread = thread
+        self.level = level
+        self.message = message
+        self.player = player
+        self.text = text
+        self.value = value
+        self.received = time.time()
+
+    def __repr__(self):
+        return f"LogEvent({self.kind!r}, player={self.player!r}, text={self.text!r}, value={self.value!r})"
+
+
+class EventClassifier:
+    # Callbacks run on the thread that calls feed(), normally the reader thread
+    def __init__(self):
+        self._subscribers = {}
+        self._message_kinds = frozenset()
+
+    def subscribe(self, kind, callback):
+        self._subscribers[kind] = self._subscribers.get(kind, []) + [callback]
+        self._message_kinds = frozenset(k for k in self._subscribers if k != LINE)
+
+    def unsubscribe(self, kind, callback):
+        # Lists are replaced, never changed in place, so a feed() running on another thread
+        # never sees one change under it
+        callbacks = [c for c in self._subscribers.get(kind, []) if c != callback]
+        self._subscribers[kind] = callbacks
+        if not callbacks:
+            self._subscribers.pop(kind, None)
+        self._message_kinds = frozenset(k for k in self._subscribers if k != LINE)
+
+    def classify(self, line):
+        h = HEADER.match(line)
+        if h:
+            time_str, paper_level, thread, level = h.groups()
+            level = level or paper_level
+            message = line[h.end():]
+        else:
+            time_str = thread = level = None
+            message = line
+
+        m = MESSAGE.match(message)
+        if m is None:
+            return LogEvent(LINE, line, time_str, thread, level, message)
+
+        kind, player_group, text_group, value_group = _GROUPS[m.lastindex]
+        value = m.group(value_group) if value_group else None
+        if value is not None:
+            value = float(value) if kind == DONE else int(value)
+        return LogEvent(
+            kind, line, time_str, thread, level, message,
+            player=m.group(player_group) if player_group else None,
+            text=m.group(text_group) if text_group else None,
+            value=value,
+        )
+
+    def feed(self, lines):
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+
+        line_callbacks = subscribers.get(LINE)
+        message_kinds = self._message_kinds
+        header_match = HEADER.match
+        message_match = MESSAGE.match
+
+        for line in lines:
+            if line_callbacks:
+                event = self.classify(line)
+                for callback in line_callbacks:
+                    callback(event)
+                if event.kind == LINE:
+                    continue
+                for callback in subscribers.get(event.kind, ()):
+                    callback(event)
+                continue
+
+            if not message_kinds:
+                continue
+
+            h = header_match(line)
+            m = message_match(line, h.end()) if h else message_match(line)
+            if m is None:
+                continue
+            kind = _GROUPS[m.lastindex][0]
+            if kind in message_kinds:
+                event = self.classify(line)
+                for callback in subscribers.get(kind, ()):
+                    callback(event)
+
+
+def _benchmark(total=500_000, target=100_000):
+    # Fails unless every row classifies at least target lines/s with the expected counts
+    import random
+    from collections import Counter
+
+    samples = [
+        ("[12:00:01] [Server thread/INFO]: Preparing spawn area: 42%", LINE),
+        ("[12:00:01] [Worker-Main-3/INFO]: Loaded 7 recipes", LINE),
+        ("[12:00:02] [Server thread/INFO]: Steve joined the game", JOIN),
+        ("[12:00:03] [Server thread/INFO]: <Steve> hello there", CHAT),
+        ("[12:00:04] [Server thread/INFO]: Steve issued server command: /tp Alex", COMMAND),
+        ("[12:00:05] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2012ms or 40 ticks behind",
+         OVERLOADED),
+        ("[12:00:06] [Server thread/INFO]: Done (12.345s)! For help, type \"help\"", DONE),
+        ("java.lang.IllegalStateException: Not ready", EXCEPTION),
+        ("\tat net.minecraft.server.MinecraftServer.run(MinecraftServer.java:42)", LINE),
+        ("[12:00:07 INFO]: Alex left the game", LEAVE),
+        ("[12:00:07] [Server thread/INFO]: Banned Griefer: Raiding", BANNED),
+        ("[12:00:08] [Server thread/INFO] (Minecraft) Saving chunks for level 'ServerLevel[world]'/minecraft:overworld",
+         LINE),
+    ]
+    weights = [40, 30, 2, 4, 2, 1, 1, 1, 10, 2, 1, 7]
+    chosen = random.Random(0).choices(samples, weights=weights, k=total)
+    lines = [line for line, _ in chosen]
+    expected = Counter(kind for _, kind in chosen)
+    message_kinds = [JOIN, LEAVE, CHAT, COMMAND, OVERLOADED, DONE, EXCEPTION, BANNED, PARDONED]
+
+    def run(label, kinds):
+        counts = Counter()
+        classifier = EventClassifier()
+        for kind in kinds:
+            classifier.subscribe(kind, lambda event: counts.update((event.kind,)))
+        started = time.perf_counter()
+        classifier.feed(lines)
+        rate = total / (time.perf_counter() - started)
+        print(f"{label:<28} {rate:>12,.0f} lines/s  {dict(counts)}")
+
+        # A LINE subscriber is handed every line, each already classified as its own kind
+        want = Counter({kind: n for kind, n in expected.items() if LINE in kinds or kind in kinds})
+        assert counts == want, f"{label}: {dict(counts)} != {dict(want)}"
+        assert rate >= target, f"{label}: {rate:,.0f} lines/s is under {target:,}"
+        return rate
+
+    # Subscribed to a kind that never occurs, so every line is still matched and skipped
+    run("no matching subscribers", [PARDONED])
+    run("join only", [JOIN])
+    run("all message events", message_kinds)
+    run("every line", [LINE])
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,281 @@
+import os
+import re
+import mmap
+import time
+import bisect
+import threading
+from array import array
+
+SEGMENT_BYTES = 32 * 1024 * 1024
+# Index records are (timestamp_ms, byte_offset) pairs of signed 64-bit ints
+INDEX_TYPECODE = "q"
+RECORD_BYTES = 16
+# A pattern without any of these is searched for as plain text
+REGEX_SPECIAL = set(".^$*+?{}[]|()\\")
+
+
+class Segment:
+    def __init__(self, directory, number):
+        self.number = number
+        self.log_path = os.path.join(directory, f"{number:08d}.log")
+        self.idx_path = os.path.join(directory, f"{number:08d}.idx")
+
+    def time_bounds(self):
+        try:
+            size = os.path.getsize(self.idx_path)
+        except OSError:
+            return None
+        if size < RECORD_BYTES:
+            return None
+        with open(self.idx_path, 'rb') as f:
+            first = array(INDEX_TYPECODE, f.read(RECORD_BYTES))
+            f.seek(size - size % RECORD_BYTES - RECORD_BYTES)
+            last = array(INDEX_TYPECODE, f.read(RECORD_BYTES))
+        return first[0], last[0]
+
+    def load_index(self, records=None):
+        raw = array(INDEX_TYPECODE)
+        with open(self.idx_path, 'rb') as f:
+            data = f.read() if records is None else f.read(records * RECORD_BYTES)
+        raw.frombytes(data[:len(data) - len(data) % RECORD_BYTES])
+        return raw[0::2], raw[1::2]
+
+
+class LogStore:
+    def __init__(self, directory="console_history", segment_bytes=SEGMENT_BYTES, max_total_bytes=0):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        self._log_file = None
+        self._idx_file = None
+        self._offset = 0
+        self._last_flush = 0.0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.segments = self._discover()
+        if not self.segments:
+            self.segments.append(Segment(self.directory, 1))
+        self._open_active()
+
+    def _discover(self):
+        numbers = []
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if ext == ".log" and stem.isdigit():
+                numbers.append(int(stem))
+        return [Segment(self.directory, n) for n in sorted(numbers)]
+
+    def _open_active(self):
+        active = self.segments[-1]
+        self._log_file = open(active.log_path, 'ab')
+        self._idx_file = open(active.idx_path, 'ab')
+        self._offset = self._log_file.tell()
+
+        # Drop a trailing partial index record left by a crash
+        idx_size = self._idx_file.tell()
+        if idx_size % RECORD_BYTES:
+            self._idx_file.truncate(idx_size - idx_size % RECORD_BYTES)
+            self._idx_file.seek(0, os.SEEK_END)
+
+    def _roll(self):
+        self._log_file.close()
+        self._idx_file.close()
+        self.segments.append(Segment(self.directory, self.segments[-1].number + 1))
+        self._open_active()
+        self._prune()
+
+    def _prune(self):
+        if not self.max_total_bytes:
+            return
+        total = sum(os.path.getsize(s.log_path) for s in self.segments if os.path.exists(s.log_path))
+        while total > self.max_total_bytes and len(self.segments) > 1:
+            oldest = self.segments.pop(0)
+            try:
+                total -= os.path.getsize(oldest.log_path)
+                os.remove(oldest.log_path)
+                os.remove(oldest.idx_path)
+            except OSError:
+                pass
+
+    def append(self, lines, timestamp=None):
+        ts = int((timestamp if timestamp is not None else time.time()) * 1000)
+        with self._lock:
+            if self._log_file is None:
+                return
+
+            records = array(INDEX_TYPECODE)
+            chunks = []
+            offset = self._offset
+            for line in lines:
+                data = line.replace("\n", " ").encode('utf-8', 'replace') + b"\n"
+                records.append(ts)
+                records.append(offset)
+                chunks.append(data)
+                offset += len(data)
+
+            self._log_file.write(b"".join(chunks))
+            self._idx_file.write(records.tobytes())
+            self._offset = offset
+
+            now = time.monotonic()
+            if now - self._last_flush > 0.5:
+                self._flush_locked()
+                self._last_flush = now
+
+            if self._offset >= self.segment_bytes:
+                self._flush_locked()
+                self._roll()
+
+    def _flush_locked(self):
+        if self._log_file is not None:
+            # Index last, so every index record points at data already on disk
+            self._log_file.flush()
+            self._idx_file.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._flush_locked()
+                self._log_file.close()
+                self._idx_file.close()
+                self._log_file = None
+                self._idx_file = None
+
+    def search(self, pattern=None, start=None, end=None, limit=1000, ignore_case=True):
+        # Returns the newest (unix_time, line) matches, oldest first.
+        # Plain text ignores case for any letter; regex patterns only fold ASCII letters.
+        matcher = _compile(pattern, ignore_case) if pattern else None
+        start_ms = int(start * 1000) if start is not None else None
+        end_ms = int(end * 1000) if end is not None else None
+
+        results = []
+        for segment in reversed(list(self.segments)):
+            if len(results) >= limit:
+                break
+
+            # The writer lock is held only to flush and note how far the active segment goes;
+            # the scan itself runs unlocked so the reader thread never waits on a search
+            records = size = None
+            with self._lock:
+                if segment is self.segments[-1] and self._log_file is not None:
+                    self._flush_locked()
+                    records = self._idx_file.tell() // RECORD_BYTES
+                    size = self._offset
+            try:
+                bounds = segment.time_bounds()
+                if bounds is None:
+                    continue
+                if start_ms is not None and bounds[1] < start_ms:
+                    break
+                if end_ms is not None and bounds[0] > end_ms:
+                    continue
+                found = self._search_segment(segment, matcher, start_ms, end_ms, limit - len(results), records, size)
+            except OSError:
+                # Segment pruned while searching
+                continue
+            results = found + results
+
+        return [(ts / 1000.0, line) for ts, line in results]
+
+    def _search_segment(self, segment, matcher, start_ms, end_ms, limit, records=None, size=None):
+        # records/size bound the active segment to what was flushed when the search began
+        timestamps, offsets = segment.load_index(records)
+        if not offsets:
+            return []
+
+        first = bisect.bisect_left(timestamps, start_ms) if start_ms is not None else 0
+        last = bisect.bisect_right(timestamps, end_ms) if end_ms is not None else len(timestamps)
+        if first >= last:
+            return []
+
+        with open(segment.log_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            size = file_size if size is None else min(size, file_size)
+            if size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lo = offsets[first]
+                hi = offsets[last] if last < len(offsets) else size
+
+                if matcher is None:
+                    rows = range(max(first, last - limit), last)
+                    return [(timestamps[i], _line_at(mm, offsets, i, size)) for i in rows]
+
+                hits = []
+                pos = lo
+                while pos < hi:
+                    match_start = matcher(mm, pos, hi)
+                    if match_start < 0:
+                        break
+                    row = bisect.bisect_right(offsets, match_start, first, last) - 1
+                    hits.append(row)
+                    pos = offsets[row + 1] if row + 1 < len(offsets) else hi
+
+                return [(timestamps[i], _line_at(mm, offsets, i, size)) for i in hits[-limit:]]
+
+
+def _line_at(mm, offsets, row, size):
+    end = offsets[row + 1] if row + 1 < len(offsets) else size
+    return mm[offsets[row]:end].rstrip(b"\n").decode('utf-8', 'replace')
+
+
+def _compile(pattern, ignore_case):
+    # Plain text searches avoid the regex engine, which is several times slower
+    if not any(c in REGEX_SPECIAL for c in pattern):
+        needle = pattern.encode('utf-8')
+        if ignore_case and not pattern.isascii():
+            return _compile(_folding_pattern(pattern), False)
+        if not ignore_case:
+            def find(buf, pos, end):
+                return buf.find(needle, pos, end)
+            return find
+        return _FoldedFinder(needle.lower())
+
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    rx = re.compile(pattern.encode('utf-8'), flags)
+
+    def search(buf, pos, end):
+        m = rx.search(buf, pos, end)
+        return m.start() if m else -1
+    return search
+
+
+def _folding_pattern(text):
+    # bytes.lower() and re.IGNORECASE on bytes only fold ASCII, so every cased letter
+    # becomes an alternation of its encoded forms instead
+    parts = []
+    for c in text:
+        forms = sorted({c, c.lower(), c.upper(), c.title()}, key=len, reverse=True)
+        forms = [re.escape(f) for f in forms if len(f) == 1 or f == c]
+        parts.append(forms[0] if len(forms) == 1 else "(?:" + "|".join(forms) + ")")
+    return "".join(parts)
+
+
+class _FoldedFinder:
+    CHUNK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, needle):
+        self.needle = needle
+        self._buf = None
+        self._start = 0
+        self._chunk = b""
+
+    def __call__(self, buf, pos, end):
+        overlap = len(self.needle) - 1
+        while pos < end:
+            if buf is not self._buf or not (self._start <= pos < self._start + len(self._chunk) - overlap):
+                self._buf = buf
+                self._start = pos
+                # bytes.lower() only folds ASCII, so offsets stay aligned
+                self._chunk = buf[pos:min(end, pos + self.CHUNK_BYTES + overlap)].lower()
+
+            i = self._chunk.find(self.needle, pos - self._start, end - self._start)
+            if i >= 0:
+                return self._start + i
+            pos = self._start + max(len(self._chunk) - overlap, 1)
+        return -1
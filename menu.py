@@ -1,11 +1,14 @@
 import sys
 import os
+import time
 import shutil
+import threading
+import multiprocessing
 from PySide6 import QtCore, QtGui, QtWidgets
+import config
 from launch import LaunchTab, ServerManager
-from ban import BanTab
-from plugin_handler import PluginsTab
-from settings import SettingsTab
+from paint_meter import PaintMeter
+from startup_timer import StartupTimer
 
 IS_FROZEN = getattr(sys, "frozen", False)
 BASE_DIR = sys._MEIPASS if IS_FROZEN else os.path.dirname(os.path.abspath(__file__))
@@ -95,6 +98,14 @@ QPushButton#Primary {
     padding: 15px 20px;
     border-radius: 12px;
 }
+QPushButton#Primary:hover {
+    background: rgba(255,255,255,26);
+    border-color: rgba(186, 138, 255, 140);
+    color: #E9E7FF;
+}
+QPushButton#Primary:pressed {
+    background: rgba(186, 138, 255, 40);
+}
 QPushButton#Secondary {
     background: rgba(255,255,255,20);
     border: 1px solid rgba(255,255,255,30);
@@ -114,6 +125,66 @@ QLineEdit {
 QLineEdit:focus {
     border-color: rgba(186, 138, 255, 170);
 }
+QLineEdit#CommandInput {
+    border-radius: 8px;
+}
+QSpinBox, QComboBox {
+    background: rgba(0,0,0,35);
+    border: 1px solid rgba(255,255,255,30);
+    border-radius: 8px;
+    padding: 8px;
+    color: white;
+}
+QComboBox::drop-down {
+    border: none;
+}
+QComboBox QAbstractItemView {
+    background-color: #0E0C1A;
+    color: white;
+    selection-background-color: rgba(186, 138, 255, 100);
+}
+QCheckBox {
+    color: #E9E7FF;
+    font-size: 14px;
+}
+QPlainTextEdit#Console {
+    background-color: #0E0C1A;
+    color: #E9E7FF;
+    border: 1px solid rgba(255,255,255,30);
+    border-radius: 8px;
+    font-family: Consolas, Monospace;
+    font-size: 12px;
+}
+QListView#Whitelist, QListView#BanList {
+    background: rgba(0,0,0,35);
+    border: 1px solid rgba(255,255,255,30);
+    border-radius: 8px;
+    color: #E9E7FF;
+}
+QListWidget#PluginList {
+    background: transparent;
+    border: none;
+}
+QListWidget#PluginList::item {
+    background: rgba(20, 16, 40, 155);
+    border: 1px solid rgba(255,255,255,30);
+    border-radius: 8px;
+    padding: 10px;
+    margin-bottom: 5px;
+    color: #E9E7FF;
+}
+QLabel#DropArea {
+    border: 2px dashed rgba(255, 255, 255, 50);
+    border-radius: 12px;
+    color: rgba(255, 255, 255, 150);
+    font-size: 14px;
+    padding: 30px;
+    background: rgba(0, 0, 0, 20);
+}
+QLabel#DropArea:hover {
+    border-color: rgba(186, 138, 255, 150);
+    background: rgba(186, 138, 255, 20);
+}
 QScrollArea {
     background: transparent;
     border: none;
@@ -146,6 +217,13 @@ QStackedWidget {
 }
 """
 
+# Performance mode: a flat window background instead of the full-window gradient
+PERFORMANCE_QSS = """
+QWidget#Root {
+    background: #0B0B12;
+}
+"""
+
 class Glow(QtWidgets.QGraphicsDropShadowEffect):
     def __init__(self, color="#B88AFF", blur=28, y=8, parent=None):
         super().__init__(parent)
@@ -156,12 +234,30 @@ class Glow(QtWidgets.QGraphicsDropShadowEffect):
         self.setOffset(0, y)
 
 class VersionSelectorDialog(QtWidgets.QDialog):
+    versions_loaded = QtCore.Signal(list, str)
+    download_progress = QtCore.Signal(object, object)
+    download_finished = QtCore.Signal(str, str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Install Minecraft Server")
-        self.setFixedSize(400, 250)
-        
+        self.setFixedSize(420, 480)
+
         self.selected_version = None
+        self.installed = False
+        from server_versions import VersionCatalog
+        self.catalog = VersionCatalog(
+            config.get("server_jar_cache_dir"),
+            manifest_url=config.get("version_manifest_url"),
+            manifest_ttl=config.get("version_manifest_ttl"),
+            segments=config.get("download_segments"),
+        )
+        self.remote_versions = []
+        # Set when the dialog closes so a download in progress stops at its next chunk
+        self.cancel_download = threading.Event()
+        self.versions_loaded.connect(self.on_versions_loaded)
+        self.download_progress.connect(self.on_download_progress)
+        self.download_finished.connect(self.on_download_finished)
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -175,31 +271,125 @@ class VersionSelectorDialog(QtWidgets.QDialog):
         layout.addWidget(desc)
         
         layout.addSpacing(10)
-        
-        btn_layout = QtWidgets.QVBoxLayout()
-        btn_layout.setSpacing(10)
-        
-        self.btn_v5 = QtWidgets.QPushButton("Minecraft 1.21.5")
-        self.btn_v5.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        self.btn_v5.clicked.connect(lambda: self.select_version("1.21.5"))
-        
-        self.btn_v10 = QtWidgets.QPushButton("Minecraft 1.21.10")
-        self.btn_v10.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        self.btn_v10.clicked.connect(lambda: self.select_version("1.21.10"))
-        
-        btn_layout.addWidget(self.btn_v5)
-        btn_layout.addWidget(self.btn_v10)
-        
-        layout.addLayout(btn_layout)
-        layout.addStretch(1)
 
-    def select_version(self, version):
+        self.version_list = QtWidgets.QListWidget()
+        self.version_list.itemDoubleClicked.connect(self.install_selected)
+        layout.addWidget(self.version_list, 1)
+
+        self.snapshots_check = QtWidgets.QCheckBox("Show snapshots")
+        self.snapshots_check.toggled.connect(self.populate_versions)
+        layout.addWidget(self.snapshots_check)
+
+        self.status = QtWidgets.QLabel("Loading versions...")
+        self.status.setObjectName("Muted")
+        layout.addWidget(self.status)
+
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.hide()
+        layout.addWidget(self.progress)
+
+        self.btn_install = QtWidgets.QPushButton("Install")
+        self.btn_install.setObjectName("Primary")
+        self.btn_install.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btn_install.clicked.connect(self.install_selected)
+        layout.addWidget(self.btn_install)
+
+        self.populate_versions()
+        threading.Thread(target=self._load_versions, daemon=True).start()
+
+    def bundled_versions(self):
+        options_dir = os.path.join(BASE_DIR, "server_options")
+        if not os.path.isdir(options_dir):
+            return []
+        return sorted(
+            (v for v in os.listdir(options_dir) if os.path.exists(os.path.join(options_dir, v, "server.jar"))),
+            reverse=True)
+
+    def _load_versions(self):
+        try:
+            self.versions_loaded.emit(self.catalog.versions(include_snapshots=True), "")
+        except Exception as e:
+            self.versions_loaded.emit([], str(e))
+
+    def on_versions_loaded(self, versions, error):
+        self.remote_versions = versions
+        self.status.setText(f"Could not load the version list: {error}" if error else "")
+        self.populate_versions()
+
+    def populate_versions(self):
+        self.version_list.clear()
+        for version in self.bundled_versions():
+            item = QtWidgets.QListWidgetItem(f"Minecraft {version} (bundled)")
+            item.setData(QtCore.Qt.UserRole, ("bundled", version))
+            self.version_list.addItem(item)
+        show_snapshots = self.snapshots_check.isChecked()
+        for version, kind in self.remote_versions:
+            if kind == "release" or show_snapshots:
+                item = QtWidgets.QListWidgetItem(f"Minecraft {version}" + ("" if kind == "release" else f" ({kind})"))
+                item.setData(QtCore.Qt.UserRole, ("download", version))
+                self.version_list.addItem(item)
+        if self.version_list.count():
+            self.version_list.setCurrentRow(0)
+
+    def install_selected(self, *args):
+        item = self.version_list.currentItem()
+        if item is None:
+            return
+        source, version = item.data(QtCore.Qt.UserRole)
         self.selected_version = version
+        if source == "bundled":
+            self.accept()
+            return
+
+        self.btn_install.setEnabled(False)
+        self.version_list.setEnabled(False)
+        self.status.setText(f"Preparing {version}...")
+        self.progress.setValue(0)
+        self.progress.show()
+        threading.Thread(target=self._download, args=(version,), daemon=True).start()
+
+    def _download(self, version):
+        try:
+            sha1 = self.catalog.fetch(version, progress=self.download_progress.emit, cancel=self.cancel_download)
+            if self.cancel_download.is_set():
+                return
+            self.catalog.install(sha1, "server.jar")
+            self.download_finished.emit(version, "")
+        except Exception as e:
+            self.download_finished.emit(version, str(e))
+
+    def on_download_progress(self, done, total):
+        # Emitted per chunk from several threads; byte counts overflow a Qt int for large files
+        percent = int(done * 100 / total) if total else 0
+        self.progress.setValue(percent)
+        self.status.setText(f"Downloading {self.selected_version}: {done // (1 << 20)} / {total // (1 << 20)} MB")
+
+    def on_download_finished(self, version, error):
+        if self.cancel_download.is_set():
+            return
+        if error:
+            self.progress.hide()
+            self.btn_install.setEnabled(True)
+            self.version_list.setEnabled(True)
+            self.status.setText(f"Download failed: {error}")
+            return
+        self.installed = True
         self.accept()
 
+    def done(self, result):
+        # accept(), reject() and closing the window all end here; the session is only
+        # needed while the dialog is open, and a failed download can be retried until then
+        self.cancel_download.set()
+        self.catalog.close()
+        super().done(result)
+
+TAB_NAMES = ["Launch", "Settings", "Ban", "Plugins"]
+
+
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, timer=None, performance_mode=False):
         super().__init__()
+        self.timer = timer
         self.setWindowTitle("Minecraft Server Panel")
         self.resize(1100, 680)
 
@@ -208,6 +398,8 @@ class MainWindow(QtWidgets.QMainWindow):
         root = QtWidgets.QWidget()
         root.setObjectName("Root")
         self.setCentralWidget(root)
+        if timer:
+            root.installEventFilter(self)
 
         grid = QtWidgets.QGridLayout(root)
         grid.setContentsMargins(18, 18, 18, 18)
@@ -238,7 +430,7 @@ class MainWindow(QtWidgets.QMainWindow):
         sb_layout.addSpacing(20)
         
         self.nav_buttons = {}
-        for name in ["Launch", "Settings", "Ban", "Plugins"]:
+        for name in TAB_NAMES:
             btn = QtWidgets.QPushButton(name)
             btn.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
             sb_layout.addWidget(btn)
@@ -248,7 +440,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
         content_area = QtWidgets.QFrame()
         content_area.setObjectName("Card") 
-        content_area.setGraphicsEffect(Glow(blur=30, y=10))
+        # The blur re-renders the whole card offscreen on every console update
+        if not performance_mode:
+            content_area.setGraphicsEffect(Glow(blur=30, y=10))
         
         content_layout = QtWidgets.QVBoxLayout(content_area)
         content_layout.setContentsMargins(0, 0, 0, 0)
@@ -256,15 +450,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.stack = QtWidgets.QStackedWidget()
         content_layout.addWidget(self.stack)
 
-        self.tab_launch = LaunchTab(self.server_manager)
-        self.tab_settings = SettingsTab()
-        self.tab_ban = BanTab(self.server_manager)
-        self.tab_plugins = PluginsTab()
+        if timer:
+            timer.mark("window chrome")
 
-        self.stack.addWidget(self.tab_launch)
-        self.stack.addWidget(self.tab_settings)
-        self.stack.addWidget(self.tab_ban)
-        self.stack.addWidget(self.tab_plugins)
+        # Tabs are built the first time they're shown; until then the stack holds placeholders
+        self.tabs = {}
+        for _ in TAB_NAMES:
+            self.stack.addWidget(QtWidgets.QWidget())
 
         self.nav_buttons["Launch"].clicked.connect(lambda: self.switch_tab(0))
         self.nav_buttons["Settings"].clicked.connect(lambda: self.switch_tab(1))
@@ -276,9 +468,55 @@ class MainWindow(QtWidgets.QMainWindow):
         grid.addWidget(sidebar, 0, 0)
         grid.addWidget(content_area, 0, 1)
 
+    def create_tab(self, index):
+        if index == 0:
+            return LaunchTab(self.server_manager)
+        if index == 1:
+            from settings import SettingsTab
+            return SettingsTab(server_manager=self.server_manager)
+        if index == 2:
+            from ban import BanTab
+            return BanTab(self.server_manager)
+        from plugin_handler import PluginsTab
+        return PluginsTab()
+
+    def ensure_tab(self, index):
+        tab = self.tabs.get(index)
+        if tab is not None:
+            return tab
+
+        began = time.perf_counter()
+        tab = self.create_tab(index)
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, tab)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.tabs[index] = tab
+        setattr(self, "tab_" + TAB_NAMES[index].lower(), tab)
+
+        if self.timer:
+            name = f"{TAB_NAMES[index].lower()} tab"
+            if self.timer.reported:
+                self.timer.log(f"{name} built in {(time.perf_counter() - began) * 1000:.0f}ms")
+            else:
+                self.timer.mark(name)
+        return tab
+
     def switch_tab(self, index):
+        self.ensure_tab(index)
         self.stack.setCurrentIndex(index)
 
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint and self.timer and not self.timer.reported:
+            obj.removeEventFilter(self)
+            # Report once this paint has gone through
+            QtCore.QTimer.singleShot(0, self.report_startup)
+        return super().eventFilter(obj, event)
+
+    def report_startup(self):
+        self.timer.mark("first paint")
+        self.timer.report()
+
     def closeEvent(self, event):
         if self.server_manager.running:
              reply = QtWidgets.QMessageBox.question(
@@ -316,20 +554,33 @@ def install_server(version):
         return False
 
 def main():
+    timer = StartupTimer(config.get("startup_budget_ms"))
+    timer.mark("imports")
+    performance_mode = config.get("performance_mode") or "--performance" in sys.argv
     app = QtWidgets.QApplication(sys.argv)
-    app.setStyleSheet(QSS)
+    app.setStyleSheet(QSS + PERFORMANCE_QSS if performance_mode else QSS)
+    timer.mark("qt init")
     
     if not check_installation():
         dlg = VersionSelectorDialog()
         if dlg.exec() == QtWidgets.QDialog.Accepted and dlg.selected_version:
-            if not install_server(dlg.selected_version):
+            if dlg.installed:
+                QtWidgets.QMessageBox.information(None, "Success", f"Installed Server {dlg.selected_version} successfully.")
+            elif not install_server(dlg.selected_version):
                 return
         else:
             return
+        timer.mark("install dialog")
 
-    window = MainWindow()
+    window = MainWindow(timer, performance_mode=performance_mode)
+    timer.mark("window")
+    paint_interval = config.get("paint_stats_interval_ms") or (10000 if "--paint-stats" in sys.argv else 0)
+    if paint_interval:
+        window.paint_meter = PaintMeter(window, paint_interval)
     window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Plugin scanning uses a process pool, which needs this in a frozen exe
+    multiprocessing.freeze_support()
     main()
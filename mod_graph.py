@@ -0,0 +1,185 @@
+import re
+
+MISSING = "missing"
+DUPLICATE = "duplicate"
+VERSION = "version"
+BREAKS = "breaks"
+
+# Supplied by the server/loader itself rather than by a jar in plugins/
+PLATFORM_IDS = {"minecraft", "java", "fabricloader", "fabric-loader", "quilt_loader", "forge", "neoforge", "fml"}
+
+VERSION_START = re.compile(r"^[vV]?\d")
+MAVEN_RANGE = re.compile(r"([\[(])\s*([^,\])]*?)\s*(?:(,)\s*([^\])]*?)\s*)?([\])])")
+PREDICATE = re.compile(r"^(>=|<=|>|<|=|~|\^)?\s*(.+)$")
+
+
+def version_key(version):
+    # Numeric release parts compare as numbers; a "-pre" suffix sorts below the release
+    version = str(version).split("+", 1)[0].strip().lstrip("vV")
+    core, _, pre = version.partition("-")
+    parts = []
+    for part in core.split("."):
+        digits = re.match(r"\d+", part)
+        parts.append(int(digits.group()) if digits else 0)
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts), 0 if pre else 1, pre
+
+
+def _wildcard_matches(version, pattern):
+    prefix = []
+    for part in pattern.split("."):
+        if part in ("x", "X", "*"):
+            break
+        prefix.append(part)
+    wanted = version_key(".".join(prefix))[0] if prefix else ()
+    have = version_key(version)[0]
+    have = have + (0,) * (len(wanted) - len(have))
+    return have[:len(wanted)] == wanted
+
+
+def _predicate_matches(version, predicate):
+    match = PREDICATE.match(predicate)
+    if match is None:
+        return True
+    op, target = match.group(1) or "=", match.group(2)
+    if not VERSION_START.match(target):
+        return True
+    if op == "=" and any(c in target for c in "xX*"):
+        return _wildcard_matches(version, target)
+
+    have, want = version_key(version), version_key(target)
+    if op == ">=":
+        return have >= want
+    if op == "<=":
+        return have <= want
+    if op == ">":
+        return have > want
+    if op == "<":
+        return have < want
+    if op == "=":
+        return have == want
+    # ~1.2.3 allows 1.2.x, ^1.2.3 allows 1.x.x, both starting at 1.2.3
+    parts = want[0] + (0,) * (2 - len(want[0]))
+    upper = (parts[0], parts[1] + 1) if op == "~" else (parts[0] + 1,)
+    return have >= want and have[0] < upper
+
+
+def _maven_matches(version, spec):
+    have = version_key(version)
+    for opening, low, comma, high, closing in MAVEN_RANGE.findall(spec):
+        if not comma:
+            if low and have == version_key(low):
+                return True
+            continue
+        if low and (have < version_key(low) if opening == "[" else have <= version_key(low)):
+            continue
+        if high and (have > version_key(high) if closing == "]" else have >= version_key(high)):
+            continue
+        return True
+    return False
+
+
+def version_matches(version, spec):
+    # Understands Fabric/Quilt predicates (">=1.2 <2", "1.20.x", "~", "^", "||") and Maven ranges
+    # used by Forge. Anything it can't interpret counts as a match so it never invents problems.
+    spec = str(spec).strip()
+    if not spec or spec == "*" or not VERSION_START.match(str(version)):
+        return True
+    if spec[0] in "[(":
+        return _maven_matches(version, spec)
+    return any(
+        all(_predicate_matches(version, token) for token in alternative.split())
+        for alternative in spec.split("||")
+    )
+
+
+class DependencyGraph:
+    # Kept up to date jar by jar; only jars touched by a change are re-checked
+    def __init__(self):
+        self.jars = {}         # filename -> [mod]
+        self.providers = {}    # mod id -> {filename: version}, including "provides" aliases
+        self.dependents = {}   # mod id -> {filename} that depend on it or declare a break with it
+        self._issues = {}      # filename -> [(kind, filename, message)]
+        self._dirty = set()
+
+    def update(self, filename, info):
+        self.remove(filename)
+        mods = info.get("mods", []) if info else []
+        self.jars[filename] = mods
+        for mod in mods:
+            for mod_id in [mod["id"]] + mod["provides"]:
+                self.providers.setdefault(mod_id, {})[filename] = mod["version"]
+                self._touch(mod_id)
+            # Bundled mods only count as providers; the loader resolves their own needs
+            if mod.get("nested"):
+                continue
+            for mod_id in list(mod["depends"]) + list(mod["breaks"]):
+                self.dependents.setdefault(mod_id, set()).add(filename)
+        self._dirty.add(filename)
+
+    def remove(self, filename):
+        for mod in self.jars.pop(filename, []):
+            for mod_id in [mod["id"]] + mod["provides"]:
+                providers = self.providers.get(mod_id, {})
+                providers.pop(filename, None)
+                if not providers:
+                    self.providers.pop(mod_id, None)
+                self._touch(mod_id)
+            if mod.get("nested"):
+                continue
+            for mod_id in list(mod["depends"]) + list(mod["breaks"]):
+                dependents = self.dependents.get(mod_id, set())
+                dependents.discard(filename)
+                if not dependents:
+                    self.dependents.pop(mod_id, None)
+        self._issues.pop(filename, None)
+        self._dirty.discard(filename)
+
+    def _touch(self, mod_id):
+        self._dirty.update(self.dependents.get(mod_id, ()))
+        self._dirty.update(self.providers.get(mod_id, ()))
+
+    def issues(self):
+        for filename in self._dirty:
+            if filename in self.jars:
+                self._issues[filename] = self._check(filename)
+        self._dirty.clear()
+        return [issue for filename in sorted(self._issues) for issue in self._issues[filename]]
+
+    def issues_for(self, filename):
+        self.issues()
+        return self._issues.get(filename, [])
+
+    def _check(self, filename):
+        found = []
+        for mod in self.jars[filename]:
+            if mod.get("nested"):
+                continue
+            for mod_id in [mod["id"]] + mod["provides"]:
+                # Several mods bundling the same library is normal; the loader picks one copy
+                others = sorted(f for f in self.providers.get(mod_id, {})
+                                if f != filename and self._provides_directly(f, mod_id))
+                if others:
+                    found.append((DUPLICATE, filename, f"'{mod_id}' is also provided by {', '.join(others)}"))
+
+            for mod_id, spec in mod["depends"].items():
+                if mod_id in PLATFORM_IDS:
+                    continue
+                wanted = f"'{mod_id}'" if spec in ("", "*") else f"'{mod_id}' {spec}"
+                providers = self.providers.get(mod_id)
+                if not providers:
+                    found.append((MISSING, filename, f"requires {wanted}, which is not installed"))
+                elif not any(version_matches(v, spec) for v in providers.values()):
+                    versions = ", ".join(sorted(set(providers.values())))
+                    found.append((VERSION, filename, f"requires {wanted}, found {versions}"))
+
+            for mod_id, spec in mod["breaks"].items():
+                for other, version in sorted(self.providers.get(mod_id, {}).items()):
+                    if other != filename and version_matches(version, spec):
+                        found.append((BREAKS, filename, f"is incompatible with '{mod_id}' {version} ({other})"))
+        return found
+
+    def _provides_directly(self, filename, mod_id):
+        return any(not mod.get("nested") and (mod["id"] == mod_id or mod_id in mod["provides"])
+                   for mod in self.jars.get(filename, []))
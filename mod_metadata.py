@@ -0,0 +1,257 @@
+import re
+import json
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11; Forge/NeoForge jars then fall back to the manifest
+    tomllib = None
+
+FABRIC = "fabric"
+QUILT = "quilt"
+FORGE = "forge"
+NEOFORGE = "neoforge"
+BUKKIT = "bukkit"
+PAPER = "paper"
+
+MANIFEST = "META-INF/MANIFEST.MF"
+# Checked in this order; a jar that ships several descriptors is reported by the first one
+METADATA_FILES = [
+    ("fabric.mod.json", FABRIC),
+    ("quilt.mod.json", QUILT),
+    ("META-INF/neoforge.mods.toml", NEOFORGE),
+    ("META-INF/mods.toml", FORGE),
+    ("paper-plugin.yml", PAPER),
+    ("plugin.yml", BUKKIT),
+]
+METADATA_NAMES = [name for name, _ in METADATA_FILES] + [MANIFEST]
+
+YAML_KEY = re.compile(r"^([\w.-]+|'[^']*'|\"[^\"]*\")\s*:(?:\s+(.*))?$")
+
+
+def parse_metadata(entries, jar_name):
+    # entries: {archive name: bytes} as read by read_zip_entries(jar, METADATA_NAMES)
+    # Returns the panel's info dict: name, version, description, loader and a list of mods,
+    # each {"id", "version", "depends": {id: spec}, "breaks": {id: spec}, "provides": [id]}.
+    # Fabric/Quilt jars also get "nested": [archive paths of bundled jars] for the caller to open.
+    manifest = _parse_manifest(entries.get(MANIFEST, b""))
+    for name, loader in METADATA_FILES:
+        if name not in entries:
+            continue
+        text = entries[name].decode('utf-8', 'replace')
+        if loader == FABRIC:
+            info = _parse_fabric(json.loads(text, strict=False))
+        elif loader == QUILT:
+            info = _parse_quilt(json.loads(text, strict=False))
+        elif loader in (FORGE, NEOFORGE):
+            if tomllib is None:
+                continue
+            info = _parse_mods_toml(tomllib.loads(text), manifest)
+        else:
+            info = _parse_plugin_yml(parse_simple_yaml(text), loader)
+        info["loader"] = loader
+        info["name"] = info.get("name") or jar_name
+        return info
+
+    return {
+        "name": jar_name,
+        "version": manifest.get("Implementation-Version", "Unknown"),
+        "description": "No mod or plugin metadata found",
+        "loader": None,
+        "mods": [],
+    }
+
+
+def _mod(mod_id, version, depends=None, breaks=None, provides=None):
+    return {
+        "id": str(mod_id).lower(),
+        "version": str(version),
+        "depends": {str(k).lower(): v for k, v in (depends or {}).items()},
+        "breaks": {str(k).lower(): v for k, v in (breaks or {}).items()},
+        "provides": [str(p).lower() for p in provides or []],
+    }
+
+
+def _fabric_spec(spec):
+    # A list means "any of these"; the graph code joins alternatives with "||"
+    if isinstance(spec, list):
+        return " || ".join(str(s) for s in spec) or "*"
+    return str(spec)
+
+
+def _parse_fabric(data):
+    version = data.get("version", "Unknown")
+    mod = _mod(
+        data.get("id", ""), version,
+        {k: _fabric_spec(v) for k, v in data.get("depends", {}).items()},
+        {k: _fabric_spec(v) for k, v in data.get("breaks", {}).items()},
+        data.get("provides", []),
+    )
+    return {
+        "name": data.get("name"),
+        "version": version,
+        "description": data.get("description", "No description"),
+        "mods": [mod] if mod["id"] else [],
+        "nested": [entry["file"] for entry in data.get("jars", []) if isinstance(entry, dict) and entry.get("file")],
+    }
+
+
+def _quilt_deps(entries):
+    deps = {}
+    for entry in entries or []:
+        if isinstance(entry, str):
+            deps[entry] = "*"
+        elif isinstance(entry, dict) and entry.get("id") and not entry.get("optional"):
+            versions = entry.get("versions", "*")
+            if isinstance(versions, dict):
+                versions = "*"
+            deps[entry["id"]] = _fabric_spec(versions)
+    return deps
+
+
+def _parse_quilt(data):
+    loader = data.get("quilt_loader", {})
+    metadata = loader.get("metadata", {})
+    version = loader.get("version", "Unknown")
+    provides = [p if isinstance(p, str) else p.get("id", "") for p in loader.get("provides", [])]
+    mod = _mod(
+        loader.get("id", ""), version,
+        _quilt_deps(loader.get("depends")), _quilt_deps(loader.get("breaks")), provides,
+    )
+    return {
+        "name": metadata.get("name"),
+        "version": version,
+        "description": metadata.get("description", "No description"),
+        "mods": [mod] if mod["id"] else [],
+        "nested": [path for path in loader.get("jars", []) if isinstance(path, str)],
+    }
+
+
+def _parse_manifest(data):
+    fields = {}
+    for line in data.decode('utf-8', 'replace').splitlines():
+        key, sep, value = line.partition(":")
+        if sep and not line.startswith(" "):
+            fields[key.strip()] = value.strip()
+    return fields
+
+
+def _parse_mods_toml(data, manifest):
+    mods = []
+    dependencies = data.get("dependencies", {})
+    for entry in data.get("mods", []):
+        mod_id = entry.get("modId", "")
+        version = str(entry.get("version", "Unknown"))
+        if version.startswith("${"):
+            version = manifest.get("Implementation-Version", "Unknown")
+
+        depends, breaks = {}, {}
+        for dep in dependencies.get(mod_id, []):
+            # Forge uses mandatory=true/false, NeoForge type="required"/"optional"/"incompatible"
+            dep_type = str(dep.get("type", "required" if dep.get("mandatory", True) else "optional")).lower()
+            target = depends if dep_type == "required" else breaks if dep_type == "incompatible" else None
+            if target is not None and dep.get("modId"):
+                # A bare version in a Forge range is only a recommendation
+                spec = str(dep.get("versionRange", "*")).strip()
+                target[dep["modId"]] = spec if spec[:1] in ("[", "(") else "*"
+        mods.append(_mod(mod_id, version, depends, breaks))
+
+    first = data.get("mods", [{}])[0] if data.get("mods") else {}
+    return {
+        "name": first.get("displayName"),
+        "version": mods[0]["version"] if mods else "Unknown",
+        "description": str(first.get("description", "No description")).strip(),
+        "mods": [m for m in mods if m["id"]],
+    }
+
+
+def _parse_plugin_yml(data, loader):
+    name = str(data.get("name", ""))
+    version = str(data.get("version", "Unknown"))
+    depends = {}
+    if loader == PAPER:
+        server_deps = data.get("dependencies", {})
+        server_deps = server_deps.get("server", {}) if isinstance(server_deps, dict) else {}
+        for dep, options in (server_deps or {}).items():
+            if not isinstance(options, dict) or str(options.get("required", "true")).lower() == "true":
+                depends[dep] = "*"
+    else:
+        for dep in _as_list(data.get("depend")):
+            depends[dep] = "*"
+    provides = _as_list(data.get("provides"))
+
+    return {
+        "name": name,
+        "version": version,
+        "description": str(data.get("description", "No description")),
+        "mods": [_mod(name, version, depends, provides=provides)] if name else [],
+    }
+
+
+def _as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _yaml_scalar(value):
+    value = value.strip()
+    if value[:1] in ("'", '"') and value[-1:] == value[:1] and len(value) > 1:
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [_yaml_scalar(v) for v in value[1:-1].split(",") if v.strip()]
+    if " #" in value:
+        value = value.split(" #", 1)[0].rstrip()
+    return value
+
+
+def parse_simple_yaml(text):
+    # Just enough YAML for plugin descriptors: nested mappings, block and flow lists, scalars.
+    # Multi-line scalars ("|" / ">") are folded onto one line.
+    root = {}
+    stack = [(-1, root)]
+    pending = None  # (indent, parent mapping, key) for a key whose value is on the next lines
+    block = None  # same, for a "|" or ">" scalar
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip())
+
+        if block is not None:
+            if indent > block[0]:
+                block[1][block[2]] = (block[1][block[2]] + " " + stripped).strip()
+                continue
+            block = None
+
+        if pending is not None:
+            parent_indent, parent, key = pending
+            pending = None
+            if indent > parent_indent or (indent == parent_indent and stripped.startswith("-")):
+                parent[key] = [] if stripped.startswith("- ") or stripped == "-" else {}
+                stack.append((parent_indent, parent[key]))
+            else:
+                parent[key] = ""
+
+        while len(stack) > 1 and indent <= stack[-1][0] and not (
+                stripped.startswith("-") and isinstance(stack[-1][1], list) and indent == stack[-1][0]):
+            stack.pop()
+        container = stack[-1][1]
+
+        if stripped.startswith("-") and isinstance(container, list):
+            container.append(_yaml_scalar(stripped[1:]))
+            continue
+        match = YAML_KEY.match(stripped)
+        if match is None or not isinstance(container, dict):
+            continue
+        key = _yaml_scalar(match.group(1))
+        value = match.group(2)
+        container[key] = ""
+        if value is None or not value.strip():
+            pending = (indent, container, key)
+        elif value.strip() in ("|", ">", "|-", ">-"):
+            block = (indent, container, key)
+        else:
+            container[key] = _yaml_scalar(value)
+    return root
+
@@ -0,0 +1,82 @@
+import json
+
+import requests
+
+from plugin_index import read_zip_entries
+
+MODRINTH_URL = "https://api.modrinth.com/v2/"
+USER_AGENT = "minecraft-server-panel (update checker)"
+# Hashes per request; the endpoint takes a list, this only keeps single bodies reasonable
+UPDATE_BATCH = 500
+
+# Panel loader name -> loaders a jar for it may be published under
+MODRINTH_LOADERS = {
+    "fabric": ["fabric"],
+    "quilt": ["quilt", "fabric"],
+    "forge": ["forge"],
+    "neoforge": ["neoforge"],
+    "bukkit": ["bukkit", "spigot", "paper"],
+    "paper": ["paper"],
+}
+
+
+def read_game_version(server_jar="server.jar"):
+    # Vanilla and Fabric server jars carry version.json with the Minecraft version as "id"
+    try:
+        entries = read_zip_entries(server_jar, ["version.json"])
+        return json.loads(entries["version.json"].decode('utf-8'))["id"]
+    except Exception:
+        return None
+
+
+def _primary_file(version):
+    files = version.get("files", [])
+    for f in files:
+        if f.get("primary"):
+            return f
+    return files[0] if files else None
+
+
+def check_updates(jars, base_url=MODRINTH_URL, game_version=None, session=None, proxy=None):
+    # jars: [(filename, sha1, loader)]. Returns {filename: update} for jars with a newer file, where
+    # update is {"project_id", "version", "filename", "url", "sha1"}. Jars of unknown loaders are skipped.
+    groups = {}
+    for filename, sha1, loader in jars:
+        if loader in MODRINTH_LOADERS:
+            # Identical jars under several names all get the update
+            groups.setdefault(loader, {}).setdefault(sha1, []).append(filename)
+    if session is None:
+        with requests.Session() as session:
+            return _check_groups(groups, base_url, game_version, session, proxy)
+    return _check_groups(groups, base_url, game_version, session, proxy)
+
+
+def _check_groups(groups, base_url, game_version, session, proxy):
+    proxies = {"http": proxy, "https": proxy} if proxy else None
+    updates = {}
+    for loader, by_hash in groups.items():
+        hashes = list(by_hash)
+        for i in range(0, len(hashes), UPDATE_BATCH):
+            body = {"hashes": hashes[i:i + UPDATE_BATCH], "algorithm": "sha1", "loaders": MODRINTH_LOADERS[loader]}
+            if game_version:
+                body["game_versions"] = [game_version]
+            response = session.post(
+                base_url.rstrip("/") + "/version_files/update", json=body, timeout=15,
+                proxies=proxies, headers={"User-Agent": USER_AGENT})
+            response.raise_for_status()
+
+            for sha1, version in response.json().items():
+                latest = _primary_file(version)
+                if sha1 not in by_hash or latest is None:
+                    continue
+                if latest.get("hashes", {}).get("sha1") == sha1:
+                    continue
+                for filename in by_hash[sha1]:
+                    updates[filename] = {
+                        "project_id": version.get("project_id"),
+                        "version": version.get("version_number", "?"),
+                        "filename": latest.get("filename"),
+                        "url": latest.get("url"),
+                        "sha1": latest.get("hashes", {}).get("sha1"),
+                    }
+    return updates
@@ -0,0 +1,55 @@
+import sys
+import time
+from PySide6 import QtCore
+
+
+class PaintMeter(QtCore.QObject):
+    # Times every repaint of a top-level window. All painting for a window happens while
+    # it handles UpdateRequest, so the filter delivers that event itself and times it.
+    def __init__(self, window, interval_ms=10000, stream=None):
+        super().__init__(window)
+        self.window = window
+        self.stream = stream or sys.stderr
+        self.frames = 0
+        self.paint_time = 0.0
+        self.max_time = 0.0
+        self._since = time.perf_counter()
+        window.installEventFilter(self)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.report)
+        if interval_ms:
+            self.timer.start(interval_ms)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QtCore.QEvent.UpdateRequest:
+            began = time.perf_counter()
+            handled = obj.event(event)
+            elapsed = time.perf_counter() - began
+            self.frames += 1
+            self.paint_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+            return handled
+        return super().eventFilter(obj, event)
+
+    def snapshot(self, reset=True):
+        # (frames, average ms, worst ms, share of wall time spent painting)
+        wall = time.perf_counter() - self._since
+        result = (
+            self.frames,
+            self.paint_time * 1000.0 / self.frames if self.frames else 0.0,
+            self.max_time * 1000.0,
+            self.paint_time / wall if wall > 0 else 0.0,
+        )
+        if reset:
+            self.frames = 0
+            self.paint_time = 0.0
+            self.max_time = 0.0
+            self._since = time.perf_counter()
+        return result
+
+    def report(self):
+        frames, average, worst, share = self.snapshot()
+        if frames:
+            print(f"[render] {frames} repaints, avg {average:.2f}ms, worst {worst:.2f}ms, "
+                  f"{share * 100:.1f}% of wall time", file=self.stream, flush=True)
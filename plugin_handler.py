@@ -1,30 +1,21 @@
 import os
-import shutil
-import json
-import zipfile
+import time
+import threading
 from PySide6 import QtWidgets, QtCore, QtGui
+import config
+from plugin_index import PluginIndex, read_plugin_info, scan_jars
+from mod_graph import DependencyGraph
+from plugin_store import PluginStore
+from mod_updates import check_updates, read_game_version
 
 class PluginDropArea(QtWidgets.QLabel):
-    file_dropped = QtCore.Signal(str)
+    files_dropped = QtCore.Signal(list)
 
     def __init__(self):
         super().__init__()
         self.setAlignment(QtCore.Qt.AlignCenter)
         self.setText("Drag & Drop Plugins (.jar) Here")
-        self.setStyleSheet("""
-            QLabel {
-                border: 2px dashed rgba(255, 255, 255, 50);
-                border-radius: 12px;
-                color: rgba(255, 255, 255, 150);
-                font-size: 14px;
-                padding: 30px;
-                background: rgba(0, 0, 0, 20);
-            }
-            QLabel:hover {
-                border-color: rgba(186, 138, 255, 150);
-                background: rgba(186, 138, 255, 20);
-            }
-        """)
+        self.setObjectName("DropArea")
         self.setAcceptDrops(True)
 
     def dragEnterEvent(self, event):
@@ -35,19 +26,50 @@ class PluginDropArea(QtWidgets.QLabel):
 
     def dropEvent(self, event):
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        for f in files:
-            if f.lower().endswith(".jar"):
-                self.file_dropped.emit(f)
+        jars = [f for f in files if f.lower().endswith(".jar")]
+        if jars:
+            self.files_dropped.emit(jars)
 
 class PluginsTab(QtWidgets.QWidget):
+    scan_results = QtCore.Signal(list)
+    scan_finished = QtCore.Signal()
+    install_finished = QtCore.Signal(object)
+    updates_checked = QtCore.Signal(object, str)
+
     def __init__(self):
         super().__init__()
         self.plugins_dir = "plugins"
         if not os.path.exists(self.plugins_dir):
             os.makedirs(self.plugins_dir)
+
+        self.index = PluginIndex(self.plugins_dir, config.get("plugin_index_path"))
+        self.items = {}
+        self.graph = DependencyGraph()
+        self.store = PluginStore(config.get("plugin_store_dir"))
+        self.installing = False
+        self.install_finished.connect(self.on_install_finished)
+        self.updates = {}
+        self.updates_checked.connect(self.on_updates_checked)
+        self.scanning = False
+        self.rescan_requested = False
+        self.scan_results.connect(self.on_scan_results)
+        self.scan_finished.connect(self.on_scan_finished)
+
+        # Changes are coalesced until the directory goes quiet, but never held back too long
+        self.rescan_timer = QtCore.QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(config.get("plugin_watch_debounce_ms"))
+        self.rescan_timer.timeout.connect(self.on_rescan_timer)
+        self.first_change = None
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.addPath(self.plugins_dir)
+        self.watcher.directoryChanged.connect(self.schedule_rescan)
+        self.watcher.fileChanged.connect(self.schedule_rescan)
         
         self.init_ui()
-        self.load_plugins()
+        # Let the tab paint before the directory is walked
+        QtCore.QTimer.singleShot(0, self.load_plugins)
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -56,71 +78,279 @@ class PluginsTab(QtWidgets.QWidget):
 
         # Drop Area
         self.drop_area = PluginDropArea()
-        self.drop_area.file_dropped.connect(self.install_plugin)
+        self.drop_area.files_dropped.connect(self.install_plugins)
         layout.addWidget(self.drop_area)
 
+        update_row = QtWidgets.QHBoxLayout()
+        self.btn_check_updates = QtWidgets.QPushButton("Check for Updates")
+        self.btn_check_updates.setObjectName("Secondary")
+        self.btn_check_updates.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btn_check_updates.clicked.connect(self.check_for_updates)
+        self.update_status = QtWidgets.QLabel()
+        self.update_status.setObjectName("Muted")
+        update_row.addWidget(self.btn_check_updates)
+        update_row.addWidget(self.update_status, 1)
+        layout.addLayout(update_row)
+
         # Plugin List
         self.plugin_list = QtWidgets.QListWidget()
-        self.plugin_list.setStyleSheet("""
-            QListWidget {
-                background: transparent;
-                border: none;
-            }
-            QListWidget::item {
-                background: rgba(20, 16, 40, 155);
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                padding: 10px;
-                margin-bottom: 5px;
-                color: #E9E7FF;
-            }
-        """)
+        self.plugin_list.setSortingEnabled(True)
+        self.plugin_list.setObjectName("PluginList")
         layout.addWidget(self.plugin_list)
 
-    def install_plugin(self, file_path):
-        filename = os.path.basename(file_path)
-        dest = os.path.join(self.plugins_dir, filename)
-        
+        self.issues_label = QtWidgets.QLabel()
+        self.issues_label.setObjectName("Muted")
+        self.issues_label.setWordWrap(True)
+        self.issues_label.hide()
+        layout.addWidget(self.issues_label)
+
+    def install_plugins(self, paths):
+        if self.installing:
+            QtWidgets.QMessageBox.warning(self, "Busy", "Another install is still running.")
+            return
+        self.installing = True
+        self.drop_area.setText(f"Installing {len(paths)} plugin(s)...")
+        threading.Thread(target=self._install, args=(paths, False, None), daemon=True).start()
+
+    def _install(self, paths, replace, report):
+        report = report or {"installed": [], "unchanged": [], "duplicates": [], "conflicts": [], "errors": []}
+        report["conflicts"] = []
+        try:
+            # Content already in plugins/ under any name is recognised by hash
+            by_hash = {}
+            for filename in self.index.stat_directory():
+                try:
+                    by_hash.setdefault(self.index.file_hash(filename), filename)
+                except OSError:
+                    pass
+
+            for path in paths:
+                filename = os.path.basename(path)
+                dest = os.path.join(self.plugins_dir, filename)
+                try:
+                    sha1 = self.store.add(path, self.index.cached_hash(path))
+                    existing = by_hash.get(sha1)
+                    if existing == filename:
+                        report["unchanged"].append(filename)
+                        continue
+                    if existing:
+                        report["duplicates"].append((filename, existing))
+                        continue
+                    if os.path.exists(dest) and not replace:
+                        report["conflicts"].append(path)
+                        continue
+
+                    self.store.install(sha1, dest)
+                    st = os.stat(dest)
+                    self.index.record_hash(filename, st.st_size, st.st_mtime_ns, sha1)
+                    by_hash[sha1] = filename
+                    report["installed"].append(filename)
+                except Exception as e:
+                    report["errors"].append((filename, str(e)))
+        finally:
+            self.install_finished.emit(report)
+
+    def on_install_finished(self, report):
+        conflicts = report["conflicts"]
+        if conflicts:
+            names = "\n".join(os.path.basename(p) for p in conflicts[:15])
+            more = f"\n...and {len(conflicts) - 15} more" if len(conflicts) > 15 else ""
+            reply = QtWidgets.QMessageBox.question(
+                self, "Replace Plugins",
+                f"These plugins already exist with different contents:\n{names}{more}\n\nReplace them?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.No)
+            if reply == QtWidgets.QMessageBox.Yes:
+                threading.Thread(target=self._install, args=(conflicts, True, report), daemon=True).start()
+                return
+            report["skipped"] = [os.path.basename(p) for p in conflicts]
+
+        self.installing = False
+        self.drop_area.setText("Drag & Drop Plugins (.jar) Here")
+        self.load_plugins()
+
+        lines = [f"Installed {len(report['installed'])} plugin(s)."]
+        if report["unchanged"]:
+            lines.append(f"{len(report['unchanged'])} already installed and unchanged.")
+        if report.get("skipped"):
+            lines.append(f"Kept {len(report['skipped'])} existing plugin(s).")
+        details = [f"Failed {filename}: {error}" for filename, error in report["errors"]]
+        details += [f"Skipped {filename}: same file as {existing}" for filename, existing in report["duplicates"]]
+        lines += details[:15]
+        if len(details) > 15:
+            lines.append(f"...and {len(details) - 15} more")
+
+        if report["errors"]:
+            QtWidgets.QMessageBox.critical(self, "Error", "\n".join(lines))
+        else:
+            QtWidgets.QMessageBox.information(self, "Success", "\n".join(lines))
+
+    def check_for_updates(self):
+        self.btn_check_updates.setEnabled(False)
+        self.update_status.setText("Checking...")
+        threading.Thread(target=self._check_updates, daemon=True).start()
+
+    def _check_updates(self):
         try:
-            shutil.copy2(file_path, dest)
-            self.load_plugins() # Refresh
-            QtWidgets.QMessageBox.information(self, "Success", f"Installed {filename}")
+            jars = []
+            for filename in self.index.stat_directory():
+                info = self.index.info(filename)
+                if info is None:
+                    continue
+                try:
+                    jars.append((filename, self.index.file_hash(filename), info.get("loader")))
+                except OSError:
+                    pass
+            updates = check_updates(
+                jars, base_url=config.get("modrinth_api_url"), game_version=read_game_version())
+            self.updates_checked.emit(updates, "")
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to install plugin: {e}")
+            self.updates_checked.emit({}, str(e))
+
+    def on_updates_checked(self, updates, error):
+        self.btn_check_updates.setEnabled(True)
+        if error:
+            self.update_status.setText(f"Update check failed: {error}")
+            return
+        self.updates = updates
+        self.update_status.setText(f"{len(updates)} update(s) available" if updates else "Everything is up to date")
+        # Keep the hashes computed for the check
+        self.save_index()
+        self.refresh_issues()
+
+    def schedule_rescan(self, path=None):
+        now = time.monotonic()
+        if self.first_change is None:
+            self.first_change = now
+        max_delay = config.get("plugin_watch_max_delay_ms") / 1000.0
+        if not self.rescan_timer.isActive() or now - self.first_change < max_delay:
+            self.rescan_timer.start()
+
+    def on_rescan_timer(self):
+        self.first_change = None
+        self.load_plugins()
+
+    def sync_file_watches(self):
+        # Watch each jar too, since overwriting one in place doesn't touch the directory
+        wanted = {os.path.join(self.plugins_dir, filename) for filename in self.index.entries}
+        watched = set(self.watcher.files())
+        stale = list(watched - wanted)
+        fresh = [path for path in wanted - watched if os.path.exists(path)]
+        if stale:
+            self.watcher.removePaths(stale)
+        if fresh:
+            self.watcher.addPaths(fresh)
 
     def load_plugins(self):
-        self.plugin_list.clear()
-        if not os.path.exists(self.plugins_dir):
+        if self.scanning:
+            self.rescan_requested = True
             return
 
-        for filename in os.listdir(self.plugins_dir):
-            if filename.lower().endswith(".jar"):
-                path = os.path.join(self.plugins_dir, filename)
-                info = self.get_plugin_info(path)
-                
-                item_text = f"{info['name']} v{info['version']}\n{info['description']}"
-                item = QtWidgets.QListWidgetItem(item_text)
-                self.plugin_list.addItem(item)
+        jars = self.index.stat_directory()
+        added, changed, removed = self.index.diff(jars)
 
-    def get_plugin_info(self, jar_path):
-        default_info = {
-            "name": os.path.basename(jar_path),
-            "version": "Unknown",
-            "description": "No fabric.mod.json found"
-        }
-        
+        for filename in removed:
+            self.index.remove(filename)
+            self.graph.remove(filename)
+            self.updates.pop(filename, None)
+            self.remove_item(filename)
+
+        pending = added + changed
+        for filename, entry in self.index.entries.items():
+            if filename not in self.items and filename not in pending:
+                self.graph.update(filename, entry["info"])
+                self.set_item(filename, self.format_item(entry["info"]))
+        for filename in pending:
+            self.set_item(filename, f"{filename}\nReading metadata...")
+
+        if pending:
+            self.scanning = True
+            paths = [os.path.join(self.plugins_dir, filename) for filename in pending]
+            threading.Thread(target=self._scan, args=(paths,), daemon=True).start()
+        elif removed:
+            self.save_index()
+        # Also on a fully cached start, where nothing is scanned or removed
+        self.sync_file_watches()
+        self.refresh_issues()
+
+    def _scan(self, paths):
         try:
-            with zipfile.ZipFile(jar_path, 'r') as z:
-                if "fabric.mod.json" in z.namelist():
-                    with z.open("fabric.mod.json") as f:
-                        data = json.load(f)
-                        return {
-                            "name": data.get("name", default_info["name"]),
-                            "version": data.get("version", "Unknown"),
-                            "description": data.get("description", "No description")
-                        }
-        except Exception:
+            scan_jars(paths, self.scan_results.emit)
+        finally:
+            self.scan_finished.emit()
+
+    def on_scan_results(self, results):
+        for filename, size, mtime_ns, info in results:
+            self.index.update(filename, size, mtime_ns, info)
+            self.graph.update(filename, info)
+            self.updates.pop(filename, None)
+            self.set_item(filename, self.format_item(info))
+
+    def on_scan_finished(self):
+        self.scanning = False
+        # Jars deleted mid-scan never produce a result; drop their placeholders
+        for filename in list(self.items):
+            if filename not in self.index.entries:
+                self.remove_item(filename)
+        self.save_index()
+        self.sync_file_watches()
+        self.refresh_issues()
+
+        if self.rescan_requested:
+            self.rescan_requested = False
+            self.load_plugins()
+
+    def refresh_issues(self):
+        issues = self.graph.issues()
+        by_file = {}
+        for _, filename, message in issues:
+            by_file.setdefault(filename, []).append(message)
+
+        for filename, item in self.items.items():
+            info = self.index.info(filename)
+            if info is None:
+                continue
+            messages = by_file.get(filename, [])
+            text = self.format_item(info)
+            if messages:
+                text += "\n" + "\n".join(f"⚠ {m}" for m in messages)
+            update = self.updates.get(filename)
+            if update:
+                text += f"\n⬆ Update available: {update['version']} ({update['filename']})"
+            if item.text() != text:
+                item.setText(text)
+
+        if issues:
+            shown = [f"{filename}: {message}" for _, filename, message in issues[:10]]
+            if len(issues) > len(shown):
+                shown.append(f"...and {len(issues) - len(shown)} more")
+            self.issues_label.setText(f"{len(issues)} problem(s) will stop the server from starting:\n" + "\n".join(shown))
+            self.issues_label.show()
+        else:
+            self.issues_label.hide()
+
+    def save_index(self):
+        try:
+            self.index.save()
+        except OSError:
             pass
-            
-        return default_info
 
+    def set_item(self, filename, text):
+        item = self.items.get(filename)
+        if item is None:
+            item = QtWidgets.QListWidgetItem(text)
+            self.items[filename] = item
+            self.plugin_list.addItem(item)
+        else:
+            item.setText(text)
+
+    def remove_item(self, filename):
+        item = self.items.pop(filename, None)
+        if item is not None:
+            self.plugin_list.takeItem(self.plugin_list.row(item))
+
+    def format_item(self, info):
+        loader = f" [{info['loader']}]" if info.get("loader") else ""
+        return f"{info['name']} v{info['version']}{loader}\n{info['description']}"
+
+    def get_plugin_info(self, jar_path):
+        return read_plugin_info(jar_path)
@@ -0,0 +1,274 @@
+import io
+import os
+import json
+import zlib
+import struct
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from mod_metadata import METADATA_NAMES, parse_metadata
+from plugin_store import hash_file
+
+INDEX_VERSION = 3
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+LOCAL_SIGNATURE = b"PK\x03\x04"
+EOCD_SIZE = 22
+CENTRAL_HEADER_SIZE = 46
+LOCAL_HEADER_SIZE = 30
+# Below this many jars the scan stays on threads; starting processes isn't worth it
+PROCESS_POOL_MIN_JARS = 32
+# Jar-in-jar can nest; deeper levels than this aren't opened
+NESTED_DEPTH = 3
+SCAN_BATCH = 8
+
+
+def read_zip_entries(path, names):
+    # Reads just the end record, the central directory and the requested entries
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail_size = min(size, EOCD_SIZE + 0xFFFF)
+        f.seek(size - tail_size)
+        tail = f.read(tail_size)
+
+        eocd = tail.rfind(EOCD_SIGNATURE)
+        if eocd < 0 or len(tail) - eocd < EOCD_SIZE:
+            raise zipfile.BadZipFile("End of central directory not found")
+        cd_size, cd_offset = struct.unpack_from("<II", tail, eocd + 12)
+        if cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF:
+            return _read_zip_entries_fallback(path, names)
+
+        # Anything prepended to the archive shifts every stored offset
+        cd_start = size - tail_size + eocd - cd_size
+        shift = cd_start - cd_offset
+        if cd_start >= size - tail_size:
+            directory = tail[cd_start - (size - tail_size):eocd]
+        else:
+            f.seek(cd_start)
+            directory = f.read(cd_size)
+
+        found = {}
+        for name in names:
+            header = _find_central_header(directory, name.encode('utf-8'))
+            if header is None:
+                continue
+            method, compressed_size, local_offset = header
+            f.seek(local_offset + shift)
+            local = f.read(LOCAL_HEADER_SIZE)
+            if local[:4] != LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile(f"Bad local header for {name}")
+            name_len, extra_len = struct.unpack_from("<HH", local, 26)
+            f.seek(name_len + extra_len, os.SEEK_CUR)
+            data = f.read(compressed_size)
+
+            if method == zipfile.ZIP_STORED:
+                found[name] = data
+            elif method == zipfile.ZIP_DEFLATED:
+                found[name] = zlib.decompressobj(-15).decompress(data)
+            else:
+                return _read_zip_entries_fallback(path, names)
+        return found
+
+
+def _find_central_header(directory, name):
+    pos = directory.find(name)
+    while pos >= 0:
+        start = pos - CENTRAL_HEADER_SIZE
+        if start >= 0 and directory[start:start + 4] == CENTRAL_SIGNATURE:
+            (name_len,) = struct.unpack_from("<H", directory, start + 28)
+            if name_len == len(name):
+                method = struct.unpack_from("<H", directory, start + 10)[0]
+                compressed_size = struct.unpack_from("<I", directory, start + 20)[0]
+                local_offset = struct.unpack_from("<I", directory, start + 42)[0]
+                return method, compressed_size, local_offset
+        pos = directory.find(name, pos + 1)
+    return None
+
+
+def _read_zip_entries_fallback(path, names):
+    found = {}
+    with zipfile.ZipFile(path, 'r') as z:
+        for name in names:
+            try:
+                found[name] = z.read(name)
+            except KeyError:
+                pass
+    return found
+
+
+def read_plugin_info(jar_path):
+    # Every loader's descriptor comes out of the same central directory read
+    name = os.path.basename(jar_path)
+    try:
+        info = parse_metadata(read_zip_entries(jar_path, METADATA_NAMES), name)
+        nested = info.pop("nested", [])
+        if nested:
+            info["mods"].extend(_nested_mods(lambda names: read_zip_entries(jar_path, names), nested, NESTED_DEPTH))
+        return info
+    except Exception:
+        return {
+            "name": name,
+            "version": "Unknown",
+            "description": "Could not read jar",
+            "loader": None,
+            "mods": [],
+        }
+
+
+def _nested_mods(read_entries, paths, depth):
+    # Mods bundled as jar-in-jar (Fabric API modules, shaded libraries) provide their ids
+    # too, so they are listed as mods of the outer file, marked "nested"
+    mods = []
+    for path, data in read_entries(paths).items():
+        try:
+            archive = io.BytesIO(data)
+            info = parse_metadata(_read_zip_entries_fallback(archive, METADATA_NAMES), os.path.basename(path))
+        except Exception:
+            continue
+        for mod in info["mods"]:
+            mod["nested"] = True
+            mods.append(mod)
+        inner = info.get("nested")
+        if inner and depth > 1:
+            mods.extend(_nested_mods(lambda names, a=archive: _read_zip_entries_fallback(a, names), inner, depth - 1))
+    return mods
+
+
+def _scan_batch(paths):
+    results = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        results.append((os.path.basename(path), st.st_size, st.st_mtime_ns, read_plugin_info(path)))
+    return results
+
+
+def scan_jars(paths, on_results, workers=None):
+    # Calls on_results([(filename, size, mtime_ns, info)]) as each batch finishes
+    workers = workers or os.cpu_count() or 1
+    batches = [paths[i:i + SCAN_BATCH] for i in range(0, len(paths), SCAN_BATCH)]
+    if not batches:
+        return
+
+    if len(paths) >= PROCESS_POOL_MIN_JARS and workers > 1:
+        try:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                for future in as_completed([pool.submit(_scan_batch, b) for b in batches]):
+                    on_results(future.result())
+            return
+        except Exception:
+            # No usable process pool (e.g. restricted environment); threads still overlap the I/O
+            pass
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(_scan_batch, b) for b in batches]):
+            on_results(future.result())
+
+
+class PluginIndex:
+    # Metadata per jar filename, reused while the jar's size and mtime are unchanged
+    def __init__(self, plugins_dir, index_path):
+        self.plugins_dir = plugins_dir
+        self.index_path = index_path
+        self.entries = {}
+        self.hashes = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.entries = data.get("plugins", {})
+            self.hashes = data.get("hashes", {})
+
+    def save(self):
+        with self._lock:
+            data = {"version": INDEX_VERSION, "plugins": dict(self.entries), "hashes": dict(self.hashes)}
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+    def stat_directory(self):
+        # {filename: (size, mtime_ns)} for every jar currently in the directory
+        jars = {}
+        try:
+            with os.scandir(self.plugins_dir) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(".jar") and entry.is_file():
+                        st = entry.stat()
+                        jars[entry.name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return jars
+
+    def diff(self, jars=None):
+        # Returns (added, changed, removed) filenames relative to the index
+        if jars is None:
+            jars = self.stat_directory()
+        with self._lock:
+            known = dict(self.entries)
+
+        added = [name for name in jars if name not in known]
+        removed = [name for name in known if name not in jars]
+        changed = [
+            name for name, (size, mtime_ns) in jars.items()
+            if name in known and (known[name]["size"], known[name]["mtime_ns"]) != (size, mtime_ns)
+        ]
+        return added, changed, removed
+
+    def update(self, filename, size, mtime_ns, info):
+        with self._lock:
+            self.entries[filename] = {"size": size, "mtime_ns": mtime_ns, "info": info}
+
+    def remove(self, filename):
+        with self._lock:
+            self.entries.pop(filename, None)
+            self.hashes.pop(filename, None)
+
+    def info(self, filename):
+        with self._lock:
+            entry = self.entries.get(filename)
+        return entry["info"] if entry else None
+
+    def record_hash(self, filename, size, mtime_ns, sha1):
+        with self._lock:
+            self.hashes[filename] = [size, mtime_ns, sha1]
+
+    def cached_hash(self, path):
+        # sha1 of a jar in plugins/ if it is cached and still current, without reading the file
+        if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.plugins_dir):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self.hashes.get(os.path.basename(path))
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def file_hash(self, filename):
+        # sha1 of a jar in plugins/, only re-read when its size or mtime changed
+        path = os.path.join(self.plugins_dir, filename)
+        st = os.stat(path)
+        with self._lock:
+            cached = self.hashes.get(filename)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        sha1 = hash_file(path)
+        self.record_hash(filename, st.st_size, st.st_mtime_ns, sha1)
+        return sha1
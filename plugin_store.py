@@ -0,0 +1,98 @@
+import os
+import hashlib
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COPY_CHUNK = 1 << 20
+# ioctl that makes a copy-on-write clone on btrfs/XFS (Linux)
+FICLONE = 0x40049409
+
+
+def hash_file(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(COPY_CHUNK)
+            if not chunk:
+                break
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _temp_path(directory, name):
+    fd, path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    os.remove(path)
+    return path
+
+
+def _clone_or_copy(src, dst):
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return "reflink"
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
+class PluginStore:
+    # Jars kept once per content under <root>/<sha1[:2]>/<sha1>.jar and cloned or copied into
+    # plugins/. Never hardlinked: an in-place write to the plugin would change the stored object.
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, sha1):
+        return os.path.join(self.root, sha1[:2], sha1 + ".jar")
+
+    def add(self, src_path, known_sha1=None):
+        # Returns the sha1, hashed while copying so the jar is read once. A known_sha1 from a
+        # cache skips the read entirely when that content is already stored.
+        if known_sha1 and os.path.exists(self.path_for(known_sha1)):
+            return known_sha1
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = _temp_path(self.root, "incoming")
+        sha1 = hashlib.sha1()
+        try:
+            with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                while True:
+                    chunk = src.read(COPY_CHUNK)
+                    if not chunk:
+                        break
+                    sha1.update(chunk)
+                    dst.write(chunk)
+            digest = sha1.hexdigest()
+            object_path = self.path_for(digest)
+            if os.path.exists(object_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(tmp_path, object_path)
+            return digest
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def install(self, sha1, dest_path):
+        # The jar appears under its final name in one rename, never half-written.
+        # Returns how it got there: "reflink" or "copy".
+        object_path = self.path_for(sha1)
+        directory = os.path.dirname(os.path.abspath(dest_path))
+        tmp_path = _temp_path(directory, os.path.basename(dest_path))
+        try:
+            method = _clone_or_copy(object_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return method
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
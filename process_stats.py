@@ -0,0 +1,168 @@
+import os
+import time
+import threading
+from collections import deque
+
+PROC = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Fields of a Sample after time
+FIELDS = ("cpu", "rss_mb", "threads", "fds", "read_bps", "write_bps")
+# Counters that show creep keep their peak when samples are rolled up; rates are averaged
+PEAK_FIELDS = {"rss_mb", "threads", "fds"}
+# (name, seconds per point, points kept)
+RESOLUTIONS = (("1s", 1, 600), ("1m", 60, 1440), ("1h", 3600, 720))
+
+
+def available(pid=None):
+    return os.path.isdir(os.path.join(PROC, str(pid) if pid else "self"))
+
+
+class Sample:
+    # cpu is percent of one core (a busy 4-core JVM reads 400); rates are bytes per second
+    __slots__ = ("time",) + FIELDS
+
+    def __init__(self, time, cpu, rss_mb, threads, fds, read_bps, write_bps):
+        self.time = time
+        self.cpu = cpu
+        self.rss_mb = rss_mb
+        self.threads = threads
+        self.fds = fds
+        self.read_bps = read_bps
+        self.write_bps = write_bps
+
+    def __repr__(self):
+        return (f"Sample(cpu={self.cpu:.1f}%, rss={self.rss_mb:.0f}MB, threads={self.threads}, "
+                f"fds={self.fds}, io={self.read_bps:.0f}/{self.write_bps:.0f}B/s)")
+
+
+def read_counters(pid):
+    # Raw cumulative counters: (cpu seconds, rss bytes, threads, fds, read bytes, write bytes).
+    # I/O reads as 0 where /proc/<pid>/io isn't readable (another user's process).
+    base = os.path.join(PROC, str(pid))
+    with open(os.path.join(base, "stat"), 'rb') as f:
+        stat = f.read()
+    # The command name may contain spaces and parentheses; fields start after the last ")"
+    fields = stat[stat.rindex(b")") + 2:].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    threads = int(fields[17])
+    rss = int(fields[21]) * PAGE_SIZE
+
+    try:
+        fds = len(os.listdir(os.path.join(base, "fd")))
+    except OSError:
+        fds = 0
+
+    read_bytes = write_bytes = 0
+    try:
+        with open(os.path.join(base, "io"), 'rb') as f:
+            for line in f:
+                if line.startswith(b"read_bytes:"):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith(b"write_bytes:"):
+                    write_bytes = int(line.split()[1])
+    except OSError:
+        pass
+    return cpu_seconds, rss, threads, fds, read_bytes, write_bytes
+
+
+class SampleHistory:
+    # One bounded deque per resolution. Coarser points are rolled up from the finer ones
+    # as each period closes, so nothing is recomputed when a chart is drawn.
+    def __init__(self, resolutions=RESOLUTIONS):
+        self.resolutions = resolutions
+        self.series = {name: deque(maxlen=keep) for name, _, keep in resolutions}
+        self._pending = {name: [] for name, _, _ in resolutions[1:]}
+
+    def add(self, sample):
+        self.series[self.resolutions[0][0]].append(sample)
+        finer = [sample]
+        for name, period, _ in self.resolutions[1:]:
+            pending = self._pending[name]
+            if pending and int(pending[0].time // period) != int(finer[-1].time // period):
+                rolled = self._roll_up(pending)
+                self.series[name].append(rolled)
+                pending.clear()
+                pending.extend(finer)
+                finer = [rolled]
+            else:
+                pending.extend(finer)
+                break
+
+    @staticmethod
+    def _roll_up(samples):
+        values = []
+        for field in FIELDS:
+            column = [getattr(s, field) for s in samples]
+            values.append(max(column) if field in PEAK_FIELDS else sum(column) / len(column))
+        return Sample(samples[0].time, *values)
+
+    def points(self, resolution):
+        return list(self.series[resolution])
+
+
+class ProcessSampler:
+    # Reads /proc/<pid> every interval seconds on a background thread
+    def __init__(self, pid, interval=1.0, history=None, on_sample=None):
+        self.pid = pid
+        self.interval = interval
+        self.history = history or SampleHistory()
+        self.on_sample = on_sample
+        self.latest = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        previous = None
+        next_due = time.monotonic()
+        while not self._stop.is_set():
+            # Rates use the monotonic clock so a wall-clock step can't skew them;
+            # the wall time only labels the sample
+            now = time.monotonic()
+            try:
+                counters = read_counters(self.pid)
+            except (OSError, ValueError, IndexError):
+                # Process gone
+                break
+            if previous is not None:
+                elapsed = now - previous[0]
+                if elapsed > 0:
+                    sample = self._sample(time.time(), elapsed, previous[1], counters)
+                    self.latest = sample
+                    self.history.add(sample)
+                    if self.on_sample:
+                        self.on_sample(sample)
+            previous = (now, counters)
+            # Fixed cadence rather than fixed sleep, so reads don't drift the timeline
+            next_due += self.interval
+            self._stop.wait(max(0.0, next_due - time.monotonic()))
+
+    @staticmethod
+    def _sample(now, elapsed, before, after):
+        cpu_seconds, rss, threads, fds, read_bytes, write_bytes = after
+        return Sample(
+            now,
+            max(0.0, (cpu_seconds - before[0]) / elapsed * 100.0),
+            rss / (1024 * 1024),
+            threads,
+            fds,
+            max(0, read_bytes - before[4]) / elapsed,
+            max(0, write_bytes - before[5]) / elapsed,
+        )
+
+
+if __name__ == "__main__":
+    sampler = ProcessSampler(os.getpid(), interval=0.2, on_sample=print)
+    sampler.start()
+    deadline = time.time() + 1.0
+    while time.time() < deadline:
+        sum(i * i for i in range(10000))
+    sampler.stop()
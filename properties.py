@@ -0,0 +1,235 @@
+import os
+import re
+
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f"}
+_KEY_END = re.compile(r"(?<!\\)(?:\\\\)*[=:\s]")
+
+
+def _unescape(text):
+    out = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c != "\\" or i + 1 >= len(text):
+            out.append(c)
+            i += 1
+            continue
+        nxt = text[i + 1]
+        if nxt == "u" and re.fullmatch(r"[0-9a-fA-F]{4}", text[i + 2:i + 6]):
+            out.append(chr(int(text[i + 2:i + 6], 16)))
+            i += 6
+        else:
+            out.append(_ESCAPES.get(nxt, nxt))
+            i += 2
+    return "".join(out)
+
+
+def _escape(text, is_key):
+    # Output is plain ASCII so both ISO-8859-1 (older servers) and UTF-8 readers agree on it
+    out = []
+    for i, c in enumerate(text):
+        if c == "\\":
+            out.append("\\\\")
+        elif c == "\t":
+            out.append("\\t")
+        elif c == "\n":
+            out.append("\\n")
+        elif c == "\r":
+            out.append("\\r")
+        elif c == "\f":
+            out.append("\\f")
+        elif c in "=:#!" and (is_key or i == 0):
+            out.append("\\" + c)
+        elif c == " " and (is_key or i == 0):
+            out.append("\\ ")
+        elif ord(c) < 0x20 or ord(c) > 0x7E:
+            out.extend(f"\\u{unit:04x}" for unit in _utf16_units(c))
+        else:
+            out.append(c)
+    return "".join(out)
+
+
+def _utf16_units(c):
+    data = c.encode("utf-16-be")
+    return [int.from_bytes(data[i:i + 2], "big") for i in range(0, len(data), 2)]
+
+
+def _ends_with_continuation(line):
+    # An odd number of trailing backslashes continues the entry on the next line
+    stripped = line.rstrip("\r\n")
+    count = len(stripped) - len(stripped.rstrip("\\"))
+    return count % 2 == 1
+
+
+def parse_entry(logical):
+    # Splits one logical line (continuations already joined) into (key, value)
+    logical = logical.lstrip(" \t\f")
+    match = _KEY_END.search(logical)
+    if match is None:
+        return _unescape(logical), ""
+    key = logical[:match.end() - 1]
+    rest = logical[match.end() - 1:].lstrip(" \t\f")
+    if rest[:1] in ("=", ":"):
+        rest = rest[1:].lstrip(" \t\f")
+    return _unescape(key), _unescape(rest)
+
+
+def _decode_surrogates(text):
+    # \uXXXX pairs decode to two surrogate halves; join them into the real character
+    try:
+        return text.encode("utf-16", "surrogatepass").decode("utf-16")
+    except UnicodeDecodeError:
+        return text
+
+
+class PropertiesFile:
+    # A Java .properties file that keeps comments, ordering and untouched lines byte for byte.
+    # Only keys changed through set() are rewritten, and nothing is written when none changed.
+    def __init__(self, path):
+        self.path = path
+        self.values = {}
+        self.dirty = {}
+        self._loaded = {}
+        self._lines = []      # [text including newline(s), key or None]
+        self._positions = {}  # key -> index into _lines
+        self._stat = None
+        self.newline = "\n"
+        self.encoding = "utf-8"
+
+    def load(self):
+        self.values, self._lines, self._positions = {}, [], {}
+        self.dirty, self._loaded = {}, {}
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+                self._stat = self._stat_of(f.fileno())
+        except FileNotFoundError:
+            self._stat = None
+            return self
+        self._parse(data)
+        self._loaded = dict(self.values)
+        return self
+
+    def _parse(self, data):
+        try:
+            text = data.decode('utf-8')
+            self.encoding = "utf-8"
+        except UnicodeDecodeError:
+            text = data.decode('latin-1')
+            self.encoding = "latin-1"
+        if "\r\n" in text:
+            self.newline = "\r\n"
+
+        physical = text.splitlines(keepends=True)
+        i = 0
+        while i < len(physical):
+            line = physical[i]
+            stripped = line.lstrip(" \t\f")
+            if not stripped.strip() or stripped[0] in "#!":
+                self._lines.append([line, None])
+                i += 1
+                continue
+
+            raw = [line]
+            logical = line.rstrip("\r\n")
+            while _ends_with_continuation(raw[-1]) and i + 1 < len(physical):
+                i += 1
+                raw.append(physical[i])
+                logical = logical[:-1] + physical[i].rstrip("\r\n").lstrip(" \t\f")
+            if _ends_with_continuation(raw[-1]):
+                # A continuation at the end of the file continues into nothing, as in Java
+                logical = logical[:-1]
+            i += 1
+
+            key, value = parse_entry(logical)
+            key, value = _decode_surrogates(key), _decode_surrogates(value)
+            if key in self._positions:
+                # Java keeps the last occurrence; the earlier line stays as it is
+                self._lines[self._positions[key]][1] = None
+            self._positions[key] = len(self._lines)
+            self._lines.append(["".join(raw), key])
+            self.values[key] = value
+
+    @staticmethod
+    def _stat_of(fd_or_path):
+        st = os.stat(fd_or_path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, key, default=""):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        value = str(value)
+        if key in self.values and self.values[key] == value:
+            return False
+        self.values[key] = value
+        if key in self._loaded and self._loaded[key] == value:
+            self.dirty.pop(key, None)
+        else:
+            self.dirty[key] = value
+        return True
+
+    def as_dict(self):
+        return dict(self.values)
+
+    def is_stale(self):
+        # True when the file was changed (or created/deleted) by someone else since load/save
+        try:
+            current = self._stat_of(self.path)
+        except FileNotFoundError:
+            current = None
+        return current != self._stat
+
+    def reload_if_changed(self):
+        # Re-reads only when the file changed; unsaved set() calls are kept on top
+        if not self.is_stale():
+            return False
+        pending = dict(self.dirty)
+        self.load()
+        for key, value in pending.items():
+            self.set(key, value)
+        return True
+
+    def render(self):
+        lines = [list(line) for line in self._lines]
+        positions = dict(self._positions)
+        newline = self.newline
+        if lines and not lines[-1][0].endswith(("\n", "\r")):
+            lines[-1][0] += newline
+        for key, value in self.dirty.items():
+            text = f"{_escape(key, True)}={_escape(value, False)}{newline}"
+            if key in positions:
+                lines[positions[key]][0] = text
+            else:
+                if lines and lines[-1][1] is not None and _ends_with_continuation(lines[-1][0]):
+                    # A blank line ends the dangling entry so it can't swallow the appended one
+                    lines.append([newline, None])
+                positions[key] = len(lines)
+                lines.append([text, key])
+        return "".join(text for text, _ in lines)
+
+    def save(self):
+        # Returns False when there was nothing to write. External edits to other keys survive.
+        if not self.dirty:
+            return False
+        self.reload_if_changed()
+        if not self.dirty:
+            return False
+
+        content = self.render()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.tmp")
+        # Rewritten entries are pure ASCII; untouched lines keep the file's own encoding
+        with open(tmp_path, 'w', encoding=self.encoding, newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        pending = dict(self.dirty)
+        self.load()
+        # Values that don't round-trip exactly (shouldn't happen) stay dirty rather than vanish
+        for key, value in pending.items():
+            if self.values.get(key) != value:
+                self.set(key, value)
+        return True
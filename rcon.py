@@ -0,0 +1,233 @@
+import time
+import heapq
+import queue
+import select
+import socket
+import struct
+import threading
+from concurrent.futures import Future
+
+TYPE_RESPONSE = 0
+TYPE_COMMAND = 2
+TYPE_AUTH_RESPONSE = 2
+TYPE_LOGIN = 3
+
+# The server splits long responses into payloads of this many bytes
+FRAGMENT_SIZE = 4096
+# How long to wait for another fragment when a response is exactly FRAGMENT_SIZE long
+FRAGMENT_SETTLE = 0.05
+
+
+class RconError(Exception):
+    pass
+
+
+class RconAuthError(RconError):
+    pass
+
+
+def encode_packet(request_id, packet_type, body):
+    payload = struct.pack("<ii", request_id, packet_type) + body.encode('utf-8') + b"\x00\x00"
+    return struct.pack("<i", len(payload)) + payload
+
+
+def read_packets(buffer):
+    # Returns the complete (request_id, type, body, body_size) packets and the unconsumed rest
+    packets = []
+    pos = 0
+    while len(buffer) - pos >= 4:
+        (length,) = struct.unpack_from("<i", buffer, pos)
+        if length < 10:
+            raise RconError(f"Malformed packet length {length}")
+        if len(buffer) - pos - 4 < length:
+            break
+        request_id, packet_type = struct.unpack_from("<ii", buffer, pos + 4)
+        body = bytes(buffer[pos + 12:pos + 4 + length - 2]).decode('utf-8', 'replace')
+        packets.append((request_id, packet_type, body, length - 10))
+        pos += 4 + length
+    return packets, buffer[pos:]
+
+
+class RconClient:
+    def __init__(self, host, port, password, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+
+        self._sock = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # (deadline, request_id, future) for requests sent and maybe still unanswered; sender thread only
+        self._deadlines = []
+        self._outbox = queue.Queue()
+        self._closed = False
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+
+    def command(self, command, timeout=None):
+        # Never blocks; the future resolves to the response text or raises RconError,
+        # including when no response arrives within timeout seconds (default self.timeout)
+        future = Future()
+        if self._closed:
+            future.set_exception(RconError("RCON client closed"))
+        else:
+            timeout = self.timeout if timeout is None else timeout
+            self._outbox.put((command, future, time.monotonic() + timeout if timeout else None))
+        return future
+
+    def execute(self, command, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        return self.command(command, timeout).result()
+
+    def close(self):
+        self._closed = True
+        self._outbox.put(None)
+        self._disconnect(RconError("RCON client closed"))
+
+    def _allocate_id(self):
+        self._next_id = self._next_id % 0x7FFFFFFF + 1
+        return self._next_id
+
+    def _send_loop(self):
+        while True:
+            try:
+                item = self._outbox.get(timeout=self._expire_overdue())
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            command, future, deadline = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                future.set_exception(RconError("RCON request timed out before it was sent"))
+                continue
+
+            try:
+                sock = self._sock or self._connect()
+                with self._lock:
+                    request_id = self._allocate_id()
+                    self._pending[request_id] = [future, []]
+                if deadline is not None:
+                    heapq.heappush(self._deadlines, (deadline, request_id, future))
+                sock.sendall(encode_packet(request_id, TYPE_COMMAND, command))
+            except (OSError, RconError) as e:
+                error = e if isinstance(e, RconError) else RconError(str(e))
+                if not future.done():
+                    future.set_exception(error)
+                self._disconnect(error)
+
+    def _expire_overdue(self):
+        # Fails requests past their deadline and returns the seconds until the next one, or None.
+        # Only the sender adds requests, so it always knows the nearest deadline before it waits.
+        now = time.monotonic()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, request_id, future = heapq.heappop(self._deadlines)
+            with self._lock:
+                entry = self._pending.get(request_id)
+                if entry is None or entry[0] is not future:
+                    continue
+                del self._pending[request_id]
+            if not future.done():
+                # A late response for this id is dropped by the reader
+                future.set_exception(RconError("RCON request timed out"))
+        return self._deadlines[0][0] - now if self._deadlines else None
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            request_id = self._allocate_id()
+            sock.sendall(encode_packet(request_id, TYPE_LOGIN, self.password))
+
+            buffer = b""
+            while True:
+                data = sock.recv(4096)
+                if not data:
+                    raise RconError("Connection closed during login")
+                packets, buffer = read_packets(buffer + data)
+                for packet_id, packet_type, _, _ in packets:
+                    # Some servers send an empty RESPONSE_VALUE before the auth reply
+                    if packet_type != TYPE_AUTH_RESPONSE:
+                        continue
+                    if packet_id == -1:
+                        raise RconAuthError("RCON password rejected")
+                    if packet_id == request_id:
+                        break
+                else:
+                    continue
+                break
+        except BaseException:
+            sock.close()
+            raise
+
+        sock.settimeout(None)
+        self._sock = sock
+        threading.Thread(target=self._read_loop, args=(sock, buffer), daemon=True).start()
+        return sock
+
+    def _disconnect(self, error):
+        with self._lock:
+            sock, self._sock = self._sock, None
+            pending, self._pending = self._pending, {}
+        if sock:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _complete(self, request_id):
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+        if entry and not entry[0].done():
+            entry[0].set_result("".join(entry[1]))
+
+    def _read_loop(self, sock, buffer):
+        # Responses arrive in request order, so a packet for a newer id ends the previous one
+        current = None
+        while True:
+            try:
+                if current is not None:
+                    readable, _, _ = select.select([sock], [], [], FRAGMENT_SETTLE)
+                    if not readable:
+                        self._complete(current)
+                        current = None
+                        continue
+                data = sock.recv(65536)
+            except (OSError, ValueError) as e:
+                data = None
+                error = RconError(str(e))
+            else:
+                error = RconError("RCON connection closed")
+
+            if not data:
+                if sock is self._sock:
+                    self._disconnect(error)
+                return
+
+            try:
+                packets, buffer = read_packets(buffer + data)
+            except RconError as e:
+                self._disconnect(e)
+                return
+
+            for request_id, packet_type, body, body_size in packets:
+                if packet_type != TYPE_RESPONSE:
+                    continue
+                if current is not None and current != request_id:
+                    self._complete(current)
+                    current = None
+                with self._lock:
+                    entry = self._pending.get(request_id)
+                if entry is None:
+                    continue
+                entry[1].append(body)
+                if body_size < FRAGMENT_SIZE:
+                    self._complete(request_id)
+                else:
+                    current = request_id
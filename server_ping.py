@@ -0,0 +1,190 @@
+import json
+import time
+import socket
+import struct
+import threading
+from collections import deque
+
+# -1 asks the server for its own protocol version instead of claiming one
+PROTOCOL_ANY = -1
+HANDSHAKE = 0x00
+STATUS_REQUEST = 0x00
+PING = 0x01
+MAX_PACKET = 1 << 20
+
+
+class PingError(Exception):
+    pass
+
+
+def _varint(value):
+    value &= 0xFFFFFFFF
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _string(text):
+    data = text.encode('utf-8')
+    return _varint(len(data)) + data
+
+
+def _packet(packet_id, payload=b""):
+    body = _varint(packet_id) + payload
+    return _varint(len(body)) + body
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise PingError("Connection closed")
+        data += chunk
+    return bytes(data)
+
+
+def _read_varint(read):
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = read(1)[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value - (1 << 32) if value & 0x80000000 else value
+    raise PingError("VarInt too long")
+
+
+def _read_packet(sock):
+    length = _read_varint(lambda n: _recv_exact(sock, n))
+    if length <= 0 or length > MAX_PACKET:
+        raise PingError(f"Bad packet length {length}")
+    data = _recv_exact(sock, length)
+    pos = [0]
+
+    def read(n):
+        chunk = data[pos[0]:pos[0] + n]
+        if len(chunk) < n:
+            raise PingError("Truncated packet")
+        pos[0] += n
+        return chunk
+
+    return _read_varint(read), read
+
+
+def _motd_text(description):
+    # Chat components nest text in "extra"; plain servers send a string
+    if isinstance(description, str):
+        return description
+    if not isinstance(description, dict):
+        return ""
+    return description.get("text", "") + "".join(_motd_text(part) for part in description.get("extra", []))
+
+
+class PingResult:
+    __slots__ = ("time", "online", "latency_ms", "players_online", "players_max", "version", "motd", "error")
+
+    def __init__(self, online, latency_ms=None, players_online=0, players_max=0, version="", motd="", error=None):
+        self.time = time.time()
+        self.online = online
+        self.latency_ms = latency_ms
+        self.players_online = players_online
+        self.players_max = players_max
+        self.version = version
+        self.motd = motd
+        self.error = error
+
+    def __repr__(self):
+        if not self.online:
+            return f"PingResult(offline, error={self.error!r})"
+        return (f"PingResult({self.players_online}/{self.players_max} players, "
+                f"{self.latency_ms:.1f}ms, version={self.version!r})")
+
+
+def ping(host, port=25565, timeout=3.0):
+    # One Server List Ping: handshake, status request, then a ping/pong timed for latency
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            handshake = _varint(PROTOCOL_ANY) + _string(host) + struct.pack(">H", port) + _varint(1)
+            sock.sendall(_packet(HANDSHAKE, handshake) + _packet(STATUS_REQUEST))
+
+            packet_id, read = _read_packet(sock)
+            if packet_id != STATUS_REQUEST:
+                raise PingError(f"Unexpected packet {packet_id}")
+            length = _read_varint(read)
+            status = json.loads(read(length).decode('utf-8'))
+
+            payload = int(time.time() * 1000) & 0x7FFFFFFFFFFFFFFF
+            began = time.perf_counter()
+            sock.sendall(_packet(PING, struct.pack(">q", payload)))
+            packet_id, read = _read_packet(sock)
+            latency = (time.perf_counter() - began) * 1000.0
+            if packet_id != PING or struct.unpack(">q", read(8))[0] != payload:
+                raise PingError("Bad pong")
+    except (OSError, ValueError, PingError, IndexError) as e:
+        return PingResult(False, error=str(e) or e.__class__.__name__)
+
+    players = status.get("players") or {}
+    version = status.get("version") or {}
+    return PingResult(
+        True, latency_ms=latency,
+        players_online=players.get("online", 0), players_max=players.get("max", 0),
+        version=version.get("name", ""), motd=_motd_text(status.get("description", "")),
+    )
+
+
+class StatusPoller:
+    # Pings on a background thread every interval seconds. latest holds the newest result and
+    # latencies the last history samples as (time, ms), with ms None when the ping failed.
+    def __init__(self, host, port, interval=5.0, timeout=3.0, history=720, on_result=None):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.timeout = timeout
+        self.on_result = on_result
+        self.latest = None
+        self.latencies = deque(maxlen=history)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def poll_now(self):
+        self._wake.set()
+
+    def latency_stats(self, window=None):
+        # (average ms, worst ms, answered share) over the last window seconds, or everything
+        since = time.time() - window if window else 0
+        samples = [ms for t, ms in list(self.latencies) if t >= since]
+        answered = [ms for ms in samples if ms is not None]
+        if not answered:
+            return None, None, 0.0
+        return sum(answered) / len(answered), max(answered), len(answered) / len(samples)
+
+    def _run(self):
+        while not self._stop.is_set():
+            result = ping(self.host, self.port, self.timeout)
+            if self._stop.is_set():
+                break
+            self.latest = result
+            self.latencies.append((result.time, result.latency_ms))
+            if self.on_result:
+                self.on_result(result)
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from plugin_store import PluginStore, hash_file
+
+MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+CHUNK = 1 << 20
+# Smaller files aren't worth splitting into ranges
+SEGMENT_MIN_BYTES = 8 << 20
+PROGRESS_SAVE_INTERVAL = 0.5
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadCancelled(DownloadError):
+    pass
+
+
+class _NoRanges(Exception):
+    pass
+
+
+def _atomic_write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _segments(size, count):
+    step = -(-size // count)
+    return [[start, start, min(start + step, size)] for start in range(0, size, step)]
+
+
+class Download:
+    # One file fetched into <dest>.part, in parallel byte ranges when the server allows it.
+    # Progress is kept in <dest>.part.json so an interrupted download picks up where it stopped.
+    def __init__(self, session, url, dest_path, sha1, size, segments=4, progress=None, cancel=None):
+        self.session = session
+        self.url = url
+        self.dest_path = dest_path
+        self.sha1 = sha1
+        self.size = size
+        self.segment_count = max(1, segments)
+        self.progress = progress
+        # A threading.Event; once set, workers stop at the next chunk and the progress is kept
+        self.cancel = cancel
+        self.part_path = dest_path + ".part"
+        self.state_path = dest_path + ".part.json"
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+
+    def run(self):
+        ranges = self._load_state()
+        if ranges is None:
+            count = self.segment_count if self.size >= SEGMENT_MIN_BYTES else 1
+            ranges = _segments(self.size, count)
+            with open(self.part_path, 'wb') as f:
+                f.truncate(self.size)
+        self.ranges = ranges
+        self._report()
+
+        try:
+            if len(ranges) == 1:
+                digest = self._fetch_streaming()
+            else:
+                try:
+                    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                        for future in [pool.submit(self._fetch_range, r) for r in ranges]:
+                            future.result()
+                except _NoRanges:
+                    self.ranges = _segments(self.size, 1)
+                    digest = self._fetch_streaming()
+                else:
+                    digest = hash_file(self.part_path)
+        except Exception:
+            self._save_state(force=True)
+            raise
+
+        if digest != self.sha1:
+            self._discard()
+            raise DownloadError(f"Checksum mismatch for {os.path.basename(self.dest_path)}")
+        os.replace(self.part_path, self.dest_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self.dest_path
+
+    def _load_state(self):
+        if not (os.path.exists(self.part_path) and os.path.exists(self.state_path)):
+            return None
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except Exception:
+            return None
+        if state.get("sha1") != self.sha1 or os.path.getsize(self.part_path) != self.size:
+            return None
+        return state["ranges"]
+
+    def _save_state(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_save < PROGRESS_SAVE_INTERVAL:
+                return
+            self._last_save = now
+            state = {"url": self.url, "sha1": self.sha1, "size": self.size,
+                     "ranges": [list(r) for r in self.ranges]}
+            _atomic_write_json(self.state_path, state)
+
+    def _discard(self):
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _check_cancel(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise DownloadCancelled("Download cancelled")
+
+    def _report(self):
+        self._check_cancel()
+        if self.progress:
+            with self._lock:
+                done = sum(r[1] - r[0] for r in self.ranges)
+            self.progress(done, self.size)
+
+    def _get(self, start, end):
+        headers = {"Range": f"bytes={start}-{end - 1}"} if start or end < self.size else {}
+        response = self.session.get(self.url, headers=headers, stream=True, timeout=30)
+        response.raise_for_status()
+        if headers and response.status_code != 206:
+            response.close()
+            raise _NoRanges()
+        return response
+
+    def _fetch_range(self, segment):
+        # segment is [start, next byte to write, end)
+        if segment[1] >= segment[2]:
+            return
+        with self._get(segment[1], segment[2]) as response, open(self.part_path, 'r+b') as f:
+            f.seek(segment[1])
+            for chunk in response.iter_content(CHUNK):
+                chunk = chunk[:segment[2] - segment[1]]
+                f.write(chunk)
+                with self._lock:
+                    segment[1] += len(chunk)
+                self._report()
+                self._save_state()
+                if segment[1] >= segment[2]:
+                    break
+        if segment[1] < segment[2]:
+            raise DownloadError("Connection closed before the download finished")
+
+    def _fetch_streaming(self):
+        # Hashes as bytes arrive; a resumed download hashes what it already has first
+        segment = self.ranges[0]
+        sha1 = hashlib.sha1()
+        with open(self.part_path, 'r+b') as f:
+            remaining = segment[1]
+            while remaining > 0:
+                chunk = f.read(min(CHUNK, remaining))
+                if not chunk:
+                    break
+                sha1.update(chunk)
+                remaining -= len(chunk)
+
+            try:
+                response = self._get(segment[1], segment[2])
+            except _NoRanges:
+                # Server ignored the range; start over from the first byte
+                with self._lock:
+                    segment[1] = 0
+                sha1 = hashlib.sha1()
+                response = self._get(0, self.size)
+            with response:
+                f.seek(segment[1])
+                for chunk in response.iter_content(CHUNK):
+                    chunk = chunk[:segment[2] - segment[1]]
+                    f.write(chunk)
+                    sha1.update(chunk)
+                    with self._lock:
+                        segment[1] += len(chunk)
+                    self._report()
+                    self._save_state()
+                    if segment[1] >= segment[2]:
+                        break
+        if segment[1] < segment[2]:
+            raise DownloadError("Connection closed before the download finished")
+        return sha1.hexdigest()
+
+
+class VersionCatalog:
+    # Server versions from a Mojang-style manifest, with jars kept in a shared cache by sha1
+    def __init__(self, cache_dir, manifest_url=MANIFEST_URL, manifest_ttl=3600, segments=4):
+        self.cache_dir = cache_dir
+        self.manifest_url = manifest_url
+        self.manifest_ttl = manifest_ttl
+        self.segments = segments
+        self.store = PluginStore(os.path.join(cache_dir, "jars"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(4, segments))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._manifest = None
+
+    def _cached_json(self, name, url, max_age=None, sha1=None):
+        # Fresh enough (or content-matching) cache wins; a stale copy beats no network
+        path = os.path.join(self.cache_dir, name)
+        cached = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                cached = json.loads(raw)
+                if sha1 is not None and hashlib.sha1(raw).hexdigest() == sha1:
+                    return cached
+                if max_age is not None and time.time() - os.path.getmtime(path) < max_age:
+                    return cached
+            except Exception:
+                cached = None
+
+        try:
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+            raw = response.content
+            data = json.loads(raw)
+        except Exception:
+            if cached is not None:
+                return cached
+            raise
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+        return data
+
+    def manifest(self):
+        if self._manifest is None:
+            self._manifest = self._cached_json("version_manifest.json", self.manifest_url, max_age=self.manifest_ttl)
+        return self._manifest
+
+    def versions(self, include_snapshots=False):
+        # [(id, type)] newest first
+        return [
+            (v["id"], v.get("type", "release")) for v in self.manifest().get("versions", [])
+            if include_snapshots or v.get("type") == "release"
+        ]
+
+    def server_download(self, version_id):
+        # {"url", "sha1", "size"} of the server jar, or DownloadError if the version has none
+        for entry in self.manifest().get("versions", []):
+            if entry["id"] == version_id:
+                break
+        else:
+            raise DownloadError(f"Unknown version {version_id}")
+        details = self._cached_json(os.path.join("versions", version_id + ".json"), entry["url"], sha1=entry.get("sha1"))
+        server = details.get("downloads", {}).get("server")
+        if not server:
+            raise DownloadError(f"No server download for {version_id}")
+        return server
+
+    def cached_jar(self, sha1):
+        path = self.store.path_for(sha1)
+        return path if os.path.exists(path) else None
+
+    def fetch(self, version_id, progress=None, cancel=None):
+        # Returns the sha1 of the verified jar in the cache, downloading only if it isn't there yet
+        server = self.server_download(version_id)
+        sha1 = server["sha1"]
+        if self.cached_jar(sha1):
+            return sha1
+        dest_path = self.store.path_for(sha1)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        Download(self.session, server["url"], dest_path, sha1, server["size"],
+                 segments=self.segments, progress=progress, cancel=cancel).run()
+        return sha1
+
+    def install(self, sha1, dest_path="server.jar"):
+        return self.store.install(sha1, dest_path)
+
+    def close(self):
+        self.session.close()
@@ -1,8 +1,21 @@
 from PySide6 import QtCore, QtWidgets, QtGui
-import os
-import json
 import threading
-from utils import UUIDFetcher
+from utils import UUIDFetcher, BulkUUIDFetcher
+from uuid_resolver import parse_usernames
+from properties import PropertiesFile
+from whitelist_store import WhitelistStore
+import config
+
+
+# server.properties keys a running server can pick up through a console command.
+# Anything not listed here only takes effect after a restart.
+LIVE_COMMANDS = {
+    "difficulty": lambda value: f"difficulty {value}",
+    "white-list": lambda value: "whitelist on" if value == "true" else "whitelist off",
+    "gamemode": lambda value: f"defaultgamemode {value}",
+    "player-idle-timeout": lambda value: f"setidletimeout {value}",
+}
+RESTART_MARK = "  \u27f3 restart"
 
 
 class NoWheelSpinBox(QtWidgets.QSpinBox):
@@ -16,15 +29,85 @@ class NoWheelComboBox(QtWidgets.QComboBox):
         # Prevent accidental value changes when scrolling the page
         event.ignore()
 
+class WhitelistModel(QtCore.QAbstractListModel):
+    # Rows come straight from the store; edits insert/remove single rows instead of rebuilding
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def set_store(self, store):
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        user = self.store.entries[index.row()]
+        return f"{user.get('name', '')} ({user['uuid']})"
+
+    def add(self, name, uuid):
+        if uuid in self.store:
+            return False
+        row = len(self.store)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.store.add(name, uuid)
+        self.endInsertRows()
+        return True
+
+    def add_many(self, users):
+        # One insert notification for the whole batch
+        fresh, seen = [], set()
+        for name, uuid in users:
+            if uuid not in self.store and uuid not in seen:
+                seen.add(uuid)
+                fresh.append((name, uuid))
+        if fresh:
+            first = len(self.store)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(fresh) - 1)
+            for name, uuid in fresh:
+                self.store.add(name, uuid)
+            self.endInsertRows()
+        return len(fresh)
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        entry = self.store.remove_row(row)
+        self.endRemoveRows()
+        return entry
+
+
 class SettingsTab(QtWidgets.QWidget):
-    def __init__(self, server_props_path="server.properties"):
+    files_loaded = QtCore.Signal(object, object)
+    whitelist_saved = QtCore.Signal(object)
+
+    def __init__(self, server_props_path="server.properties", server_manager=None):
         super().__init__()
         self.server_props_path = server_props_path
+        self.server_manager = server_manager
         self.whitelist_path = "whitelist.json"
-        self.props = {}
-        self.whitelist_data = []
-        self.load_properties()
-        self.load_whitelist()
+        self.props = PropertiesFile(server_props_path)
+        self.wl_store = WhitelistStore(self.whitelist_path)
+        self.wl_saving = False
+        # (widget, key, kind, default) filled in from server.properties once it has been read
+        self.fields = []
+        self.populated = {}  # field index -> value last loaded into its widget
+        self.loaded = False
+        self.reload_deferred = False
+        self.files_loaded.connect(self.on_files_loaded)
+        self.whitelist_saved.connect(self.on_whitelist_saved)
+
+        # Bursts of edits are written once, after they stop
+        self.wl_save_timer = QtCore.QTimer(self)
+        self.wl_save_timer.setSingleShot(True)
+        self.wl_save_timer.setInterval(config.get("whitelist_save_delay_ms"))
+        self.wl_save_timer.timeout.connect(self.save_whitelist)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_whitelist)
 
         self.layout = QtWidgets.QVBoxLayout(self)
         self.layout.setContentsMargins(30, 30, 30, 30)
@@ -32,7 +115,6 @@ class SettingsTab(QtWidgets.QWidget):
 
         scroll = QtWidgets.QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background: transparent; border: none;")
         
         container = QtWidgets.QWidget()
         self.form_layout = QtWidgets.QVBoxLayout(container)
@@ -52,7 +134,7 @@ class SettingsTab(QtWidgets.QWidget):
         
         self.whitelist_input = self.add_bool_input("Whitelist", "white-list")
         
-        self.cracked_input = self.add_custom_bool_input("Cracked Mode", self.get_cracked_state, self.set_cracked_state)
+        self.cracked_input = self.add_custom_bool_input("Cracked Mode" + RESTART_MARK, self.get_cracked_state, self.set_cracked_state)
 
         self.fly_input = self.add_bool_input("Allow Flight", "allow-flight")
         
@@ -65,6 +147,13 @@ class SettingsTab(QtWidgets.QWidget):
         self.view_distance_input = self.add_spin_input("View Distance", "view-distance", 2, 32)
         
         self.motd_input = self.add_text_input("MOTD (Server Bio)", "motd")
+
+        self.rcon_input = self.add_bool_input("Enable RCON", "enable-rcon")
+
+        self.rcon_port_input = self.add_spin_input("RCON Port", "rcon.port", 1, 65535, default=25575)
+
+        self.rcon_password_input = self.add_text_input("RCON Password", "rcon.password")
+        self.rcon_password_input.setEchoMode(QtWidgets.QLineEdit.Password)
         
         # No proxy/velocity controls
         
@@ -76,71 +165,37 @@ class SettingsTab(QtWidgets.QWidget):
 
         wl_input_layout = QtWidgets.QVBoxLayout()
         self.wl_username_input = QtWidgets.QLineEdit()
-        self.wl_username_input.setPlaceholderText("Enter Minecraft Username")
+        self.wl_username_input.setPlaceholderText("Enter Minecraft Username (or several, separated by commas)")
         
         self.btn_add_wl = QtWidgets.QPushButton("Add User")
         self.btn_add_wl.setObjectName("Primary")
         self.btn_add_wl.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        self.btn_add_wl.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(140, 96, 255, 210), stop:1 rgba(186, 138, 255, 210));
-                border: 1px solid rgba(255,255,255,55);
-                color: #0B0B12;
-                font-weight: 700;
-                padding: 15px 20px;
-                border-radius: 12px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,26);
-                border-color: rgba(186, 138, 255, 140);
-            }
-            QPushButton:pressed {
-                background: rgba(186, 138, 255, 40);
-            }
-        """)
         self.btn_add_wl.clicked.connect(self.add_whitelist_user)
+
+        self.btn_import_wl = QtWidgets.QPushButton("Import List...")
+        self.btn_import_wl.setObjectName("Secondary")
+        self.btn_import_wl.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.btn_import_wl.clicked.connect(self.import_whitelist_file)
         
         wl_input_layout.addWidget(self.wl_username_input)
         wl_input_layout.addWidget(self.btn_add_wl)
+        wl_input_layout.addWidget(self.btn_import_wl)
         self.form_layout.addLayout(wl_input_layout)
         
-        self.wl_list_widget = QtWidgets.QListWidget()
-        self.wl_list_widget.setStyleSheet("""
-            QListWidget {
-                background: rgba(0,0,0,35);
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                color: #E9E7FF;
-            }
-        """)
+        self.wl_model = WhitelistModel(self.wl_store, self)
+        self.wl_list_widget = QtWidgets.QListView()
+        self.wl_list_widget.setObjectName("Whitelist")
+        self.wl_list_widget.setModel(self.wl_model)
+        # Every row is one line of text, so the view can skip measuring each of them
+        self.wl_list_widget.setUniformItemSizes(True)
         self.wl_list_widget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.wl_list_widget.customContextMenuRequested.connect(self.show_wl_context_menu)
-        self.update_whitelist_display()
         self.form_layout.addWidget(self.wl_list_widget)
 
         self.form_layout.addSpacing(20)
         self.btn_save = QtWidgets.QPushButton("Save Settings")
         self.btn_save.setObjectName("Primary")
         self.btn_save.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        self.btn_save.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(140, 96, 255, 210), stop:1 rgba(186, 138, 255, 210));
-                border: 1px solid rgba(255,255,255,55);
-                color: #0B0B12;
-                font-weight: 700;
-                padding: 15px 20px;
-                border-radius: 12px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,26);
-                border-color: rgba(186, 138, 255, 140);
-            }
-            QPushButton:pressed {
-                background: rgba(186, 138, 255, 40);
-            }
-        """)
         self.btn_save.clicked.connect(self.save_properties)
         self.form_layout.addWidget(self.btn_save)
 
@@ -149,39 +204,157 @@ class SettingsTab(QtWidgets.QWidget):
         scroll.setWidget(container)
         self.layout.addWidget(scroll)
 
-    def load_whitelist(self):
-        if os.path.exists(self.whitelist_path):
-            try:
-                with open(self.whitelist_path, 'r') as f:
-                    self.whitelist_data = json.load(f)
-            except:
-                self.whitelist_data = []
-        else:
-             self.whitelist_data = []
+        # Nothing may be saved before the real files are in, or they'd be overwritten with blanks
+        for widget in (self.btn_save, self.btn_add_wl, self.btn_import_wl):
+            widget.setEnabled(False)
+        threading.Thread(target=self._load_files, daemon=True).start()
+
+    def _load_files(self, with_whitelist=True):
+        props = PropertiesFile(self.server_props_path)
+        try:
+            props.load()
+        except Exception:
+            pass
+        # None keeps the whitelist already in memory
+        self.files_loaded.emit(props, self.read_whitelist() if with_whitelist else None)
+
+    def whitelist_busy(self):
+        # A pending or in-flight save; reloading now would drop those edits
+        return self.wl_save_timer.isActive() or self.wl_saving
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        # A stat call; the files are only read again if the server or an editor changed them
+        if not self.loaded:
+            return
+        if self.whitelist_busy():
+            # Retried once the whitelist save lands
+            self.reload_deferred = True
+            return
+        self.reload_deferred = False
+        whitelist_stale = self.wl_store.is_stale()
+        if self.props.is_stale() or whitelist_stale:
+            self.loaded = False
+            for widget in (self.btn_save, self.btn_add_wl, self.btn_import_wl):
+                widget.setEnabled(False)
+            threading.Thread(target=self._load_files, args=(whitelist_stale,), daemon=True).start()
+
+    def on_files_loaded(self, props, whitelist):
+        edited = self.edited_fields() if self.populated else set()
+        if edited and self.isVisible():
+            reply = QtWidgets.QMessageBox.question(
+                self, "Settings Changed",
+                "server.properties was changed outside the panel.\n\n"
+                "Discard your unsaved edits and load the new values?")
+            if reply == QtWidgets.QMessageBox.Yes:
+                edited = set()
+        self.props = props
+        if whitelist is not None:
+            self.wl_store = whitelist
+            self.wl_model.set_store(whitelist)
+        self.populate_fields(skip=edited)
+        self.loaded = True
+        for widget in (self.btn_save, self.btn_add_wl, self.btn_import_wl):
+            widget.setEnabled(True)
+
+    @staticmethod
+    def field_value(inp, kind):
+        if kind == "text":
+            return inp.text()
+        if kind == "spin":
+            return inp.value()
+        if kind == "combo":
+            return inp.currentText()
+        return inp.isChecked()
+
+    def edited_fields(self):
+        # Indexes into self.fields whose widget no longer shows what was loaded into it
+        return {i for i, (inp, _, kind, _) in enumerate(self.fields)
+                if self.field_value(inp, kind) != self.populated.get(i)}
+
+    def populate_fields(self, skip=()):
+        for i, (inp, key, kind, default) in enumerate(self.fields):
+            if i in skip:
+                continue
+            if kind == "text":
+                inp.setText(self.get_prop(key))
+            elif kind == "spin":
+                try:
+                    inp.setValue(int(self.get_prop(key, "" if default is None else str(default))))
+                except ValueError:
+                    inp.setValue(inp.minimum())
+            elif kind == "combo":
+                idx = inp.findText(self.get_prop(key))
+                if idx >= 0:
+                    inp.setCurrentIndex(idx)
+            elif kind == "bool":
+                inp.setChecked(self.get_prop(key).lower() == 'true')
+            elif kind == "custom":
+                inp.setChecked(default())
+            self.populated[i] = self.field_value(inp, kind)
+
+    def read_whitelist(self):
+        return WhitelistStore(self.whitelist_path).load()
+
+    def schedule_whitelist_save(self):
+        self.wl_save_timer.start()
 
     def save_whitelist(self):
+        # The snapshot is taken here so the worker never sees the list mid-edit
+        if self.wl_saving:
+            self.wl_save_timer.start()
+            return
+        self.wl_saving = True
+        threading.Thread(target=self._save_whitelist, args=(self.wl_store, self.wl_store.snapshot()), daemon=True).start()
+
+    def _save_whitelist(self, store, entries):
         try:
-            with open(self.whitelist_path, 'w') as f:
-                json.dump(self.whitelist_data, f, indent=2)
+            store.save(entries)
+            self.whitelist_saved.emit(None)
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save whitelist: {e}")
+            self.whitelist_saved.emit(str(e))
+
+    def on_whitelist_saved(self, error):
+        self.wl_saving = False
+        if self.reload_deferred and not self.wl_save_timer.isActive():
+            self.reload_if_changed()
+        if error:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save whitelist: {error}")
+            return
+        if self.server_manager and self.server_manager.running:
+            self.server_manager.send_command("whitelist reload")
 
-    def update_whitelist_display(self):
-        self.wl_list_widget.clear()
-        for user in self.whitelist_data:
-            item = QtWidgets.QListWidgetItem(f"{user['name']} ({user['uuid']})")
-            self.wl_list_widget.addItem(item)
+    def flush_whitelist(self):
+        # On exit a debounced save can't wait for its timer
+        if self.wl_save_timer.isActive():
+            self.wl_save_timer.stop()
+            try:
+                self.wl_store.save()
+            except Exception:
+                pass
 
     def add_whitelist_user(self):
         username = self.wl_username_input.text().strip()
-        if not username:
+        if not username or not self.loaded:
+            return
+
+        usernames = parse_usernames(username)
+        if len(usernames) > 1:
+            self.add_whitelist_users(usernames)
             return
         
         self.btn_add_wl.setEnabled(False)
         self.btn_add_wl.setText("Fetching...")
         
         # Run fetch in thread
-        self.fetcher = UUIDFetcher(username, proxy=getattr(self, "selected_proxy", None))
+        self.fetcher = UUIDFetcher(
+            username,
+            proxy=getattr(self, "selected_proxy", None),
+            offline_mode=self.get_cracked_state()
+        )
         self.thread = QtCore.QThread()
         self.fetcher.moveToThread(self.thread)
         self.thread.started.connect(self.fetcher.run)
@@ -199,20 +372,72 @@ class SettingsTab(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Error", f"Could not find player: {error}")
             return
             
-        # Check if already exists
-        for user in self.whitelist_data:
-            if user['uuid'] == uuid:
-                QtWidgets.QMessageBox.information(self, "Info", "User already whitelisted.")
-                return
+        if not self.wl_model.add(username, uuid):
+            QtWidgets.QMessageBox.information(self, "Info", "User already whitelisted.")
+            return
 
-        self.whitelist_data.append({"uuid": uuid, "name": username})
-        self.save_whitelist()
-        self.update_whitelist_display()
+        self.schedule_whitelist_save()
         self.wl_username_input.clear()
 
+    def import_whitelist_file(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import Usernames", "", "Text or CSV files (*.txt *.csv);;All files (*)")
+        if not path:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                usernames = parse_usernames(f.read())
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to read {path}: {e}")
+            return
+        if usernames:
+            self.add_whitelist_users(usernames)
+
+    def add_whitelist_users(self, usernames):
+        self.btn_add_wl.setEnabled(False)
+        self.btn_import_wl.setEnabled(False)
+        self.btn_add_wl.setText(f"Fetching 0/{len(usernames)}...")
+
+        self.bulk_fetcher = BulkUUIDFetcher(
+            usernames,
+            proxy=getattr(self, "selected_proxy", None),
+            offline_mode=self.get_cracked_state()
+        )
+        self.bulk_thread = QtCore.QThread()
+        self.bulk_fetcher.moveToThread(self.bulk_thread)
+        self.bulk_thread.started.connect(self.bulk_fetcher.run)
+        self.bulk_fetcher.progress.connect(self.on_bulk_progress)
+        self.bulk_fetcher.finished.connect(self.on_bulk_fetched)
+        self.bulk_fetcher.finished.connect(self.bulk_thread.quit)
+        self.bulk_fetcher.finished.connect(self.bulk_fetcher.deleteLater)
+        self.bulk_thread.finished.connect(self.bulk_thread.deleteLater)
+        self.bulk_thread.start()
+
+    def on_bulk_progress(self, done, total):
+        self.btn_add_wl.setText(f"Fetching {done}/{total}...")
+
+    def on_bulk_fetched(self, results, failures):
+        self.btn_add_wl.setEnabled(True)
+        self.btn_import_wl.setEnabled(True)
+        self.btn_add_wl.setText("Add User")
+
+        added = self.wl_model.add_many(results)
+        if added:
+            self.schedule_whitelist_save()
+        self.wl_username_input.clear()
+
+        message = f"Added {added} player(s); {len(results) - added} already whitelisted."
+        if failures:
+            shown = "\n".join(f"{name}: {error}" for name, error in failures[:10])
+            more = f"\n...and {len(failures) - 10} more" if len(failures) > 10 else ""
+            message += f"\n\n{len(failures)} could not be added:\n{shown}{more}"
+            QtWidgets.QMessageBox.warning(self, "Whitelist Import", message)
+        else:
+            QtWidgets.QMessageBox.information(self, "Whitelist Import", message)
+
     def show_wl_context_menu(self, pos):
-        item = self.wl_list_widget.itemAt(pos)
-        if not item:
+        index = self.wl_list_widget.indexAt(pos)
+        if not index.isValid():
             return
             
         menu = QtWidgets.QMenu()
@@ -220,107 +445,58 @@ class SettingsTab(QtWidgets.QWidget):
         action = menu.exec(self.wl_list_widget.mapToGlobal(pos))
         
         if action == remove_action:
-            row = self.wl_list_widget.row(item)
-            del self.whitelist_data[row]
-            self.save_whitelist()
-            self.update_whitelist_display()
-
-    def load_properties(self):
-        if not os.path.exists(self.server_props_path):
-            return
-        
-        with open(self.server_props_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    self.props[key.strip()] = value.strip()
+            self.wl_model.remove_row(index.row())
+            self.schedule_whitelist_save()
 
     def get_prop(self, key, default=""):
         return self.props.get(key, default)
 
+    def field_label(self, label_text, key):
+        return label_text if key in LIVE_COMMANDS else label_text + RESTART_MARK
+
     def add_text_input(self, label_text, key):
-        lbl = QtWidgets.QLabel(label_text)
+        lbl = QtWidgets.QLabel(self.field_label(label_text, key))
         lbl.setObjectName("H2")
         self.form_layout.addWidget(lbl)
         
         inp = QtWidgets.QLineEdit()
-        inp.setText(self.get_prop(key))
+        self.fields.append((inp, key, "text", None))
         self.form_layout.addWidget(inp)
         return inp
 
-    def add_spin_input(self, label_text, key, min_val, max_val):
-        lbl = QtWidgets.QLabel(label_text)
+    def add_spin_input(self, label_text, key, min_val, max_val, default=None):
+        lbl = QtWidgets.QLabel(self.field_label(label_text, key))
         lbl.setObjectName("H2")
         self.form_layout.addWidget(lbl)
         
         inp = NoWheelSpinBox()
         inp.setRange(min_val, max_val)
-        val = self.get_prop(key)
-        try:
-            inp.setValue(int(val))
-        except:
-            inp.setValue(min_val)
-        
-        inp.setStyleSheet("""
-            QSpinBox {
-                background: rgba(0,0,0,35);
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                padding: 8px;
-                color: white;
-            }
-        """)
+        self.fields.append((inp, key, "spin", default))
         self.form_layout.addWidget(inp)
         return inp
 
     def add_combo_input(self, label_text, key, options):
-        lbl = QtWidgets.QLabel(label_text)
+        lbl = QtWidgets.QLabel(self.field_label(label_text, key))
         lbl.setObjectName("H2")
         self.form_layout.addWidget(lbl)
         
         inp = NoWheelComboBox()
         inp.addItems(options)
-        
-        current = self.get_prop(key)
-        idx = inp.findText(current)
-        if idx >= 0:
-            inp.setCurrentIndex(idx)
-            
-        inp.setStyleSheet("""
-            QComboBox {
-                background: rgba(0,0,0,35);
-                border: 1px solid rgba(255,255,255,30);
-                border-radius: 8px;
-                padding: 8px;
-                color: white;
-            }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView {
-                background-color: #0E0C1A;
-                color: white;
-                selection-background-color: rgba(186, 138, 255, 100);
-            }
-        """)
+        self.fields.append((inp, key, "combo", None))
         self.form_layout.addWidget(inp)
         return inp
 
     def add_bool_input(self, label_text, key):
-        inp = QtWidgets.QCheckBox(label_text)
-        inp.setStyleSheet("QCheckBox { color: #E9E7FF; font-size: 14px; }")
+        inp = QtWidgets.QCheckBox(self.field_label(label_text, key))
         
-        val = self.get_prop(key).lower()
-        inp.setChecked(val == 'true')
+        self.fields.append((inp, key, "bool", None))
         
         self.form_layout.addWidget(inp)
         return inp
 
     def add_custom_bool_input(self, label_text, getter, setter):
         inp = QtWidgets.QCheckBox(label_text)
-        inp.setStyleSheet("QCheckBox { color: #E9E7FF; font-size: 14px; }")
-        inp.setChecked(getter())
+        self.fields.append((inp, None, "custom", getter))
         self.form_layout.addWidget(inp)
         inp.setProperty("custom_setter", setter)
         return inp
@@ -330,51 +506,59 @@ class SettingsTab(QtWidgets.QWidget):
         return val == 'false'
 
     def set_cracked_state(self, is_checked):
-        self.props["online-mode"] = "false" if is_checked else "true"
+        self.props.set("online-mode", "false" if is_checked else "true")
 
     def save_properties(self):
-        self.props["level-seed"] = self.seed_input.text()
-        self.props["max-players"] = str(self.slots_input.value())
-        self.props["gamemode"] = self.gamemode_input.currentText()
-        self.props["difficulty"] = self.difficulty_input.currentText()
-        self.props["white-list"] = "true" if self.whitelist_input.isChecked() else "false"
-        self.props["allow-flight"] = "true" if self.fly_input.isChecked() else "false"
-        self.props["force-gamemode"] = "true" if self.force_gamemode_input.isChecked() else "false"
-        self.props["spawn-protection"] = str(self.spawn_protection_input.value())
-        self.props["player-idle-timeout"] = str(self.idle_timeout_input.value())
-        self.props["view-distance"] = str(self.view_distance_input.value())
-        self.props["motd"] = self.motd_input.text()
+        self.props.set("level-seed", self.seed_input.text())
+        self.props.set("max-players", self.slots_input.value())
+        self.props.set("gamemode", self.gamemode_input.currentText())
+        self.props.set("difficulty", self.difficulty_input.currentText())
+        self.props.set("white-list", "true" if self.whitelist_input.isChecked() else "false")
+        self.props.set("allow-flight", "true" if self.fly_input.isChecked() else "false")
+        self.props.set("force-gamemode", "true" if self.force_gamemode_input.isChecked() else "false")
+        self.props.set("spawn-protection", self.spawn_protection_input.value())
+        self.props.set("player-idle-timeout", self.idle_timeout_input.value())
+        self.props.set("view-distance", self.view_distance_input.value())
+        self.props.set("motd", self.motd_input.text())
+        self.props.set("enable-rcon", "true" if self.rcon_input.isChecked() else "false")
+        self.props.set("rcon.port", self.rcon_port_input.value())
+        self.props.set("rcon.password", self.rcon_password_input.text())
         
         if hasattr(self.cracked_input, "property"):
              setter = self.cracked_input.property("custom_setter")
              if setter:
                  setter(self.cracked_input.isChecked())
 
+        if self.rcon_input.isChecked() and not self.props.get("rcon.password"):
+            QtWidgets.QMessageBox.warning(self, "RCON", "RCON needs a password; the server will not enable it without one.")
+
+        changed = dict(self.props.dirty)
         try:
-            lines = []
-            if os.path.exists(self.server_props_path):
-                with open(self.server_props_path, 'r') as f:
-                    lines = f.readlines()
-            
-            key_line_map = {}
-            for i, line in enumerate(lines):
-                if '=' in line and not line.strip().startswith('#'):
-                    k = line.split('=', 1)[0].strip()
-                    key_line_map[k] = i
-            
-            for k, v in self.props.items():
-                if k in key_line_map:
-                    lines[key_line_map[k]] = f"{k}={v}\n"
-                else:
-                    lines.append(f"{k}={v}\n")
-            
-            with open(self.server_props_path, 'w') as f:
-                f.writelines(lines)
-                
-            QtWidgets.QMessageBox.information(self, "Success", "Settings saved successfully!")
-            
+            if not self.props.save():
+                QtWidgets.QMessageBox.information(self, "Settings", "No changes to save.")
+                return
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
+            return
+
+        if not (self.server_manager and self.server_manager.running):
+            QtWidgets.QMessageBox.information(self, "Success", "Settings saved successfully!")
+            return
+
+        applied, failed = [], []
+        for key in changed:
+            if key in LIVE_COMMANDS:
+                sent = self.server_manager.send_command(LIVE_COMMANDS[key](changed[key]))
+                (applied if sent else failed).append(key)
+        pending = [key for key in changed if key not in LIVE_COMMANDS]
+        message = "Settings saved successfully!"
+        if applied:
+            message += f"\n\nApplied to the running server: {', '.join(applied)}"
+        if failed:
+            message += f"\n\nCould not be sent to the server (saved, apply after a restart): {', '.join(failed)}"
+        if pending:
+            message += f"\n\nTake effect after a restart: {', '.join(pending)}"
+        QtWidgets.QMessageBox.information(self, "Success", message)
 
     def apply_proxy_settings(self):
         # Deprecated: proxy is not used for hosting. Kept for compatibility/no-op.
@@ -0,0 +1,37 @@
+import sys
+import time
+
+# Set when this module is first imported, which menu.py does before anything heavy
+STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    def __init__(self, budget_ms, started=STARTED, stream=None):
+        self.budget_ms = budget_ms
+        self.started = started
+        self.stream = stream or sys.stderr
+        self.marks = []
+        self._last = started
+        self.reported = False
+
+    def mark(self, name):
+        # Records the time since the previous mark under name
+        now = time.perf_counter()
+        self.marks.append((name, (now - self._last) * 1000.0))
+        self._last = now
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        total = self.elapsed_ms()
+        parts = ", ".join(f"{name} {ms:.0f}ms" for name, ms in self.marks)
+        status = "within" if total <= self.budget_ms else "OVER"
+        print(f"[startup] {total:.0f}ms to first paint ({status} {self.budget_ms}ms budget): {parts}",
+              file=self.stream, flush=True)
+
+    def log(self, message):
+        print(f"[startup] {message}", file=self.stream, flush=True)
@@ -0,0 +1,194 @@
+import re
+import json
+import time
+import socket
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from server_ping import _read_packet, _packet, _string, PingError, PING, STATUS_REQUEST
+from rcon import encode_packet, read_packets, RconError, FRAGMENT_SIZE, TYPE_AUTH_RESPONSE, TYPE_COMMAND, \
+    TYPE_LOGIN, TYPE_RESPONSE
+
+
+class HTTPStandIn:
+    # A local HTTP server for the network code. files maps a path to bytes served with Range
+    # support; routes maps a path prefix to handler(method, path, body) -> (status, json object).
+    # hits records (method, path, Range header) and ports the client ports that connected.
+    def __init__(self, files=None, routes=None, delay=0.0):
+        self.files = dict(files or {})
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.ranges = True
+        # Responses bigger than this are cut off after this many bytes, like a dropped connection
+        self.fail_after = None
+        self.hits = []
+        self.ports = set()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def paths_hit(self, method="GET"):
+        with self._lock:
+            return [path for m, path, _ in self.hits if m == method]
+
+    def _record(self, method, handler):
+        with self._lock:
+            self.hits.append((method, handler.path, handler.headers.get("Range")))
+            self.ports.add(handler.client_address[1])
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in._record("GET", self)
+                self._respond("GET", None)
+
+            def do_POST(self):
+                stand_in._record("POST", self)
+                length = int(self.headers.get("Content-Length") or 0)
+                self._respond("POST", json.loads(self.rfile.read(length) or b"null"))
+
+            def _respond(self, method, body):
+                time.sleep(stand_in.delay)
+                for prefix, route in stand_in.routes.items():
+                    if self.path.startswith(prefix):
+                        status, payload = route(method, self.path, body)
+                        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+                        return
+                data = stand_in.files.get(self.path)
+                if data is None:
+                    self._send(404, b"", "text/plain")
+                    return
+                match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range") or "")
+                if match and stand_in.ranges:
+                    start, end = int(match.group(1)), int(match.group(2))
+                    headers = {"Content-Range": f"bytes {start}-{end}/{len(data)}"}
+                    self._send(206, data[start:end + 1], "application/octet-stream", headers)
+                else:
+                    self._send(200, data, "application/octet-stream")
+
+            def _send(self, status, data, content_type, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                cut = stand_in.fail_after
+                if cut is not None and len(data) > cut:
+                    self.wfile.write(data[:cut])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                self.wfile.write(data)
+
+        return Handler
+
+
+class TCPStandIn:
+    # Accepts connections on a local port and hands each to handle(conn) on its own thread
+    def __init__(self, host="127.0.0.1", port=0):
+        self.sock = socket.create_server((host, port))
+        self.host, self.port = self.sock.getsockname()[:2]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def close(self):
+        # close() alone leaves accept() blocked on Linux; shutdown() wakes it
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def handle(self, conn):
+        raise NotImplementedError
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            try:
+                self.handle(conn)
+            except OSError:
+                pass
+
+
+class RconStandIn(TCPStandIn):
+    # Answers RCON logins and commands like a Minecraft server. "echo <text>" answers <text>,
+    # split into FRAGMENT_SIZE payloads when long; commands in silent get no answer at all.
+    def __init__(self, password="password", silent=(), **kwargs):
+        self.password = password
+        self.silent = set(silent)
+        self.commands = []
+        super().__init__(**kwargs)
+
+    def respond(self, command):
+        if command.startswith("echo "):
+            return command[5:]
+        return f"Unknown command: {command}"
+
+    def handle(self, conn):
+        buffer = b""
+        while True:
+            data = conn.recv(4096)
+            if not data:
+                return
+            try:
+                packets, buffer = read_packets(buffer + data)
+            except RconError:
+                return
+            for request_id, packet_type, body, _ in packets:
+                if packet_type == TYPE_LOGIN:
+                    ok = body == self.password
+                    conn.sendall(encode_packet(request_id if ok else -1, TYPE_AUTH_RESPONSE, ""))
+                elif packet_type == TYPE_COMMAND:
+                    self.commands.append(body)
+                    if body in self.silent:
+                        continue
+                    text = self.respond(body)
+                    for i in range(0, max(len(text), 1), FRAGMENT_SIZE):
+                        conn.sendall(encode_packet(request_id, TYPE_RESPONSE, text[i:i + FRAGMENT_SIZE]))
+
+
+class PingStandIn(TCPStandIn):
+    # Answers Server List Pings with status, holding each pong back by delay seconds
+    def __init__(self, status=None, delay=0.0, **kwargs):
+        self.status = status or {
+            "version": {"name": "1.21.1", "protocol": 767},
+            "players": {"max": 20, "online": 3},
+            "description": {"text": "A Minecraft ", "extra": [{"text": "Server"}]},
+        }
+        self.delay = delay
+        self.pings = 0
+        super().__init__(**kwargs)
+
+    def handle(self, conn):
+        try:
+            _read_packet(conn)  # handshake
+            _read_packet(conn)  # status request
+            conn.sendall(_packet(STATUS_REQUEST, _string(json.dumps(self.status))))
+            packet_id, read = _read_packet(conn)
+            time.sleep(self.delay)
+            conn.sendall(_packet(PING, read(8)))
+            self.pings += 1
+        except PingError:
+            pass
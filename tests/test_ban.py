@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+import config
+from ban import BulkBanJob
+from log_events import EventClassifier, BANNED
+
+
+class FakeServer:
+    # Accepts up to capacity commands, then refuses like a closed writer; echoes bans to the console
+    def __init__(self, capacity=None, confirm=True):
+        self.events = EventClassifier()
+        self.capacity = capacity
+        self.confirm = confirm
+        self.sent = []
+
+    def send_commands(self, commands, timeout=0):
+        room = len(commands) if self.capacity is None else max(0, self.capacity - len(self.sent))
+        accepted = commands[:room]
+        self.sent.extend(accepted)
+        if self.confirm:
+            self.events.feed([f"[12:00:00] [Server thread/INFO]: Banned {c.split()[1]}: Banned by an operator."
+                              for c in accepted])
+        return len(accepted)
+
+
+@pytest.fixture(autouse=True)
+def fast_batches(monkeypatch):
+    values = {"bulk_ban_batch_size": 2, "bulk_ban_batch_interval_ms": 0, "bulk_ban_confirm_timeout": 0.3}
+    original = config.get
+    monkeypatch.setattr(config, "get", lambda key, default=None: values.get(key, original(key, default)))
+
+
+def run(job):
+    result = []
+    job.finished.connect(lambda *args: result.append(args))
+    job.run()
+    return result[0]
+
+
+def commands(*names):
+    return [(name, f"ban {name}") for name in names]
+
+
+def test_all_confirmed():
+    server = FakeServer()
+    confirmed, unconfirmed, unsent = run(BulkBanJob(server, commands("Alice", "Bob", "Carol"), BANNED))
+    assert (confirmed, unconfirmed, unsent) == (3, [], [])
+
+
+def test_refused_commands_are_unsent_not_unconfirmed():
+    server = FakeServer(capacity=3)
+    confirmed, unconfirmed, unsent = run(BulkBanJob(server, commands("a", "b", "c", "d", "e"), BANNED))
+    assert confirmed == 3 and unconfirmed == []
+    assert unsent == ["d", "e"]
+
+
+def test_silent_server_leaves_sent_names_unconfirmed():
+    server = FakeServer(confirm=False)
+    confirmed, unconfirmed, unsent = run(BulkBanJob(server, commands("a", "b"), BANNED))
+    assert (confirmed, unconfirmed, unsent) == (0, ["a", "b"], [])
+
+
+def test_cancel_reports_the_rest_as_unsent():
+    server = FakeServer()
+    job = BulkBanJob(server, commands("a", "b", "c", "d", "e"), BANNED)
+    original = server.send_commands
+
+    def send_then_cancel(batch, timeout=0):
+        job.cancel()
+        return original(batch, timeout)
+
+    server.send_commands = send_then_cancel
+    confirmed, unconfirmed, unsent = run(job)
+    assert (confirmed, unconfirmed, unsent) == (2, [], ["c", "d", "e"])
@@ -0,0 +1,81 @@
+import os
+
+import console_io
+from console_io import LineSplitter, read_chunked, CommandWriter
+
+
+def split(*chunks):
+    splitter = LineSplitter()
+    lines = []
+    for chunk in chunks:
+        lines.extend(splitter.feed(chunk))
+    return lines + splitter.flush()
+
+
+def test_partial_lines_wait_for_their_newline():
+    splitter = LineSplitter()
+    assert splitter.feed(b"[12:00] Preparing") == []
+    assert splitter.feed(b" spawn\n[12:01] Do") == ["[12:00] Preparing spawn"]
+    assert splitter.feed(b"ne\n") == ["[12:01] Done"]
+    assert splitter.flush() == []
+
+
+def test_unterminated_last_line_is_flushed():
+    assert split(b"first\nlast") == ["first", "last"]
+
+
+def test_multibyte_character_split_across_reads():
+    data = "Steve: héllo ☃\n".encode("utf-8")
+    assert split(*(data[i:i + 1] for i in range(len(data)))) == ["Steve: héllo ☃"]
+
+
+def test_crlf_and_bare_cr():
+    assert split(b"a\r\nb\r\n") == ["a", "b"]
+    # A bare CR rewrites the line in a terminal; only the last rewrite is visible
+    assert split(b"Preparing 10%\rPreparing 50%\rPreparing 100%\r\nnext\n") == ["Preparing 100%", "next"]
+    assert split(b"Loading 1\rLoading 2") == ["Loading 2"]
+
+
+def test_ansi_sequences_are_stripped():
+    data = b"\x1b[0;32mINFO\x1b[m: ready \x1b]0;title\x07done\n\x1b[1mbold"
+    assert split(data) == ["INFO: ready done", "bold"]
+
+
+def test_escape_split_across_reads():
+    assert split(b"\x1b[0;3", b"2mgreen\x1b[m\n") == ["green"]
+
+
+def test_runaway_line_is_flushed_at_the_limit(monkeypatch):
+    monkeypatch.setattr(console_io, "MAX_PARTIAL", 16)
+    splitter = LineSplitter()
+    assert splitter.feed(b"x" * 10) == []
+    assert splitter.feed(b"y" * 10) == ["x" * 10 + "y" * 10]
+    assert splitter.feed(b"end\n") == ["end"]
+
+
+def test_read_chunked_batches_lines():
+    read_fd, write_fd = os.pipe()
+    batches = []
+    with open(write_fd, 'wb') as f:
+        f.write(b"".join(b"line %d\r\n" % i for i in range(1000)) + b"tail")
+    with open(read_fd, 'rb') as stream:
+        read_chunked(stream, batches.append, chunk_size=4096)
+    lines = [line for batch in batches for line in batch]
+    assert lines == [f"line {i}" for i in range(1000)] + ["tail"]
+    assert len(batches) < 10
+
+
+def test_command_writer_batches_in_order():
+    read_fd, write_fd = os.pipe()
+    errors = []
+    with open(write_fd, 'wb') as stream:
+        writer = CommandWriter(stream, lambda command, reason: errors.append(command))
+        writer.start()
+        assert writer.submit_many([f"say {i}" for i in range(500)], timeout=None) == 500
+        writer.close()
+        writer._thread.join(5)
+    with open(read_fd, 'rb') as f:
+        assert f.read().decode().splitlines() == [f"say {i}" for i in range(500)]
+    assert errors == []
+    assert not writer.submit("late")
+    assert errors == ["late"]
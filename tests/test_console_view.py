@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtWidgets
+
+from launch import ConsoleView
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def batch(start, count):
+    # Every third line is long enough to wrap
+    return [f"line {i} " + ("wrap " * 20 if i % 3 == 0 else "") for i in range(start, start + count)]
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_scrolled_back_view_stays_put_while_lines_are_trimmed(app, wrap):
+    view = ConsoleView(200)
+    view.resize(300, 200)
+    if not wrap:
+        view.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+    view.show()
+    for start in range(0, 200, 10):
+        view.append_lines(batch(start, 10))
+        app.processEvents()
+
+    bar = view.verticalScrollBar()
+    bar.setValue(bar.maximum() // 2)
+    app.processEvents()
+    anchor = view.firstVisibleBlock().text()
+    for start in range(200, 260, 10):
+        view.append_lines(batch(start, 10))
+        app.processEvents()
+    assert view.document().blockCount() == 200
+    assert view.firstVisibleBlock().text() == anchor
+
+
+def test_view_at_the_bottom_follows_new_lines(app):
+    view = ConsoleView(100)
+    view.resize(300, 200)
+    view.show()
+    for start in range(0, 300, 10):
+        view.append_lines(batch(start, 10))
+        app.processEvents()
+    bar = view.verticalScrollBar()
+    assert bar.value() == bar.maximum()
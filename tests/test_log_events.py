@@ -0,0 +1,51 @@
+from log_events import (EventClassifier, _benchmark, LINE, JOIN, LEAVE, CHAT, COMMAND, OVERLOADED, DONE,
+                        EXCEPTION, BANNED, PARDONED)
+
+
+def classify(line):
+    return EventClassifier().classify(line)
+
+
+def test_message_kinds():
+    cases = [
+        ("[12:00:02] [Server thread/INFO]: Steve joined the game", JOIN, "Steve", None, None),
+        ("[12:00:07 INFO]: Alex left the game", LEAVE, "Alex", None, None),
+        ("[12:00:03] [Server thread/INFO]: [Not Secure] <Steve> hi <there>", CHAT, "Steve", "hi <there>", None),
+        ("[12:00:04] [Server thread/INFO]: Steve issued server command: /tp Alex", COMMAND, "Steve", "/tp Alex", None),
+        ("[12:00:05] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2012ms or 40 ticks behind",
+         OVERLOADED, None, None, 2012),
+        ('[12:00:06] [Server thread/INFO]: Done (12.345s)! For help, type "help"', DONE, None, None, 12.345),
+        ("Caused by: java.lang.IllegalStateException: Not ready", EXCEPTION, None,
+         "java.lang.IllegalStateException", None),
+        ("[12:00:07] [Server thread/INFO]: Banned Griefer: Raiding", BANNED, "Griefer", "Raiding", None),
+        ("[12:00:08] [Server thread/INFO]: Unbanned Griefer", PARDONED, "Griefer", None, None),
+        ("[12:00:08] [Server thread/INFO]: Steve joined the game late", LINE, None, None, None),
+        ("\tat net.minecraft.server.MinecraftServer.run(MinecraftServer.java:42)", LINE, None, None, None),
+    ]
+    for line, kind, player, text, value in cases:
+        event = classify(line)
+        assert (event.kind, event.player, event.text, event.value) == (kind, player, text, value), line
+
+
+def test_header_fields():
+    event = classify("[12:00:08] [Server thread/INFO] (Minecraft) Steve joined the game")
+    assert (event.time, event.thread, event.level, event.kind) == ("12:00:08", "Server thread", "INFO", JOIN)
+    event = classify("[12:00:07 WARN]: Alex left the game")
+    assert (event.time, event.thread, event.level) == ("12:00:07", None, "WARN")
+
+
+def test_feed_only_dispatches_subscribed_kinds():
+    seen = []
+    classifier = EventClassifier()
+    classifier.subscribe(JOIN, seen.append)
+    classifier.feed(["[12:00:02] [Server thread/INFO]: Steve joined the game",
+                     "[12:00:07 INFO]: Alex left the game",
+                     "[12:00:02] [Server thread/INFO]: Alex joined the game"])
+    assert [event.player for event in seen] == ["Steve", "Alex"]
+    classifier.unsubscribe(JOIN, seen.append)
+    classifier.feed(["[12:00:02] [Server thread/INFO]: Bob joined the game"])
+    assert len(seen) == 2
+
+
+def test_benchmark_meets_target_with_correct_counts():
+    _benchmark(total=100_000)
@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+import mod_updates
+from mod_updates import check_updates
+from stand_ins import HTTPStandIn
+
+# sha1 of an installed jar -> the newest version Modrinth knows for it
+LATEST = {
+    "a" * 40: {"project_id": "lithium", "version_number": "0.13", "files": [
+        {"filename": "lithium-0.13.jar", "url": "https://cdn/lithium-0.13.jar", "primary": True,
+         "hashes": {"sha1": "1" * 40}}]},
+    "b" * 40: {"project_id": "sodium", "version_number": "0.6", "files": [
+        {"filename": "sodium-0.6.jar", "url": "https://cdn/sodium-0.6.jar", "hashes": {"sha1": "b" * 40}}]},
+    "c" * 40: {"project_id": "essentials", "version_number": "2.21", "files": [
+        {"filename": "extra.jar", "hashes": {"sha1": "9" * 40}},
+        {"filename": "essentials-2.21.jar", "url": "https://cdn/essentials.jar", "primary": True,
+         "hashes": {"sha1": "2" * 40}}]},
+}
+
+
+@pytest.fixture
+def modrinth():
+    bodies = []
+
+    def update(method, path, body):
+        bodies.append(body)
+        return 200, {sha1: LATEST[sha1] for sha1 in body["hashes"] if sha1 in LATEST}
+
+    stand_in = HTTPStandIn(routes={"/v2/version_files/update": update})
+    stand_in.bodies = bodies
+    yield stand_in
+    stand_in.close()
+
+
+def test_updates_are_batched_per_loader(modrinth, monkeypatch):
+    monkeypatch.setattr(mod_updates, "UPDATE_BATCH", 2)
+    jars = [
+        ("lithium.jar", "a" * 40, "fabric"),
+        ("lithium-copy.jar", "a" * 40, "fabric"),
+        ("sodium.jar", "b" * 40, "fabric"),
+        ("other.jar", "d" * 40, "fabric"),
+        ("unknown.jar", "e" * 40, "fabric"),
+        ("essentials.jar", "c" * 40, "paper"),
+        ("datapack.jar", "f" * 40, None),
+    ]
+    updates = check_updates(jars, base_url=modrinth.base_url + "/v2/", game_version="1.21.1")
+
+    assert sorted(updates) == ["essentials.jar", "lithium-copy.jar", "lithium.jar"]
+    assert updates["lithium.jar"] == {
+        "project_id": "lithium", "version": "0.13", "filename": "lithium-0.13.jar",
+        "url": "https://cdn/lithium-0.13.jar", "sha1": "1" * 40}
+    assert updates["essentials.jar"]["filename"] == "essentials-2.21.jar"
+
+    # Four distinct fabric hashes in batches of two, one paper batch; nothing for unknown loaders
+    assert modrinth.paths_hit("POST") == ["/v2/version_files/update"] * 3
+    assert [len(body["hashes"]) for body in modrinth.bodies] == [2, 2, 1]
+    assert modrinth.bodies[0]["loaders"] == ["fabric"]
+    assert modrinth.bodies[2]["loaders"] == ["paper"]
+    assert all(body["game_versions"] == ["1.21.1"] and body["algorithm"] == "sha1" for body in modrinth.bodies)
+
+
+def test_own_session_is_closed(modrinth, monkeypatch):
+    closed = []
+
+    class Session(requests.Session):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr(mod_updates.requests, "Session", Session)
+    check_updates([("lithium.jar", "a" * 40, "fabric")], base_url=modrinth.base_url + "/v2/")
+    assert len(closed) == 1
+
+    with Session() as session:
+        check_updates([("lithium.jar", "a" * 40, "fabric")], base_url=modrinth.base_url + "/v2/", session=session)
+        assert len(closed) == 1
+
+
+def test_server_errors_are_raised(modrinth):
+    with pytest.raises(requests.HTTPError):
+        check_updates([("lithium.jar", "a" * 40, "fabric")], base_url=modrinth.base_url + "/missing/")
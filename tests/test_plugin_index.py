@@ -0,0 +1,47 @@
+import io
+import json
+import zipfile
+
+from mod_graph import DependencyGraph, MISSING, DUPLICATE
+from plugin_index import read_plugin_info
+
+
+def fabric_jar(mod_id, depends=None, jars=()):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr("fabric.mod.json", json.dumps({
+            "schemaVersion": 1, "id": mod_id, "version": "1.0.0", "depends": depends or {},
+            "jars": [{"file": f"META-INF/jars/{name}.jar"} for name, _ in jars],
+        }))
+        for name, data in jars:
+            z.writestr(f"META-INF/jars/{name}.jar", data)
+    return buffer.getvalue()
+
+
+def test_nested_jars_satisfy_dependencies(tmp_path):
+    # A Fabric API-style jar bundles its modules under META-INF/jars; a mod that needs one
+    # of those modules must resolve against the outer jar instead of showing as missing
+    base = fabric_jar("fabric-api-base")
+    events = fabric_jar("fabric-lifecycle-events-v1", {"fabric-api-base": "*"})
+    jars = {
+        "fabric-api.jar": fabric_jar("fabric-api", jars=[("fabric-api-base", base), ("events", events)]),
+        "library-mod.jar": fabric_jar("library-mod", jars=[("fabric-api-base", base)]),
+        "my-mod.jar": fabric_jar("my-mod", {"fabric-api-base": ">=1.0", "fabric-lifecycle-events-v1": "*"}),
+    }
+    graph = DependencyGraph()
+    for filename, data in jars.items():
+        path = tmp_path / filename
+        path.write_bytes(data)
+        graph.update(filename, read_plugin_info(str(path)))
+
+    ids = sorted(mod["id"] for mod in graph.jars["fabric-api.jar"])
+    assert ids == ["fabric-api", "fabric-api-base", "fabric-lifecycle-events-v1"]
+    assert not [issue for issue in graph.issues() if issue[0] in (MISSING, DUPLICATE)]
+
+
+def test_missing_dependency_is_reported(tmp_path):
+    path = tmp_path / "my-mod.jar"
+    path.write_bytes(fabric_jar("my-mod", {"fabric-api-base": "*"}))
+    graph = DependencyGraph()
+    graph.update("my-mod.jar", read_plugin_info(str(path)))
+    assert [issue for issue in graph.issues() if issue[0] == MISSING]
@@ -0,0 +1,46 @@
+import os
+import hashlib
+
+import plugin_store
+from plugin_store import PluginStore
+
+
+def _jar(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return hashlib.sha1(data).hexdigest()
+
+
+def test_add_reads_the_source_once(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(plugin_store, "hash_file", lambda path: calls.append(path))
+    store = PluginStore(str(tmp_path / "store"))
+    src = tmp_path / "a.jar"
+    sha1 = _jar(src, os.urandom(3 << 20))
+    assert store.add(str(src)) == sha1
+    assert calls == []
+    with open(store.path_for(sha1), 'rb') as f:
+        assert hashlib.sha1(f.read()).hexdigest() == sha1
+    assert [n for n in os.listdir(store.root) if n.endswith(".tmp")] == []
+
+
+def test_known_hash_skips_the_read(tmp_path):
+    store = PluginStore(str(tmp_path / "store"))
+    src = tmp_path / "a.jar"
+    sha1 = _jar(src, b"jar contents")
+    store.add(str(src))
+    os.remove(src)
+    assert store.add(str(src), known_sha1=sha1) == sha1
+
+
+def test_install_is_a_separate_file(tmp_path):
+    store = PluginStore(str(tmp_path / "store"))
+    src = tmp_path / "a.jar"
+    sha1 = _jar(src, b"jar contents")
+    store.add(str(src))
+    dest = tmp_path / "plugins.jar"
+    assert store.install(sha1, str(dest)) in ("reflink", "copy")
+    with open(dest, 'r+b') as f:
+        f.write(b"JAR")
+    with open(store.path_for(sha1), 'rb') as f:
+        assert f.read() == b"jar contents"
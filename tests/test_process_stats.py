@@ -0,0 +1,37 @@
+import os
+import time
+
+import pytest
+
+import process_stats
+from process_stats import ProcessSampler, SampleHistory, Sample
+
+pytestmark = pytest.mark.skipif(not process_stats.available(), reason="needs /proc")
+
+
+def test_wall_clock_steps_do_not_skew_rates(monkeypatch):
+    samples = []
+    real_time = time.time
+    # The wall clock jumps back an hour on every read
+    steps = iter(range(0, -10 ** 6, -3600))
+    monkeypatch.setattr(process_stats.time, "time", lambda: real_time() + next(steps))
+    sampler = ProcessSampler(os.getpid(), interval=0.05, on_sample=samples.append)
+    sampler.start()
+    deadline = real_time() + 5
+    while len(samples) < 3 and real_time() < deadline:
+        sum(i * i for i in range(10000))
+    sampler.stop()
+    assert len(samples) >= 3
+    for sample in samples:
+        assert 0 <= sample.cpu <= 100 * os.cpu_count() * 1.5
+        assert sample.read_bps >= 0 and sample.write_bps >= 0
+        assert sample.rss_mb > 0 and sample.threads >= 1
+
+
+def test_history_rolls_up_peaks_and_averages():
+    history = SampleHistory(resolutions=(("1s", 1, 10), ("1m", 60, 10)))
+    for second in range(121):
+        history.add(Sample(second, cpu=second % 2 * 100, rss_mb=second, threads=1, fds=1, read_bps=0, write_bps=0))
+    minutes = history.points("1m")
+    assert len(minutes) == 2
+    assert minutes[0].rss_mb == 59 and minutes[0].cpu == 50
@@ -0,0 +1,37 @@
+from properties import PropertiesFile
+
+
+def _write(path, text):
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+
+
+def test_dangling_continuation_reads_as_empty(tmp_path):
+    path = tmp_path / "server.properties"
+    _write(path, "a=1\ntrail=\\")
+    assert PropertiesFile(str(path)).load().values == {"a": "1", "trail": ""}
+
+
+def test_dangling_continuation_does_not_swallow_new_keys(tmp_path):
+    path = tmp_path / "server.properties"
+    for text in ("a=1\ntrail=\\", "a=1\ntrail=\\\n", "a=1\r\ntrail=x\\\r\n"):
+        _write(path, text)
+        props = PropertiesFile(str(path)).load()
+        trail = props.get("trail")
+        props.set("new key", "x")
+        assert props.save()
+        values = PropertiesFile(str(path)).load().values
+        assert values["trail"] == trail
+        assert values["new key"] == "x"
+
+
+def test_untouched_lines_round_trip(tmp_path):
+    path = tmp_path / "server.properties"
+    text = "# comment\r\nmotd=Hello \\\r\n    World\r\nmax-players=20\r\n"
+    _write(path, text)
+    props = PropertiesFile(str(path)).load()
+    assert props.get("motd") == "Hello World"
+    props.set("max-players", 30)
+    props.save()
+    with open(path, newline='') as f:
+        assert f.read() == text.replace("20", "30")
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from rcon import RconClient, RconError, RconAuthError, FRAGMENT_SIZE
+from stand_ins import RconStandIn
+
+
+@pytest.fixture
+def server():
+    stand_in = RconStandIn(silent={"hang"})
+    yield stand_in
+    stand_in.close()
+
+
+@pytest.fixture
+def client(server):
+    rcon = RconClient(server.host, server.port, server.password, timeout=2.0)
+    yield rcon
+    rcon.close()
+
+
+def test_echo(client):
+    assert client.execute("echo hello") == "hello"
+    assert client.execute("list") == "Unknown command: list"
+
+
+def test_pipelined_responses_match_their_commands(client):
+    futures = [client.command(f"echo {i}") for i in range(200)]
+    assert [f.result(5) for f in futures] == [str(i) for i in range(200)]
+
+
+@pytest.mark.parametrize("size", [FRAGMENT_SIZE - 1, FRAGMENT_SIZE, FRAGMENT_SIZE * 2, 10000])
+def test_fragmented_responses_are_joined(client, size):
+    text = "x" * size
+    first = client.command("echo " + text)
+    second = client.command("echo after")
+    assert first.result(5) == text
+    assert second.result(5) == "after"
+
+
+def test_unanswered_request_times_out(client):
+    began = time.monotonic()
+    hung = client.command("hang", timeout=0.3)
+    after = client.command("echo still answering")
+    with pytest.raises(RconError, match="timed out"):
+        hung.result(5)
+    assert 0.25 <= time.monotonic() - began < 2.0
+    assert after.result(5) == "still answering"
+    assert client._pending == {}
+
+
+def test_bad_password(server):
+    rcon = RconClient(server.host, server.port, "wrong", timeout=2.0)
+    try:
+        with pytest.raises(RconAuthError):
+            rcon.execute("echo x")
+        assert server.commands == []
+    finally:
+        rcon.close()
+
+
+def test_close_fails_outstanding_requests(client):
+    hung = client.command("hang", timeout=10)
+    time.sleep(0.1)
+    client.close()
+    done, _ = wait([hung], timeout=2)
+    assert done and isinstance(hung.exception(), RconError)
+    with pytest.raises(RconError):
+        client.command("echo late").result(1)
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from server_ping import ping, StatusPoller
+from stand_ins import PingStandIn
+
+
+@pytest.fixture
+def server():
+    stand_in = PingStandIn(delay=0.01)
+    yield stand_in
+    stand_in.close()
+
+
+def test_ping_reads_status_and_latency(server):
+    result = ping(server.host, server.port)
+    assert result.online and result.error is None
+    assert (result.players_online, result.players_max) == (3, 20)
+    assert result.version == "1.21.1"
+    assert result.motd == "A Minecraft Server"
+    assert result.latency_ms >= 10
+
+
+def test_ping_reports_a_closed_port(server):
+    server.close()
+    result = ping(server.host, server.port, timeout=1.0)
+    assert not result.online and result.error
+
+
+def test_poller_keeps_latency_history(server):
+    results = []
+    poller = StatusPoller(server.host, server.port, interval=0.05, on_result=results.append)
+    poller.start()
+    deadline = time.monotonic() + 5
+    while len(results) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    server.close()
+    while results[-1].online and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+
+    assert poller.latest is results[-1] and not poller.latest.online
+    average, worst, answered = poller.latency_stats()
+    assert 10 <= average <= worst
+    assert 0 < answered < 1
@@ -0,0 +1,132 @@
+import os
+import json
+import hashlib
+import threading
+
+import pytest
+
+import server_versions
+from server_versions import VersionCatalog, DownloadError, DownloadCancelled
+from stand_ins import HTTPStandIn
+
+VERSION = "1.21.1"
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Keeps the ranged path in play without megabytes of test data
+    monkeypatch.setattr(server_versions, "CHUNK", 16 << 10)
+    monkeypatch.setattr(server_versions, "SEGMENT_MIN_BYTES", 64 << 10)
+
+
+@pytest.fixture
+def mojang():
+    stand_in = HTTPStandIn()
+    publish(stand_in, os.urandom(1 << 20))
+    yield stand_in
+    stand_in.close()
+
+
+def publish(stand_in, jar, sha1=None):
+    base = stand_in.base_url
+    details = json.dumps({"downloads": {"server": {
+        "url": base + "/server.jar", "sha1": sha1 or hashlib.sha1(jar).hexdigest(), "size": len(jar)}}}).encode()
+    manifest = {"versions": [
+        {"id": VERSION, "type": "release", "url": base + f"/{VERSION}.json", "sha1": hashlib.sha1(details).hexdigest()},
+        {"id": "24w01a", "type": "snapshot", "url": base + "/24w01a.json"},
+    ]}
+    stand_in.files.update({
+        "/server.jar": jar,
+        f"/{VERSION}.json": details,
+        "/manifest.json": json.dumps(manifest).encode(),
+    })
+    return hashlib.sha1(jar).hexdigest()
+
+
+def catalog(stand_in, tmp_path, segments=4):
+    return VersionCatalog(str(tmp_path / "cache"), manifest_url=stand_in.base_url + "/manifest.json", segments=segments)
+
+
+def jar_requests(stand_in):
+    return [rng for method, path, rng in stand_in.hits if path == "/server.jar"]
+
+
+def object_dir(cat, sha1):
+    return os.path.dirname(cat.store.path_for(sha1))
+
+
+def test_versions_hide_snapshots(mojang, tmp_path):
+    cat = catalog(mojang, tmp_path)
+    assert cat.versions() == [(VERSION, "release")]
+    assert len(cat.versions(include_snapshots=True)) == 2
+
+
+def test_parallel_ranges_and_install(mojang, tmp_path):
+    cat = catalog(mojang, tmp_path)
+    sha1 = cat.fetch(VERSION)
+    assert len(jar_requests(mojang)) == 4
+    assert all(rng.startswith("bytes=") for rng in jar_requests(mojang))
+    dest = tmp_path / "server.jar"
+    cat.install(sha1, str(dest))
+    with open(dest, 'rb') as f:
+        assert f.read() == mojang.files["/server.jar"]
+
+
+def test_interrupted_download_resumes(mojang, tmp_path):
+    mojang.fail_after = 100 << 10
+    cat = catalog(mojang, tmp_path)
+    sha1 = hashlib.sha1(mojang.files["/server.jar"]).hexdigest()
+    with pytest.raises(Exception):
+        cat.fetch(VERSION)
+    assert sorted(os.listdir(object_dir(cat, sha1))) == [sha1 + ".jar.part", sha1 + ".jar.part.json"]
+
+    mojang.fail_after = None
+    mojang.hits.clear()
+    assert cat.fetch(VERSION) == sha1
+    starts = [int(rng[6:].split("-")[0]) for rng in jar_requests(mojang)]
+    segment = (1 << 20) // 4
+    # Every range picks up past what the first attempt already wrote
+    assert all(start % segment for start in starts)
+    assert os.listdir(object_dir(cat, sha1)) == [sha1 + ".jar"]
+
+
+def test_no_range_support_falls_back_to_one_stream(mojang, tmp_path):
+    mojang.ranges = False
+    cat = catalog(mojang, tmp_path)
+    sha1 = cat.fetch(VERSION)
+    assert sha1 == hashlib.sha1(mojang.files["/server.jar"]).hexdigest()
+    assert os.listdir(object_dir(cat, sha1)) == [sha1 + ".jar"]
+
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_checksum_mismatch_is_discarded(mojang, tmp_path, segments):
+    sha1 = publish(mojang, os.urandom(1 << 20), sha1="0" * 40)
+    cat = catalog(mojang, tmp_path, segments)
+    with pytest.raises(DownloadError, match="Checksum mismatch"):
+        cat.fetch(VERSION)
+    assert os.listdir(object_dir(cat, "0" * 40)) == []
+    assert cat.cached_jar(sha1) is None
+
+
+def test_cached_jar_reinstalls_without_requests(mojang, tmp_path):
+    sha1 = catalog(mojang, tmp_path).fetch(VERSION)
+    mojang.hits.clear()
+    cat = catalog(mojang, tmp_path)
+    assert cat.fetch(VERSION) == sha1
+    cat.install(sha1, str(tmp_path / "server.jar"))
+    assert mojang.hits == []
+
+
+def test_cancel_keeps_resume_state(mojang, tmp_path):
+    cancel = threading.Event()
+    cat = catalog(mojang, tmp_path, segments=1)
+    sha1 = hashlib.sha1(mojang.files["/server.jar"]).hexdigest()
+
+    def progress(done, total):
+        if done >= total // 2:
+            cancel.set()
+
+    with pytest.raises(DownloadCancelled):
+        cat.fetch(VERSION, progress=progress, cancel=cancel)
+    assert sorted(os.listdir(object_dir(cat, sha1))) == [sha1 + ".jar.part", sha1 + ".jar.part.json"]
+    assert cat.fetch(VERSION) == sha1
@@ -0,0 +1,87 @@
+import json
+import threading
+
+import pytest
+
+from stand_ins import HTTPStandIn
+from uuid_resolver import UUIDCache, BulkResolver, parse_usernames
+
+
+def playerdb(method, path, body):
+    name = path.rsplit("/", 1)[1]
+    if name.lower().startswith("missing"):
+        return 400, {"code": "minecraft.invalid_username", "success": False}
+    if name.lower().startswith("broken"):
+        return 500, {"code": "api.error"}
+    uuid = "00000000-0000-0000-0000-%012d" % (sum(map(ord, name.lower())) * 7919 % 10 ** 12)
+    return 200, {"code": "player.found", "data": {"player": {"username": name.capitalize(), "id": uuid}}}
+
+
+@pytest.fixture
+def api():
+    stand_in = HTTPStandIn(routes={"/player/": playerdb}, delay=0.05)
+    yield stand_in
+    stand_in.close()
+
+
+@pytest.fixture
+def resolver(api, tmp_path, monkeypatch):
+    # usercache.json and whitelist.json are looked up in the working directory
+    monkeypatch.chdir(tmp_path)
+    cache = UUIDCache(str(tmp_path / "uuid_cache.json"), ttl=3600, negative_ttl=60, max_entries=1000, save_delay=60)
+    bulk = BulkResolver(max_workers=4, cache=cache, base_url=api.base_url + "/player/")
+    yield bulk
+    bulk.close()
+
+
+def test_inflight_names_share_one_lookup(api, resolver):
+    futures = []
+    threads = [threading.Thread(target=lambda n=n: futures.append(resolver.resolve(n)))
+               for n in ("Alice", "alice", "ALICE", "aLiCe")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(f) for f in futures}) == 1
+    assert futures[0].result()[0] == "Alice"
+    assert len(api.paths_hit()) == 1
+
+    results, failures = resolver.resolve_all(["Bob", "bob", "BOB"])
+    assert [name for name, _ in results] == ["Bob"] and failures == []
+    assert len(api.paths_hit()) == 2
+
+
+def test_partial_failures_are_reported_per_name(api, resolver, tmp_path):
+    names = ["Alice", "missing_one", "broken_one", "Carol", "not a name!"]
+    results, failures = resolver.resolve_all(names)
+    assert sorted(name for name, _ in results) == ["Alice", "Carol"]
+    reasons = dict(failures)
+    assert reasons["missing_one"] == "Player not found"
+    assert reasons["not a name!"] == "Invalid username"
+    assert "500" in reasons["broken_one"]
+
+    # One save for the batch: found names and the negative answer, but not the server error
+    with open(tmp_path / "uuid_cache.json") as f:
+        saved = {entry["name"].lower(): entry["uuid"] for entry in json.load(f)}
+    assert set(saved) == {"alice", "carol", "missing_one"}
+    assert saved["missing_one"] == ""
+
+    api.hits.clear()
+    results, failures = resolver.resolve_all(["alice", "MISSING_ONE"])
+    assert api.hits == []
+    assert [name for name, _ in results] == ["Alice"] and failures == [("MISSING_ONE", "Player not found")]
+
+
+def test_lookups_reuse_pooled_connections(api, resolver):
+    names = [f"player{i}" for i in range(40)]
+    results, failures = resolver.resolve_all(names)
+    assert len(results) == 40 and failures == []
+    assert len(api.paths_hit()) == 40
+    # Keep-alive connections from the shared session, at most one per worker
+    assert len(api.ports) <= 4
+
+
+def test_parse_usernames_uses_the_name_column():
+    assert parse_usernames("Alice, Bob;Carol\nDave") == ["Alice", "Bob", "Carol", "Dave"]
+    assert parse_usernames("uuid,username\n123,Alice\n456,Bob") == ["Alice", "Bob"]
+    assert parse_usernames("Alice\t069a79f4-44e9\nBob\t853c80ef-3c37") == ["Alice", "Bob"]
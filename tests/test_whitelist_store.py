@@ -0,0 +1,37 @@
+import os
+import json
+
+from whitelist_store import WhitelistStore
+
+
+def test_save_round_trips_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "whitelist.json"
+    store = WhitelistStore(str(path)).load()
+    assert store.add("Alice", "uuid-a") == 0
+    assert store.add("Bob", "uuid-b") == 1
+    assert store.add("alice again", "uuid-a") is None
+    store.save()
+
+    assert os.listdir(tmp_path) == ["whitelist.json"]
+    with open(path) as f:
+        assert json.load(f) == [{"uuid": "uuid-a", "name": "Alice"}, {"uuid": "uuid-b", "name": "Bob"}]
+    assert not store.is_stale()
+
+
+def test_remove_and_lookups(tmp_path):
+    path = tmp_path / "whitelist.json"
+    path.write_text(json.dumps([{"uuid": "u1", "name": "Alice"}, {"uuid": "u2", "name": "Bob"}, {"name": "no uuid"}]))
+    store = WhitelistStore(str(path)).load()
+    assert len(store) == 2
+    assert store.find_name("ALICE")["uuid"] == "u1"
+    assert store.remove_row(0)["name"] == "Alice"
+    assert "u1" not in store and store.find_name("alice") is None
+    assert "u2" in store
+
+
+def test_outside_change_is_stale(tmp_path):
+    path = tmp_path / "whitelist.json"
+    store = WhitelistStore(str(path)).load()
+    store.save()
+    path.write_text("[]\n\n")
+    assert store.is_stale()
@@ -1,27 +1,50 @@
-import requests
 from PySide6 import QtCore
+import config
+from uuid_resolver import build_resolver_chain, PlayerNotFound, BulkResolver
 
 
 class UUIDFetcher(QtCore.QObject):
     finished = QtCore.Signal(str, str, str)
 
-    def __init__(self, username):
+    def __init__(self, username, proxy=None, offline_mode=False):
         super().__init__()
         self.username = username
+        self.proxy = proxy
+        self.offline_mode = offline_mode
 
     def run(self):
         try:
-            url = f"https://playerdb.co/api/player/minecraft/{self.username}"
+            chain = build_resolver_chain(self.offline_mode, proxy=self.proxy, base_url=config.get("uuid_api_url"))
+            name, uuid = chain.resolve(self.username)
+            self.finished.emit(name, uuid, "")
+        except PlayerNotFound:
+            self.finished.emit(self.username, "", "Player not found")
+        except Exception as e:
+            self.finished.emit(self.username, "", str(e))
 
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
 
-            if data.get("code") == "player.found":
-                uuid = data["data"]["player"]["id"]
-                self.finished.emit(self.username, uuid, "")
-            else:
-                self.finished.emit(self.username, "", "Player not found")
+class BulkUUIDFetcher(QtCore.QObject):
+    progress = QtCore.Signal(int, int)
+    # [(name, uuid)], [(username, error)]
+    finished = QtCore.Signal(list, list)
+
+    def __init__(self, usernames, proxy=None, offline_mode=False):
+        super().__init__()
+        self.usernames = usernames
+        self.proxy = proxy
+        self.offline_mode = offline_mode
 
+    def run(self):
+        resolver = BulkResolver(
+            max_workers=config.get("uuid_bulk_workers"),
+            proxy=self.proxy,
+            base_url=config.get("uuid_api_url"),
+            offline_mode=self.offline_mode,
+        )
+        try:
+            results, failures = resolver.resolve_all(self.usernames, progress=self.progress.emit)
         except Exception as e:
-            self.finished.emit(self.username, "", str(e))
+            results, failures = [], [(name, str(e)) for name in self.usernames]
+        finally:
+            resolver.close()
+        self.finished.emit(results, failures)
@@ -0,0 +1,383 @@
+import os
+import re
+import csv
+import json
+import time
+import atexit
+import tempfile
+import uuid as uuidlib
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PLAYERDB_URL = "https://playerdb.co/api/player/minecraft/"
+USERNAME_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,16}$")
+USERNAME_SEPARATORS = re.compile(r"[\s,;]+")
+NAME_HEADERS = ("name", "username", "player")
+
+
+class PlayerNotFound(Exception):
+    pass
+
+
+class UUIDCache:
+    # Keys are lowercase names; a cached uuid of "" records "player not found".
+    # put() only marks the cache dirty; one save follows save_delay seconds later, or flush().
+    def __init__(self, path, ttl, negative_ttl, max_entries, save_delay=2.0):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._entries.clear()
+            for entry in data if isinstance(data, list) else []:
+                try:
+                    name, uuid, expires = str(entry["name"]), str(entry["uuid"]), float(entry["expires"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if expires > now:
+                    self._entries[name.lower()] = (name, uuid, expires)
+
+    def save(self):
+        # Saves are serialized, and each writes its own temp file before replacing the cache
+        with self._save_lock:
+            with self._lock:
+                self._dirty = False
+                data = [
+                    {"name": name, "uuid": uuid, "expires": expires}
+                    for name, uuid, expires in self._entries.values()
+                ]
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty = self._dirty
+        if dirty:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def get(self, username):
+        # Returns (name, uuid) for a live entry, otherwise None
+        key = username.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(self, username, uuid):
+        ttl = self.ttl if uuid else self.negative_ttl
+        key = username.lower()
+        with self._lock:
+            self._entries[key] = (username, uuid, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_uuid_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            import config
+            _cache = UUIDCache(
+                config.get("uuid_cache_path"),
+                config.get("uuid_cache_ttl"),
+                config.get("uuid_cache_negative_ttl"),
+                config.get("uuid_cache_max_entries"),
+            )
+            # A pending debounced save would otherwise be lost on exit
+            atexit.register(_cache.flush)
+        return _cache
+
+
+def fetch_uuid(username, proxy=None, session=None, base_url=PLAYERDB_URL):
+    # Returns (canonical_name, uuid) from a playerdb-compatible API or raises PlayerNotFound
+    proxies = {"http": proxy, "https": proxy} if proxy else None
+    response = (session or requests).get(base_url + username, timeout=5, proxies=proxies)
+    if response.status_code in (400, 404):
+        raise PlayerNotFound("Player not found")
+    response.raise_for_status()
+    data = response.json()
+
+    if data.get("code") != "player.found":
+        raise PlayerNotFound("Player not found")
+    player = data["data"]["player"]
+    return player.get("username", username), player["id"]
+
+
+def resolve_uuid(username, proxy=None, cache=None, session=None, base_url=PLAYERDB_URL):
+    cache = cache or get_uuid_cache()
+    cached = cache.get(username)
+    if cached is not None:
+        if not cached[1]:
+            raise PlayerNotFound("Player not found")
+        return cached
+
+    try:
+        name, uuid = fetch_uuid(username, proxy=proxy, session=session, base_url=base_url)
+    except PlayerNotFound:
+        cache.put(username, "")
+        raise
+
+    cache.put(name, uuid)
+    return name, uuid
+
+
+def offline_uuid(username):
+    # Same as Java's UUID.nameUUIDFromBytes("OfflinePlayer:" + name), used by offline-mode servers
+    digest = hashlib.md5(("OfflinePlayer:" + username).encode('utf-8')).digest()
+    return str(uuidlib.UUID(bytes=digest, version=3))
+
+
+class OfflineResolver:
+    def resolve(self, username):
+        return username, offline_uuid(username)
+
+
+class JsonFileResolver:
+    # Reads name/uuid pairs from usercache.json or whitelist.json, reloading when the file changes
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._mtime, self._names = None, {}
+            return
+        if mtime == self._mtime:
+            return
+
+        names = {}
+        try:
+            with open(self.path, 'r') as f:
+                for entry in json.load(f):
+                    if entry.get("name") and entry.get("uuid"):
+                        names[entry["name"].lower()] = (entry["name"], entry["uuid"])
+        except Exception:
+            pass
+        self._mtime, self._names = mtime, names
+
+    def resolve(self, username):
+        with self._lock:
+            self._refresh()
+            return self._names.get(username.lower())
+
+
+class NetworkResolver:
+    def __init__(self, proxy=None, cache=None, session=None, base_url=PLAYERDB_URL):
+        self.proxy = proxy
+        self.cache = cache
+        self.session = session
+        self.base_url = base_url
+
+    def resolve(self, username):
+        return resolve_uuid(
+            username, proxy=self.proxy, cache=self.cache or get_uuid_cache(),
+            session=self.session, base_url=self.base_url
+        )
+
+
+class ResolverChain:
+    def __init__(self, resolvers):
+        self.resolvers = resolvers
+
+    def resolve_local(self, username):
+        # Every resolver except the network one; returns None when none of them know the name
+        for resolver in self.resolvers:
+            if isinstance(resolver, NetworkResolver):
+                continue
+            result = resolver.resolve(username)
+            if result is not None:
+                return result
+        return None
+
+    def resolve(self, username):
+        for resolver in self.resolvers:
+            result = resolver.resolve(username)
+            if result is not None:
+                return result
+        raise PlayerNotFound("Player not found")
+
+
+def build_resolver_chain(offline_mode=False, proxy=None, cache=None, session=None, base_url=PLAYERDB_URL,
+                         usercache_path="usercache.json", whitelist_path="whitelist.json"):
+    # Offline servers derive UUIDs from the name, so nothing needs to be looked up
+    if offline_mode:
+        return ResolverChain([OfflineResolver()])
+    return ResolverChain([
+        JsonFileResolver(usercache_path),
+        JsonFileResolver(whitelist_path),
+        NetworkResolver(proxy=proxy, cache=cache, session=session, base_url=base_url),
+    ])
+
+
+def parse_usernames(text):
+    # A plain list has names separated by whitespace, commas or semicolons. A table (CSV/TSV
+    # with a name/username/player header, or several rows with extra columns such as uuids)
+    # contributes only its name column.
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    column, rows = _name_column(lines)
+    if column is not None:
+        return [row[column] for row in rows if len(row) > column and row[column]]
+
+    names = []
+    for line in lines:
+        names.extend(
+            n for n in USERNAME_SEPARATORS.split(line)
+            if n and n.lower() not in NAME_HEADERS
+        )
+    return names
+
+
+def _name_column(lines):
+    # (column index, data rows) when lines form a table, otherwise (None, None)
+    if not lines:
+        return None, None
+    sample = "\n".join(lines)
+    delimiter = "\t" if "\t" in sample else ";" if ";" in sample and "," not in sample else ","
+    rows = [[cell.strip() for cell in row] for row in csv.reader(lines, delimiter=delimiter)]
+    header = [cell.lower() for cell in rows[0]]
+    for column, cell in enumerate(header):
+        if cell in NAME_HEADERS:
+            return column, rows[1:]
+    if len(rows) > 1 and all(len(row) > 1 and USERNAME_PATTERN.match(row[0]) for row in rows) \
+            and any(cell and not USERNAME_PATTERN.match(cell) for row in rows for cell in row[1:]):
+        return 0, rows
+    return None, None
+
+
+class BulkResolver:
+    def __init__(self, max_workers=8, proxy=None, cache=None, base_url=PLAYERDB_URL, offline_mode=False):
+        self.cache = cache or get_uuid_cache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.chain = build_resolver_chain(
+            offline_mode, proxy=proxy, cache=self.cache, session=self.session, base_url=base_url)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, username):
+        # Concurrent requests for the same name share one lookup
+        key = username.lower()
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+
+            # Local and cached answers take microseconds, so they skip the pool
+            local = self.chain.resolve_local(username) or self.cache.get(username)
+            if local is not None:
+                future = Future()
+                if local[1]:
+                    future.set_result(local)
+                else:
+                    future.set_exception(PlayerNotFound("Player not found"))
+                return future
+
+            future = self._executor.submit(self.chain.resolve, username)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def resolve_all(self, usernames, progress=None):
+        # Returns ([(name, uuid)], [(username, error)]); progress(done, total) runs on the calling thread
+        unique = []
+        seen = set()
+        failures = []
+        for username in usernames:
+            key = username.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            if USERNAME_PATTERN.match(username):
+                unique.append(username)
+            else:
+                failures.append((username, "Invalid username"))
+
+        futures = {self.resolve(username): username for username in unique}
+        results = []
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results.append(future.result())
+            except PlayerNotFound:
+                failures.append((futures[future], "Player not found"))
+            except Exception as e:
+                failures.append((futures[future], str(e)))
+            if progress:
+                progress(done, len(futures))
+        # Lookups only marked the cache dirty; one save covers the whole batch
+        self.cache.flush()
+        return results, failures
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
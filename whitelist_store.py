@@ -0,0 +1,94 @@
+import os
+import json
+import tempfile
+import threading
+
+
+class WhitelistStore:
+    # whitelist.json entries in file order, indexed by uuid and by lowercase name
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        self._by_uuid = {}
+        self._by_name = {}
+        self._stat = None
+        self._write_lock = threading.Lock()
+
+    def load(self):
+        entries = []
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+                st = os.fstat(f.fileno())
+            self._stat = (st.st_mtime_ns, st.st_size)
+            entries = [e for e in data if isinstance(e, dict) and e.get("uuid")]
+        except FileNotFoundError:
+            self._stat = None
+        except Exception:
+            self._stat = self._current_stat()
+        self._set_entries(entries)
+        return self
+
+    def _set_entries(self, entries):
+        self.entries = entries
+        self._by_uuid = {e["uuid"]: e for e in entries}
+        self._by_name = {e.get("name", "").lower(): e for e in entries}
+
+    def _current_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def is_stale(self):
+        return self._current_stat() != self._stat
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, uuid):
+        return uuid in self._by_uuid
+
+    def find_name(self, name):
+        return self._by_name.get(name.lower())
+
+    def add(self, name, uuid):
+        # Returns the new row, or None when the uuid is already listed
+        if uuid in self._by_uuid:
+            return None
+        entry = {"uuid": uuid, "name": name}
+        self.entries.append(entry)
+        self._by_uuid[uuid] = entry
+        self._by_name[name.lower()] = entry
+        return len(self.entries) - 1
+
+    def remove_row(self, row):
+        entry = self.entries.pop(row)
+        self._by_uuid.pop(entry["uuid"], None)
+        if self._by_name.get(entry.get("name", "").lower()) is entry:
+            del self._by_name[entry["name"].lower()]
+        return entry
+
+    def snapshot(self):
+        return [dict(e) for e in self.entries]
+
+    def save(self, entries=None):
+        # Safe to call from a worker thread with a snapshot() taken on the GUI thread
+        entries = self.snapshot() if entries is None else entries
+        with self._write_lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._stat = self._current_stat()